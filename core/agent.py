@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import logging
 import re
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 from typing import Any, TypedDict
@@ -25,13 +27,14 @@ from tools.browser_tool import BrowserTool
 from tools.coingecko_tool import CoingeckoTool
 from tools.funding_tool import FundingTool
 from tools.history_tool import HistoryTool
+from tools.http_client import build_http_client
 from tools.onchain_tool import OnchainConfig, OnchainTool
 from tools.position_tool import PositionTool
 from tools.sentiment_tool import SentimentConfig, SentimentTool
 from tools.swap_tool import SwapTool
 from tools.ta_tool import TATool
 from tools.wallet_tool import WalletTool
-from tools.whale_tool import WhaleConfig, WhaleTool
+from tools.whale_tool import WhaleConfig, get_whale_tool
 
 logger = logging.getLogger(__name__)
 
@@ -117,7 +120,13 @@ def build_graph(
     memory: MemoryStore,
     policy: PolicyEngine,
     dry_run: bool = False,
+    reason_only: bool = False,
 ) -> CompiledStateGraph:
+    """Build the agent graph.
+
+    With *reason_only* the graph is just REASON → END and the startup on-chain
+    sync is skipped, so callers can sample the planner on stored observations.
+    """
     heavy_llm = ChatOpenAI(
         model=config.llm.heavy_model,
         openai_api_key=config.llm.api_key,  # type: ignore[arg-type]
@@ -140,23 +149,27 @@ def build_graph(
     wallet_tool = WalletTool(config.solana.private_key, config.solana.rpc_url)
     history_tool = HistoryTool(memory)
     sandbox = Sandbox(config, policy)
+    # One pooled client for every plain-HTTP tool.
+    http = build_http_client()
     swap_tool = SwapTool(
         wallet_tool.keypair,
         config.solana.rpc_url,
         api_key=config.solana.jupiter_api_key,
+        http=http,
     )
     position_tool = PositionTool(memory)
     # On startup, reconcile tracked positions with on-chain balances so that any
     # pre-existing holdings are reflected in the internal portfolio view.
-    try:
-        position_tool.sync_from_onchain(wallet_tool, {"SOL": 0.0, "USDC": 1.0})
-    except Exception:
-        # Sync failures should never prevent the agent from starting.
-        logger.warning("initial on-chain position sync failed", exc_info=True)
-    funding_tool = FundingTool()
-    whale_tool = WhaleTool(WhaleConfig(rpc_url=config.solana.rpc_url))
-    onchain_tool = OnchainTool(OnchainConfig(rpc_url=config.solana.rpc_url))
-    sentiment_tool = SentimentTool(SentimentConfig())
+    if not reason_only:
+        try:
+            position_tool.sync_from_onchain(wallet_tool, {"SOL": 0.0, "USDC": 1.0})
+        except Exception:
+            # Sync failures should never prevent the agent from starting.
+            logger.warning("initial on-chain position sync failed", exc_info=True)
+    funding_tool = FundingTool(http=http)
+    whale_tool = get_whale_tool(WhaleConfig(rpc_url=config.solana.rpc_url))
+    onchain_tool = OnchainTool(OnchainConfig(rpc_url=config.solana.rpc_url), http=http)
+    sentiment_tool = SentimentTool(SentimentConfig(), http=http)
     coingecko_tool = CoingeckoTool()
 
     def _summarize_token_balances() -> tuple[dict[str, float], str]:
@@ -191,11 +204,18 @@ def build_graph(
         logger.info("═══ PERCEIVE ═══")
         chunks: list[str] = []
 
-        # 1. Web scrapes
-        for url in _DEFAULT_SCRAPE_URLS:
-            logger.info("  scraping %s …", url)
+        # 1. Web scrapes (one browser session for all of them)
+        logger.info("  scraping %s …", ", ".join(_DEFAULT_SCRAPE_URLS))
+        try:
+            scraped = asyncio.run(browser_tool.scrape_many(_DEFAULT_SCRAPE_URLS))
+        except Exception as exc:
+            scraped = [exc] * len(_DEFAULT_SCRAPE_URLS)
+        for url, text in zip(_DEFAULT_SCRAPE_URLS, scraped):
+            if isinstance(text, BaseException):
+                chunks.append(f"[{url}] scrape failed: {text}")
+                logger.warning("    → scrape of %s failed: %s", url, text)
+                continue
             try:
-                text = asyncio.run(browser_tool.scrape(url))
                 chunks.append(f"[{url}]\n{text}")
                 logger.info("    → %d chars", len(text))
 
@@ -222,7 +242,7 @@ def build_graph(
                     symbol=symbol,
                     interval=Client.KLINE_INTERVAL_1HOUR,
                 )
-                df_1h = ta_tool.enrich(df_1h)
+                df_1h = ta_tool.enrich(df_1h, lean=True, symbol=symbol)
                 summary_1h = ta_tool.summarize(df_1h, symbol=symbol)
                 chunks.append(summary_1h)
                 logger.info("    → %d candles enriched (1h)", len(df_1h))
@@ -231,7 +251,7 @@ def build_graph(
                     symbol=symbol,
                     interval=Client.KLINE_INTERVAL_4HOUR,
                 )
-                df_4h = ta_tool.enrich(df_4h)
+                df_4h = ta_tool.enrich(df_4h, lean=True, symbol=symbol)
                 summary_4h = ta_tool.summarize(df_4h, symbol=f"{symbol}-4h")
                 chunks.append(summary_4h)
                 logger.info("    → %d candles enriched (4h)", len(df_4h))
@@ -636,7 +656,7 @@ def build_graph(
                 limit = int(plan.get("params", {}).get("limit", 100))
                 logger.info("  analyzing %s interval=%s limit=%d", symbol, interval, limit)
                 df = binance_tool.get_klines(symbol=symbol, interval=interval, limit=limit)
-                df = ta_tool.enrich(df)
+                df = ta_tool.enrich(df, lean=True, symbol=symbol)
                 result = ta_tool.summarize(df, symbol=symbol)
                 logger.info("  → %d candles analyzed", len(df))
 
@@ -929,12 +949,28 @@ def build_graph(
 
         return "reflect"
 
+    def _batched(node: Callable[[AgentState], AgentState]) -> Callable[[AgentState], AgentState]:
+        """Run *node* inside a memory batch so its writes hit disk once."""
+
+        @functools.wraps(node)
+        def wrapper(state: AgentState) -> AgentState:
+            with memory.batch():
+                return node(state)
+
+        return wrapper
+
     # ── wire the graph ────────────────────────────────────────────
     graph = StateGraph(AgentState)
-    graph.add_node("perceive", perceive_node)
-    graph.add_node("reason", reason_node)
-    graph.add_node("act", act_node)
-    graph.add_node("reflect", reflect_node)
+    if reason_only:
+        graph.add_node("reason", _batched(reason_node))
+        graph.set_entry_point("reason")
+        graph.add_edge("reason", END)
+        return graph.compile()
+
+    graph.add_node("perceive", _batched(perceive_node))
+    graph.add_node("reason", _batched(reason_node))
+    graph.add_node("act", _batched(act_node))
+    graph.add_node("reflect", _batched(reflect_node))
 
     graph.set_entry_point("perceive")
     graph.add_edge("perceive", "reason")
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import os
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 
 from dotenv import load_dotenv
 
@@ -14,6 +16,10 @@ load_dotenv()
 # Kept for backwards compatibility but no longer enforced.
 ALLOWED_SCRAPE_DOMAINS: frozenset[str] = frozenset()
 
+# Inline comment: whitespace followed by '#' and everything after it.  A bare
+# '#' inside a value (e.g. a URL fragment) is kept.
+_INLINE_COMMENT_RE = re.compile(r"\s+#.*", re.DOTALL)
+
 
 @dataclass(frozen=True)
 class LLMConfig:
@@ -44,6 +50,8 @@ class PolicyConfig:
     max_swap_usd_per_tx: float = 50.0
     daily_swap_cap_usd: float = 200.0
     allowed_tokens: tuple[str, ...] = ("SOL", "USDC", "WBTC")
+    # Repo-relative directories the agent may modify via git.
+    allowed_write_paths: tuple[str, ...] = ("tools", "experiments")
 
 
 @dataclass(frozen=True)
@@ -53,7 +61,9 @@ class MemoryConfig:
     max_reflections: int = 50        # Keep last N reflections
     max_trades: int = 100            # Keep last N trades
     max_swap_history: int = 50       # Keep last N swap records
+    max_mainnet_transactions: int = 500  # Keep last N mainnet audit records
     compress_observations: bool = True  # Store compact price lines instead of full scrape blob
+    pretty: bool = False             # indent=2 on disk; only worth it when debugging by hand
 
 
 @dataclass(frozen=True)
@@ -78,8 +88,7 @@ def _getenv(name: str, default: str | None = None) -> str | None:
     raw = os.getenv(name, default)
     if raw is None:
         return None
-    # Split on first ' #' (space-hash) to drop inline comments, then strip
-    return raw.split(" #")[0].strip()
+    return _INLINE_COMMENT_RE.sub("", raw).strip()
 
 
 def _require(name: str) -> str:
@@ -89,8 +98,13 @@ def _require(name: str) -> str:
     return value
 
 
+@lru_cache(maxsize=1)
 def load_config() -> AppConfig:
-    """Build AppConfig from environment. Raises EnvironmentError on missing keys."""
+    """Build AppConfig from environment. Raises EnvironmentError on missing keys.
+
+    The result is cached for the life of the process; call
+    ``load_config.cache_clear()`` after changing the environment.
+    """
     return AppConfig(
         llm=LLMConfig(api_key=_require("OPENROUTER_API_KEY")),
         solana=SolanaConfig(
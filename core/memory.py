@@ -5,11 +5,16 @@ from __future__ import annotations
 import copy
 import json
 import os
-import tempfile
-from datetime import date
+import re
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import date, datetime
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from core.config import MemoryConfig
 
 # Default location for on-disk JSON state.
@@ -17,6 +22,11 @@ from core.config import MemoryConfig
 # to /app/memory/state.json instead of a bare file in the working dir.
 MEMORY_PATH = Path("memory/state.json")
 
+# Non-string keys and numpy scalars are what the stdlib encoder tolerated (or
+# what indicator code may hand us); keep them writable.
+# orjson writes NaN/Infinity as null, so numeric readers treat null as missing.
+_DUMP_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
 _DEFAULT_STATE: dict[str, Any] = {
     "daily_spend_sol": 0.0,
     "daily_spend_date": "",  # ISO date string; reset when stale
@@ -44,49 +54,164 @@ _DEFAULT_STATE: dict[str, Any] = {
 # How many chars of action_result to persist per trade
 _RESULT_TRUNCATE = 300
 
+# Compact close values from TA summaries like "[SOLUSDT] close=90.19  ..."
+_CLOSE_LINE_RE = re.compile(r"^([^\]\n]*\]) close=[ \t]*(\S+)", re.MULTILINE)
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse state bytes; files written by the old stdlib encoder may hold NaN/Infinity."""
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return json.loads(raw)
+
 
 class MemoryStore:
-    """Thin wrapper around a JSON file.  All reads go to disk — no in-process cache."""
+    """Thin wrapper around a JSON file.
+
+    Every load() stats the file so writes from other processes are always seen;
+    the raw bytes are reused while (mtime, size) is unchanged.  Outside batch()
+    each load() parses a fresh dict, because callers mutate it before calling
+    save(); inside batch() load() and load_key() deliberately hand out the one
+    shared working state (see batch()).
+    """
 
     def __init__(self, path: Path = MEMORY_PATH, config: MemoryConfig | None = None):
         self.path = path
         self._config = config or MemoryConfig()
+        self._cache: tuple[tuple[int, int], bytes] | None = None
+        # Working state while inside batch(); saves are deferred until exit.
+        self._batch_state: dict[str, Any] | None = None
+        self._batch_depth = 0
+        self._batch_dirty = False
 
     # ── public API ────────────────────────────────────────────────
 
     def load(self) -> dict[str, Any]:
-        """Read state from disk.  Returns fresh default if file is missing."""
-        if not self.path.exists():
+        """Read state from disk.  Returns fresh default if file is missing.
+
+        Inside batch() this returns the shared working state itself, not a copy.
+        """
+        if self._batch_state is not None:
+            return self._batch_state
+        raw = self._read_raw()
+        if raw is None:
             return copy.deepcopy(_DEFAULT_STATE)
-        with open(self.path) as fh:
-            state = json.load(fh)
+        state = _loads(raw)
         # Auto-reset daily spend / swap when the date has changed
-        today = date.today().isoformat()
+        today_iso = date.today().isoformat()
         mutated = False
-        if state.get("daily_spend_date") != today:
+        if state.get("daily_spend_date") != today_iso:
             state["daily_spend_sol"] = 0.0
-            state["daily_spend_date"] = today
+            state["daily_spend_date"] = today_iso
             mutated = True
-        if state.get("daily_swap_date") != today:
+        if state.get("daily_swap_date") != today_iso:
             state["daily_swap_usd"] = 0.0
-            state["daily_swap_date"] = today
+            state["daily_swap_date"] = today_iso
             mutated = True
         if mutated:
             self.save(state)
         return state
 
+    def load_key(self, key: str, default: Any = None) -> Any:
+        """Return one top-level value without the daily-reset write load() may do.
+
+        Read-only callers (e.g. the backtest script) only need a single field.
+        Inside batch() the value comes from the shared working state, uncopied.
+        """
+        if self._batch_state is not None:
+            return self._batch_state.get(key, default)
+        raw = self._read_raw()
+        if raw is None:
+            return copy.deepcopy(_DEFAULT_STATE.get(key, default))
+        return _loads(raw).get(key, default)
+
+    def _read_raw(self) -> bytes | None:
+        """Return the file's bytes (cached while unchanged), or None if missing."""
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+        if self._cache is None or self._cache[0] != key:
+            self._cache = (key, self.path.read_bytes())
+        return self._cache[1]
+
     def save(self, state: dict[str, Any]) -> None:
-        """Apply rotation limits and atomically write to disk."""
+        """Apply rotation limits and atomically write to disk (deferred inside batch())."""
+        if self._batch_depth:
+            self._batch_state = state
+            self._batch_dirty = True
+            return
+        self._write(state)
+
+    def flush(self) -> None:
+        """Write pending batch() changes to disk now; a no-op outside a batch.
+
+        Used for records that must survive the process being killed before the
+        batch exits (spend counters, the mainnet audit log).
+        """
+        if self._batch_state is None or not self._batch_dirty:
+            return
+        self._batch_dirty = False
+        self._write(self._batch_state)
+
+    def _write(self, state: dict[str, Any]) -> None:
         state = self._summarize_and_rotate(state)
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        # Single writer per state file, so a fixed sibling name is enough;
+        # os.replace keeps the swap atomic.
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        opts = _DUMP_OPTS | orjson.OPT_INDENT_2 if self._config.pretty else _DUMP_OPTS
+        data = orjson.dumps(state, option=opts)
+        if self._unchanged_on_disk(data):
+            return
         try:
-            with os.fdopen(fd, "w") as fh:
-                json.dump(state, fh, indent=2)
+            tmp.write_bytes(data)
             os.replace(tmp, self.path)
         except Exception:
-            os.unlink(tmp)
+            tmp.unlink(missing_ok=True)
             raise
+        st = self.path.stat()
+        self._cache = ((st.st_mtime_ns, st.st_size), data)
+
+    def _unchanged_on_disk(self, data: bytes) -> bool:
+        """True if the file still holds exactly *data* from our last read/write."""
+        if self._cache is None or self._cache[1] != data:
+            return False
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return False
+        return self._cache[0] == (st.st_mtime_ns, st.st_size)
+
+    def invalidate(self) -> None:
+        """Drop the cached file contents so the next load() re-reads from disk."""
+        self._cache = None
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Coalesce every save() inside the block into a single write on exit.
+
+        The state is loaded once; load() calls inside the block return that
+        same working dict so mutators see each other's changes.  Pending
+        changes are flushed even if the block raises.  That does not cover the
+        process being killed, so spend and audit records call flush() and reach
+        disk immediately, together with everything saved before them.
+        """
+        if self._batch_depth == 0:
+            self._batch_state = self.load()
+            self._batch_dirty = False
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                state, self._batch_state = self._batch_state, None
+                if self._batch_dirty and state is not None:
+                    self._batch_dirty = False
+                    self.save(state)
 
     # ── rotation / summarisation ─────────────────────────────────────
 
@@ -96,6 +221,7 @@ class MemoryStore:
             "reflections": self._config.max_reflections,
             "trades": self._config.max_trades,
             "swap_history": self._config.max_swap_history,
+            "mainnet_transactions": self._config.max_mainnet_transactions,
         }
 
         for key, limit in limits.items():
@@ -120,18 +246,15 @@ class MemoryStore:
 
     def _summarize_trades(self, trades: list[dict[str, Any]]) -> dict[str, Any]:
         """Generate statistical summary of trades being pruned."""
-        action_counts: dict[str, int] = {}
-        successes = 0
+        action_counts: Counter[str] = Counter()
         failures = 0
 
         for t in trades:
-            action = str(t.get("action_type", "unknown"))
-            action_counts[action] = action_counts.get(action, 0) + 1
-            result = str(t.get("result", ""))
-            if "failed" in result.lower() or "blocked" in result.lower():
+            action_counts[str(t.get("action_type", "unknown"))] += 1
+            result = str(t.get("result", "")).lower()
+            if "failed" in result or "blocked" in result:
                 failures += 1
-            else:
-                successes += 1
+        successes = len(trades) - failures
 
         period = "unknown"
         if trades:
@@ -143,7 +266,7 @@ class MemoryStore:
         return {
             "period": period,
             "total": total,
-            "actions": action_counts,
+            "actions": dict(action_counts),
             "success_rate": successes / total if total else 0.0,
         }
 
@@ -173,30 +296,34 @@ class MemoryStore:
         return state
 
     def add_spend(self, amount_sol: float) -> None:
-        """Increment daily spend (re-reads from disk first)."""
+        """Increment daily spend (re-reads from disk first; written even inside batch())."""
+        today_iso = date.today().isoformat()
         state = self.load()
-        state["daily_spend_sol"] = state.get("daily_spend_sol", 0.0) + amount_sol
-        state["daily_spend_date"] = date.today().isoformat()
+        state["daily_spend_sol"] = (state.get("daily_spend_sol") or 0.0) + amount_sol
+        state["daily_spend_date"] = today_iso
         self.save(state)
+        self.flush()
 
     def add_swap_usd(self, amount_usd: float) -> None:
-        """Increment daily swap notional (re-reads from disk first)."""
+        """Increment daily swap notional (re-reads from disk first; written even inside batch())."""
+        today_iso = date.today().isoformat()
         state = self.load()
-        state["daily_swap_usd"] = state.get("daily_swap_usd", 0.0) + float(amount_usd)
-        state["daily_swap_date"] = date.today().isoformat()
+        state["daily_swap_usd"] = (state.get("daily_swap_usd") or 0.0) + float(amount_usd)
+        state["daily_swap_date"] = today_iso
         self.save(state)
+        self.flush()
 
     def append_reflection(self, text: str) -> None:
+        today_iso = date.today().isoformat()
         state = self.load()
-        state.setdefault("reflections", []).append(
-            {"date": date.today().isoformat(), "text": text}
-        )
+        state.setdefault("reflections", []).append({"date": today_iso, "text": text})
         self.save(state)
 
     # ── trade log ─────────────────────────────────────────────────
 
     def append_trade(self, plan: dict[str, Any], result: str) -> None:
         """Persist a full action record derived from the executed plan + outcome."""
+        today_iso = date.today().isoformat()
         state = self.load()
         params = plan.get("params", {}) or {}
         # For extend_code, don't store full code - just metadata
@@ -204,11 +331,14 @@ class MemoryStore:
             code_str = str(params.get("code", ""))
             params = {
                 "commit_message": params.get("commit_message", ""),
-                "code_lines": len(code_str.splitlines()) if code_str else 0,
+                # Count newlines instead of materialising every line via splitlines().
+                "code_lines": code_str.count("\n") + (
+                    1 if code_str and not code_str.endswith("\n") else 0
+                ),
             }
 
         state.setdefault("trades", []).append({
-            "date": date.today().isoformat(),
+            "date": today_iso,
             "action_type": plan.get("action_type", "unknown"),
             "target": plan.get("target", ""),
             "params": params,
@@ -220,19 +350,18 @@ class MemoryStore:
 
     def recent_trades(self, n: int = 5) -> list[dict[str, Any]]:
         """Return the most recent *n* trade records (newest first)."""
-        state = self.load()
-        trades = state.get("trades", [])
-        return list(reversed(trades[-n:]))
+        trades = self.load().get("trades", [])
+        return trades[-n:][::-1]
 
     # ── mainnet transaction log ─────────────────────────────────────
 
     def append_mainnet_transaction(self, tx_type: str, details: dict[str, Any]) -> None:
         """Append a mainnet transaction record for audit purposes.
 
-        This log is capped to a reasonable length to avoid unbounded growth.
+        The log is capped at MemoryConfig.max_mainnet_transactions by save().
+        The record is written immediately, even inside batch().
         """
-        from datetime import datetime
-
+        now = datetime.now()
         state = self.load()
         log = state.get("mainnet_transactions") or []
         if not isinstance(log, list):
@@ -240,16 +369,16 @@ class MemoryStore:
 
         log.append(
             {
-                "timestamp": datetime.now().isoformat(),
-                "date": date.today().isoformat(),
+                "timestamp": now.isoformat(),
+                "date": now.date().isoformat(),
                 "type": tx_type,
                 "details": details,
                 "chain": "solana-mainnet",
             }
         )
-        # Keep only the last 500 mainnet transactions.
-        state["mainnet_transactions"] = log[-500:]
+        state["mainnet_transactions"] = log
         self.save(state)
+        self.flush()
 
     # ── observation compression ─────────────────────────────────────
 
@@ -261,17 +390,10 @@ class MemoryStore:
             self.save(state)
             return
 
-        prices: list[str] = []
-        for line in str(observations).splitlines():
-            # Extract compact close values from TA summaries like:
-            # [SOLUSDT] close=90.19, [BTCUSDT] close=70283.23
-            if "] close=" in line:
-                symbol_part = line.split("]", 1)[0] + "]"
-                try:
-                    price_part = line.split("close=")[1].split()[0]
-                except Exception:
-                    continue
-                prices.append(f"{symbol_part} {price_part}")
+        # One C-level scan over the blob instead of a Python loop per line.
+        prices = [
+            f"{symbol} {price}" for symbol, price in _CLOSE_LINE_RE.findall(str(observations))
+        ]
 
         state = self.load()
         state["last_observations_prices"] = prices
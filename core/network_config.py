@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 
 
 class NetworkType(Enum):
@@ -9,13 +10,19 @@ class NetworkType(Enum):
     DEVNET = "devnet"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NetworkTokens:
     """Mint addresses per network for the tokens the bot cares about."""
 
     sol: str
     usdc: str
     wbtc: str | None  # May not exist on devnet
+    # Symbol → mint (None if not on this network), built once per instance.
+    _mints: dict[str, str | None] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        mints = {"SOL": self.sol, "USDC": self.usdc, "WBTC": self.wbtc, "BTC": self.wbtc}
+        object.__setattr__(self, "_mints", mints)
 
     def mint_for_symbol(self, symbol: str) -> str:
         """Return mint address for a given logical token symbol.
@@ -24,15 +31,13 @@ class NetworkTokens:
         handle ValueError in those cases.
         """
         sym = symbol.upper()
-        if sym == "SOL":
-            return self.sol
-        if sym == "USDC":
-            return self.usdc
-        if sym in {"WBTC", "BTC"}:
-            if self.wbtc is None:
-                raise ValueError(f"Token {sym} is not configured for this network")
-            return self.wbtc
-        raise ValueError(f"Unsupported token symbol for swap: {symbol}")
+        try:
+            mint = self._mints[sym]
+        except KeyError:
+            raise ValueError(f"Unsupported token symbol for swap: {symbol}") from None
+        if mint is None:
+            raise ValueError(f"Token {sym} is not configured for this network")
+        return mint
 
 
 MAINNET_TOKENS = NetworkTokens(
@@ -54,7 +59,10 @@ DEVNET_TOKENS = NetworkTokens(
 class NetworkDetector:
     """Helpers for detecting network and resolving token configuration."""
 
+    # Inputs come from config (a handful of RPC URLs / two enum members), so the
+    # caches stay tiny while turning repeat calls on the swap path into lookups.
     @staticmethod
+    @lru_cache(maxsize=16)
     def detect(rpc_url: str) -> NetworkType:
         """Detect network from RPC URL (simple heuristic).
 
@@ -64,6 +72,7 @@ class NetworkDetector:
         return NetworkType.DEVNET if "devnet" in rpc_url.lower() else NetworkType.MAINNET
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_tokens(network: NetworkType) -> NetworkTokens:
         return DEVNET_TOKENS if network == NetworkType.DEVNET else MAINNET_TOKENS
 
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from urllib.parse import urlparse
+import os
+from pathlib import Path
 
 from core.config import AppConfig
 from core.memory import MemoryStore
@@ -17,6 +18,11 @@ class PolicyEngine:
     def __init__(self, config: AppConfig, memory: MemoryStore):
         self.config = config
         self.memory = memory
+        # Resolved once; check_git_paths only needs a string prefix test per path.
+        cwd = Path.cwd().resolve()
+        self._allowed_abs_prefixes: tuple[str, ...] = tuple(
+            str(cwd / d) + os.sep for d in config.policy.allowed_write_paths
+        )
 
     # ── wallet ────────────────────────────────────────────────────
 
@@ -76,7 +82,7 @@ class PolicyEngine:
         # Mainnet-specific safeguard: prevent draining SOL below configured minimum.
         if network == NetworkType.MAINNET and from_token.upper() == "SOL":
             positions = state.get("positions", {}) or {}
-            current_sol = float(positions.get("SOL", {}).get("amount", 0.0))
+            current_sol = float(positions.get("SOL", {}).get("amount") or 0.0)
             min_balance = float(self.config.solana.mainnet_min_balance_sol)
 
             # Use the native SOL amount when available; fall back to the USD-derived
@@ -114,13 +120,10 @@ class PolicyEngine:
     # ── git / self-modification ───────────────────────────────────
 
     def check_git_paths(self, paths: list[str]) -> None:
-        """Only tools/ and experiments/ paths are allowed."""
-        from pathlib import Path
-
-        allowed_prefixes = ("tools/", "experiments/")
+        """Only ``policy.allowed_write_paths`` are allowed.  Stops at the first violation."""
         for p in paths:
-            resolved = str(Path(p).resolve().relative_to(Path.cwd()))
-            if not any(resolved.startswith(prefix) for prefix in allowed_prefixes):
+            resolved = str(Path(p).resolve())
+            if not resolved.startswith(self._allowed_abs_prefixes):
                 raise PolicyViolation(
                     f"Path '{p}' (resolved: '{resolved}') is outside allowed directories"
                 )
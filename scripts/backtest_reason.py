@@ -3,40 +3,67 @@
 This script replays stored observations from MemoryStore (if available) through
 the REASON step to inspect what actions the agent *would* have taken.
 
+The planner is an LLM, so a single replay says little; ``--runs N`` replays the
+same observations N times across ``--workers`` processes and prints how often
+each action type was chosen.  Each worker builds a REASON-only graph once, so a
+replay samples the planner on the stored input without perceiving, acting or
+reflecting.  Workers use scratch copies of the memory file, so replays never
+touch the live state; the copies live in one temporary directory removed when
+the run ends.
+
 It is intentionally minimal and intended as a starting point for deeper
 evaluation tooling.
 """
 
 from __future__ import annotations
 
+import argparse
 import logging
+import shutil
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from langgraph.graph.state import CompiledStateGraph
 
 from core.agent import AgentState, build_graph
 from core.config import load_config
-from core.memory import MemoryStore
+from core.memory import MEMORY_PATH, MemoryStore
 from core.policy_engine import PolicyEngine
 
 logger = logging.getLogger(__name__)
 
+# Per-process graph, built once by _init_worker.
+_GRAPH: CompiledStateGraph | None = None
 
-def main() -> None:
+
+def _setup_logging() -> None:
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     )
 
+
+def _init_worker(scratch_root: str) -> None:
+    """Build this process's graph against a scratch copy of the memory file."""
+    global _GRAPH
+    _setup_logging()
     config = load_config()
-    memory = MemoryStore()
+    scratch = Path(tempfile.mkdtemp(prefix="worker-", dir=scratch_root)) / MEMORY_PATH.name
+    if MEMORY_PATH.exists():
+        shutil.copyfile(MEMORY_PATH, scratch)
+    memory = MemoryStore(path=scratch, config=config.memory)
     policy = PolicyEngine(config, memory)
+    _GRAPH = build_graph(config, memory, policy, dry_run=True, reason_only=True)
 
-    # Use a single-step graph invocation to inspect current behaviour on the
-    # latest observations stored in MemoryStore.
-    graph = build_graph(config, memory, policy, dry_run=True)
 
-    # Seed state with last_observations if present so REASON has context even
-    # without a fresh PERCEIVE step.
-    mem_state = memory.load()
-    observations = mem_state.get("last_observations", "")
+def _replay_one(observations: str) -> dict[str, Any] | None:
+    """Run REASON once over *observations* and return the chosen plan."""
+    assert _GRAPH is not None, "worker not initialised"
+    # Seed state with last_observations; the graph starts at REASON, so there
+    # is no PERCEIVE step to overwrite them.
     state: AgentState = {
         "observations": observations,
         "plan": None,
@@ -46,13 +73,40 @@ def main() -> None:
         "step": 0,
         "last_action_type": None,
     }
+    result = _GRAPH.invoke(state)
+    return result.get("plan")
+
 
-    # Run through REASON only by invoking the compiled graph nodes directly.
-    # This keeps things simple without needing a separate REASON-only graph.
-    result = graph.invoke(state)
-    logger.info("backtest result plan: %s", result.get("plan"))
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=1, help="number of replays (default 1)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default 1)")
+    args = parser.parse_args()
+    _setup_logging()
+
+    observations = MemoryStore().load_key("last_observations", "")
+    runs = max(1, args.runs)
+
+    # Owned by the parent: pool workers may exit without running atexit hooks.
+    with tempfile.TemporaryDirectory(prefix="backtest-") as scratch_root:
+        if args.workers <= 1:
+            _init_worker(scratch_root)
+            plans = [_replay_one(observations) for _ in range(runs)]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=args.workers, initializer=_init_worker, initargs=(scratch_root,)
+            ) as pool:
+                plans = list(pool.map(_replay_one, [observations] * runs))
+
+    for plan in plans:
+        logger.info("backtest result plan: %s", plan)
+    counts = Counter(str((plan or {}).get("action_type", "none")) for plan in plans)
+    logger.info(
+        "action types over %d run(s): %s",
+        runs,
+        ", ".join(f"{action}={n}" for action, n in counts.most_common()),
+    )
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,67 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+from typing import Any
+
+import base58
+import pytest
+from solders.keypair import Keypair
+
+from core.config import AppConfig, GitConfig, LLMConfig, MemoryConfig, PolicyConfig, SolanaConfig
+from core.memory import _DEFAULT_STATE, MemoryStore
+
+
+class InMemoryStore(MemoryStore):
+    """MemoryStore that keeps state in a dict and never touches disk.
+
+    All mutators (add_spend, append_trade, batch(), flush(), …) are inherited
+    and go through load()/save(), so tests exercise the real bookkeeping logic;
+    only the final disk write is replaced.
+    On-disk format is covered separately in test_memory.py.
+    """
+
+    def __init__(self, config: MemoryConfig | None = None) -> None:
+        super().__init__(path=Path("in-memory.json"), config=config)
+        self._state: dict[str, Any] = copy.deepcopy(_DEFAULT_STATE)
+
+    def load(self) -> dict[str, Any]:
+        if self._batch_state is not None:
+            return self._batch_state
+        return copy.deepcopy(self._state)
+
+    def load_key(self, key: str, default: Any = None) -> Any:
+        if self._batch_state is not None:
+            return self._batch_state.get(key, default)
+        return copy.deepcopy(self._state.get(key, default))
+
+    def _write(self, state: dict[str, Any]) -> None:
+        self._state = copy.deepcopy(self._summarize_and_rotate(state))
+
+
+@pytest.fixture
+def inmemory_store() -> InMemoryStore:
+    return InMemoryStore()
+
+
+@pytest.fixture(scope="session")
+def base_app_config() -> AppConfig:
+    """Frozen mainnet AppConfig shared by the whole session.
+
+    Tests needing variants should derive them with ``dataclasses.replace``.
+    """
+    return AppConfig(
+        llm=LLMConfig(api_key="test"),
+        solana=SolanaConfig(private_key="fake", rpc_url="https://api.mainnet-beta.solana.com"),
+        policy=PolicyConfig(),
+        git=GitConfig(token="gh", repo="owner/repo"),
+        memory=MemoryConfig(),
+    )
+
+
+@pytest.fixture(scope="session")
+def valid_key_b58() -> str:
+    """Base58 secret key for a throwaway Keypair, generated once per session."""
+    return base58.b58encode(bytes(Keypair())).decode()
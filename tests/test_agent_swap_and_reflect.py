@@ -2,32 +2,24 @@ from __future__ import annotations
 
 from unittest.mock import MagicMock, patch
 
-from core.config import AppConfig, GitConfig, LLMConfig, MemoryConfig, PolicyConfig, SolanaConfig
+from core.config import AppConfig
 from core.memory import MemoryStore
 from core.network_config import NetworkType
 from core.policy_engine import PolicyEngine
 from tools.position_tool import PositionTool
 
 
-def _make_config_for_agent() -> AppConfig:
-    return AppConfig(
-        llm=LLMConfig(api_key="test"),
-        solana=SolanaConfig(private_key="fake", rpc_url="https://api.mainnet-beta.solana.com"),
-        policy=PolicyConfig(),
-        git=GitConfig(token="gh", repo="owner/repo"),
-        memory=MemoryConfig(),
-    )
-
-
 @patch("core.agent.NetworkDetector.detect")
-def test_mainnet_swap_appends_mainnet_transaction(mock_detect, tmp_path) -> None:
+def test_mainnet_swap_appends_mainnet_transaction(
+    mock_detect, tmp_path, base_app_config: AppConfig
+) -> None:
     """Successful non-mock mainnet swaps should append to mainnet_transactions."""
     mock_detect.return_value = NetworkType.MAINNET
 
     from core.agent import build_graph  # imported late to pick up patched detector
 
     mem = MemoryStore(path=tmp_path / "mem.json")
-    cfg = _make_config_for_agent()
+    cfg = base_app_config
     policy = PolicyEngine(cfg, mem)
 
     # Seed a SOL position so mainnet safety check passes
@@ -80,14 +72,16 @@ def test_mainnet_swap_appends_mainnet_transaction(mock_detect, tmp_path) -> None
 
 
 @patch("core.agent.WalletTool.balance_token")
-def test_swap_from_zero_balance_token_is_skipped(mock_balance_token, tmp_path) -> None:
+def test_swap_from_zero_balance_token_is_skipped(
+    mock_balance_token, tmp_path, base_app_config: AppConfig
+) -> None:
     """Swaps from a zero-balance token should be skipped with a clear message."""
     mock_balance_token.return_value = 0.0
 
     from core.agent import AgentState, build_graph  # type: ignore
 
     mem = MemoryStore(path=tmp_path / "mem_zero.json")
-    cfg = _make_config_for_agent()
+    cfg = base_app_config
     policy = PolicyEngine(cfg, mem)
     graph = build_graph(cfg, mem, policy, dry_run=False)
 
@@ -62,8 +62,54 @@ class TestGetKlines:
         assert pd.api.types.is_datetime64_any_dtype(df["open_time"])
         assert pd.api.types.is_datetime64_any_dtype(df["close_time"])
 
+    def test_timestamps_are_utc_epoch_ms(self, tool: BinanceTool) -> None:
+        df = tool.get_klines()
+        assert str(df["open_time"].dt.tz) == "UTC"
+        assert df["open_time"].iloc[0] == pd.Timestamp(1700000000000, unit="ms", tz="UTC")
+        assert df["close_time"].iloc[0] == pd.Timestamp(1700003599999, unit="ms", tz="UTC")
+
     def test_values_are_correct(self, tool: BinanceTool) -> None:
         df = tool.get_klines()
         assert df.iloc[0]["open"] == 42000.0
         assert df.iloc[0]["close"] == 42300.0
         assert df.iloc[0]["high"] == 42500.0
+
+    def test_num_trades_is_int(self, tool: BinanceTool) -> None:
+        df = tool.get_klines()
+        assert df["num_trades"].dtype == "int64"
+        assert df.iloc[0]["num_trades"] == 12345
+
+    def test_empty_response_keeps_columns(self, tool: BinanceTool) -> None:
+        tool.client.get_klines.return_value = []
+        df = tool.get_klines()
+        assert df.empty
+        assert list(df.columns)[:6] == ["open_time", "open", "high", "low", "close", "volume"]
+
+
+class TestKlinesCache:
+    def test_repeat_call_is_served_from_cache(self, tool: BinanceTool) -> None:
+        first = tool.get_klines("BTCUSDT", limit=5)
+        first["close"] = 0.0  # callers enrich in place; must not leak into the cache
+        second = tool.get_klines("BTCUSDT", limit=5)
+        assert tool.client.get_klines.call_count == 1
+        assert second.iloc[0]["close"] == 42300.0
+
+    def test_different_args_are_fetched(self, tool: BinanceTool) -> None:
+        tool.get_klines("BTCUSDT", limit=5)
+        tool.get_klines("ETHUSDT", limit=5)
+        assert tool.client.get_klines.call_count == 2
+
+    def test_expired_entry_is_refetched(
+        self, tool: BinanceTool, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        clock = iter([1000.0, 1061.0])
+        monkeypatch.setattr("tools.binance_tool.time.monotonic", lambda: next(clock))
+        tool.get_klines("BTCUSDT")
+        tool.get_klines("BTCUSDT")
+        assert tool.client.get_klines.call_count == 2
+
+    def test_invalidate_forces_refetch(self, tool: BinanceTool) -> None:
+        tool.get_klines("BTCUSDT")
+        tool.invalidate()
+        tool.get_klines("BTCUSDT")
+        assert tool.client.get_klines.call_count == 2
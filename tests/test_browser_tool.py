@@ -6,7 +6,7 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from tools.browser_tool import BrowserTool
+from tools.browser_tool import BrowserTool, _block_heavy_resources
 
 
 @pytest.fixture
@@ -14,53 +14,72 @@ def browser_tool() -> BrowserTool:
     return BrowserTool()
 
 
-class TestScrapeAsync:
-    """Smoke-test that scrape() calls playwright and truncates."""
+def _mock_playwright_ctx(page_text: str) -> AsyncMock:
+    """Build an async_playwright() context whose page body is *page_text*."""
+    mock_page = AsyncMock()
+    mock_page.evaluate.side_effect = lambda _js, limit: [len(page_text), page_text[:limit]]
+    mock_page.goto = AsyncMock()
 
-    @pytest.mark.asyncio
-    async def test_scrape_truncates_to_8k(self, browser_tool: BrowserTool) -> None:
-        long_text = "x" * 20000
-        mock_page = AsyncMock()
-        mock_page.inner_text.return_value = long_text
-        mock_page.goto = AsyncMock()
+    mock_browser = AsyncMock()
+    mock_browser.new_page.return_value = mock_page
+    mock_browser.close = AsyncMock()
+
+    mock_playwright = AsyncMock()
+    mock_playwright.chromium.launch.return_value = mock_browser
+    mock_playwright.chromium.connect_over_cdp = AsyncMock(return_value=mock_browser)
 
-        mock_browser = AsyncMock()
-        mock_browser.new_page.return_value = mock_page
-        mock_browser.close = AsyncMock()
+    mock_ctx = AsyncMock()
+    mock_ctx.__aenter__.return_value = mock_playwright
+    mock_ctx.__aexit__.return_value = False
+    return mock_ctx
 
-        mock_playwright = AsyncMock()
-        mock_playwright.chromium.launch.return_value = mock_browser
-        mock_playwright.chromium.connect_over_cdp = AsyncMock(return_value=mock_browser)
 
-        mock_ctx = AsyncMock()
-        mock_ctx.__aenter__.return_value = mock_playwright
-        mock_ctx.__aexit__.return_value = False
+class TestTruncate:
+    def test_long_text_truncated_to_8k(self) -> None:
+        assert len(BrowserTool._truncate("x" * 20000)) == 8000
 
+    def test_short_text_not_truncated(self) -> None:
+        assert BrowserTool._truncate("hello world") == "hello world"
+
+
+class TestScrapeAsync:
+    """Smoke-test that scrape() calls playwright and truncates."""
+
+    @pytest.mark.asyncio
+    async def test_scrape_truncates_to_8k(self, browser_tool: BrowserTool) -> None:
+        mock_ctx = _mock_playwright_ctx("x" * 20000)
         with patch("tools.browser_tool.async_playwright", return_value=mock_ctx):
             result = await browser_tool.scrape("https://anything.example.com/page")
 
         assert len(result) == 8000
 
     @pytest.mark.asyncio
-    async def test_scrape_short_text_not_truncated(self, browser_tool: BrowserTool) -> None:
-        short_text = "hello world"
-        mock_page = AsyncMock()
-        mock_page.inner_text.return_value = short_text
-        mock_page.goto = AsyncMock()
-
-        mock_browser = AsyncMock()
-        mock_browser.new_page.return_value = mock_page
-        mock_browser.close = AsyncMock()
-
-        mock_playwright = AsyncMock()
-        mock_playwright.chromium.launch.return_value = mock_browser
-        mock_playwright.chromium.connect_over_cdp = AsyncMock(return_value=mock_browser)
+    async def test_scrape_many_shares_one_browser(self, browser_tool: BrowserTool) -> None:
+        mock_ctx = _mock_playwright_ctx("hello")
+        playwright = mock_ctx.__aenter__.return_value
+        page = playwright.chromium.launch.return_value.new_page.return_value
+        page.goto.side_effect = [None, TimeoutError("slow site"), None]
+        with patch("tools.browser_tool.async_playwright", return_value=mock_ctx):
+            results = await browser_tool.scrape_many(["https://a", "https://b", "https://c"])
 
-        mock_ctx = AsyncMock()
-        mock_ctx.__aenter__.return_value = mock_playwright
-        mock_ctx.__aexit__.return_value = False
+        assert results[0] == "hello"
+        assert isinstance(results[1], TimeoutError)
+        assert results[2] == "hello"
+        playwright.chromium.launch.assert_awaited_once()
+        assert page.close.await_count == 3
 
-        with patch("tools.browser_tool.async_playwright", return_value=mock_ctx):
-            result = await browser_tool.scrape("https://anything.example.com")
 
-        assert result == short_text
+class TestResourceBlocking:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("resource_type", "aborted"),
+        [("image", True), ("font", True), ("media", True), ("document", False), ("script", False)],
+    )
+    async def test_only_heavy_resources_are_aborted(
+        self, resource_type: str, aborted: bool
+    ) -> None:
+        route = AsyncMock()
+        route.request.resource_type = resource_type
+        await _block_heavy_resources(route)
+        assert route.abort.await_count == int(aborted)
+        assert route.continue_.await_count == int(not aborted)
@@ -0,0 +1,78 @@
+"""Tests for tools/coingecko_tool.py — replayed /search/trending payloads, no network."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from tools.coingecko_tool import CoingeckoTool
+
+# Trimmed /search/trending response (shape as returned by the public API).
+_TRENDING_PAYLOAD: dict[str, Any] = {
+    "coins": [
+        {
+            "item": {
+                "id": "bitcoin",
+                "coin_id": 1,
+                "name": "Bitcoin",
+                "symbol": "BTC",
+                "market_cap_rank": 1,
+                "score": 0,
+            }
+        },
+        {
+            "item": {
+                "id": "dogwifcoin",
+                "coin_id": 33566,
+                "name": "dogwifhat",
+                "symbol": "WIF",
+                "market_cap_rank": None,
+                "score": 1,
+            }
+        },
+    ],
+    "nfts": [],
+    "categories": [],
+}
+
+
+def _replaying_tool(
+    monkeypatch: pytest.MonkeyPatch, payload: dict[str, Any] | None
+) -> CoingeckoTool:
+    monkeypatch.delenv("COINGECKO_DEMO_API_KEY", raising=False)
+    tool = CoingeckoTool()
+    monkeypatch.setattr(tool._client, "get_search_trending", lambda: payload)
+    return tool
+
+
+class TestTrendingSummary:
+    def test_formats_recorded_payload(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        summary = _replaying_tool(monkeypatch, _TRENDING_PAYLOAD).get_trending_summary()
+        lines = summary.splitlines()
+        assert lines[0] == (
+            "[coingecko_trending] rank=1 id=bitcoin symbol=btc name=Bitcoin "
+            "market_cap_rank=1 score=0"
+        )
+        # Missing market_cap_rank is omitted rather than printed as None.
+        assert lines[1] == (
+            "[coingecko_trending] rank=2 id=dogwifcoin symbol=wif name=dogwifhat score=1"
+        )
+
+    def test_api_failure_reports_unavailable(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        summary = _replaying_tool(monkeypatch, None).get_trending_summary()
+        assert "unavailable" in summary
+
+    def test_no_coins(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        summary = _replaying_tool(monkeypatch, {"coins": []}).get_trending_summary()
+        assert summary == "[coingecko_trending] no trending coins returned"
+
+    def test_malformed_entries_are_skipped(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        payload = {"coins": [{}, {"item": None}, _TRENDING_PAYLOAD["coins"][0]]}
+        summary = _replaying_tool(monkeypatch, payload).get_trending_summary()
+        # Rank still reflects the position in the API response.
+        assert summary.startswith("[coingecko_trending] rank=3 id=bitcoin ")
+        assert len(summary.splitlines()) == 1
+
+        only_junk = _replaying_tool(monkeypatch, {"coins": [{}]}).get_trending_summary()
+        assert only_junk == "[coingecko_trending] no trending coins returned"
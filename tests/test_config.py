@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+from collections.abc import Iterator
 from unittest.mock import patch
 
 import pytest
@@ -33,6 +34,14 @@ class TestGetenv:
         with patch.dict(os.environ, {"TEST_KEY": "0.6  # comment"}, clear=False):
             assert _getenv("TEST_KEY", "fallback") == "0.6"
 
+    def test_keeps_hash_without_leading_space(self) -> None:
+        with patch.dict(os.environ, {"TEST_KEY": "https://x.io/#frag  # note"}, clear=False):
+            assert _getenv("TEST_KEY") == "https://x.io/#frag"
+
+    def test_strips_comment_from_default(self) -> None:
+        with patch.dict(os.environ, {}, clear=True):
+            assert _getenv("MISSING_VAR_XYZ", "200 # loc") == "200"
+
 
 class TestRequire:
     def test_raises_when_missing(self) -> None:
@@ -50,6 +59,12 @@ _REQUIRED_ENV = {
 
 
 class TestLoadConfig:
+    @pytest.fixture(autouse=True)
+    def _fresh_config(self) -> Iterator[None]:
+        load_config.cache_clear()
+        yield
+        load_config.cache_clear()
+
     def test_returns_app_config_when_all_required_set(self) -> None:
         with patch.dict(os.environ, _REQUIRED_ENV, clear=False):
             config = load_config()
@@ -77,3 +92,10 @@ class TestLoadConfig:
         assert config.solana.rpc_url == "https://custom.rpc.com"
         assert config.policy.confidence_threshold == 0.8
         assert config.git.branch == "develop"
+
+    def test_result_is_cached_until_cleared(self) -> None:
+        with patch.dict(os.environ, _REQUIRED_ENV, clear=False):
+            first = load_config()
+            assert load_config() is first
+            load_config.cache_clear()
+            assert load_config() is not first
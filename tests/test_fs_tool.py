@@ -38,6 +38,12 @@ class TestReadFile:
         with pytest.raises(PermissionError, match="escapes the project root"):
             read_file("../other/file.txt")
 
+    def test_read_file_sibling_prefix_dir_raises(self, project_root: Path) -> None:
+        (project_root / "tools_old").mkdir()
+        (project_root / "tools_old" / "x.py").write_text("x")
+        with pytest.raises(PermissionError, match="outside allowed"):
+            read_file("tools_old/x.py")
+
     def test_read_file_experiments_allowed(self, project_root: Path) -> None:
         (project_root / "experiments" / "run.txt").write_text("data")
         assert read_file("experiments/run.txt") == "data"
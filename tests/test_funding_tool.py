@@ -0,0 +1,178 @@
+"""Tests for tools/funding_tool.py — Binance Futures served by httpx.MockTransport."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from tools.funding_tool import _FAPI_BASE_URL, FundingTool
+from tools.http_client import build_http_client
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+@pytest.fixture(autouse=True)
+def _no_retry_sleep(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(FundingTool._get_json.retry, "sleep", lambda seconds: None)
+
+
+def _tool(handler: Handler) -> FundingTool:
+    return FundingTool(http=build_http_client(httpx.MockTransport(handler)))
+
+
+# Trimmed /premiumIndex response without a symbol (one entry per perpetual).
+_PREMIUM_INDEX = [
+    {"symbol": "BTCUSDT", "markPrice": "67000.1", "lastFundingRate": "0.00010000"},
+    {"symbol": "ETHUSDT", "markPrice": "3500.2"},
+    {"symbol": "SOLUSDT", "markPrice": "150.3", "lastFundingRate": "-0.00020000"},
+    {"symbol": "DOGEUSDT", "markPrice": "0.1", "lastFundingRate": "0.00050000"},
+]
+
+
+class TestFundingRates:
+    def test_filters_batch_response_to_requested_symbols(self) -> None:
+        rates = _tool(lambda request: httpx.Response(200, json=_PREMIUM_INDEX)).get_funding_rates(
+            ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+        )
+        # ETHUSDT has no lastFundingRate and DOGEUSDT was not requested.
+        assert rates == {"BTCUSDT": pytest.approx(0.0001), "SOLUSDT": pytest.approx(-0.0002)}
+
+    def test_unparsable_rates_are_skipped(self) -> None:
+        payload = [
+            {"symbol": "BTCUSD_260327", "lastFundingRate": ""},  # delivery contract
+            {"symbol": "ETHUSDT", "lastFundingRate": "n/a"},
+            *_PREMIUM_INDEX,
+        ]
+        rates = _tool(lambda request: httpx.Response(200, json=payload)).get_funding_rates(
+            ["BTCUSDT", "ETHUSDT"]
+        )
+        assert rates == {"BTCUSDT": pytest.approx(0.0001)}
+
+    def test_http_error_returns_empty(self) -> None:
+        rates = _tool(lambda request: httpx.Response(500)).get_funding_rates(["BTCUSDT"])
+        assert rates == {}
+
+    def test_single_request_for_many_symbols(self) -> None:
+        seen: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(str(request.url))
+            if request.url.path.endswith("/premiumIndex"):
+                return httpx.Response(200, json=_PREMIUM_INDEX)
+            return httpx.Response(200, json={"openInterest": "12.5"})
+
+        tool = _tool(handler)
+        tool.get_funding_rates(["BTCUSDT", "SOLUSDT", "DOGEUSDT"])
+        assert tool.get_open_interest("BTCUSDT") == pytest.approx(12.5)
+        assert seen == [
+            f"{_FAPI_BASE_URL}/premiumIndex",
+            f"{_FAPI_BASE_URL}/openInterest?symbol=BTCUSDT",
+        ]
+
+    def test_http_version_is_logged_once(self, caplog: pytest.LogCaptureFixture) -> None:
+        tool = _tool(lambda request: httpx.Response(200, json=_PREMIUM_INDEX))
+        with caplog.at_level(logging.DEBUG, logger="tools.funding_tool"):
+            tool.get_funding_rates(["BTCUSDT"])
+            tool.invalidate()
+            tool.get_funding_rates(["BTCUSDT"])
+        negotiated = [r.getMessage() for r in caplog.records if "negotiated" in r.getMessage()]
+        assert negotiated == ["binance futures connection negotiated HTTP/1.1"]
+
+
+class TestRetry:
+    @pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+    def test_transient_status_is_retried(self, status: int) -> None:
+        responses = iter([httpx.Response(status), httpx.Response(200, json=_PREMIUM_INDEX)])
+        rates = _tool(lambda request: next(responses)).get_funding_rates(["BTCUSDT"])
+        assert rates == {"BTCUSDT": pytest.approx(0.0001)}
+
+    def test_transport_error_is_retried(self) -> None:
+        calls: list[int] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(1)
+            if len(calls) == 1:
+                raise httpx.ReadTimeout("slow", request=request)
+            return httpx.Response(200, json={"openInterest": "3"})
+
+        assert _tool(handler).get_open_interest("BTCUSDT") == 3.0
+        assert len(calls) == 2
+
+    @pytest.mark.parametrize(("status", "attempts"), [(400, 1), (404, 1), (503, 3)])
+    def test_gives_up(self, status: int, attempts: int) -> None:
+        calls: list[int] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(1)
+            return httpx.Response(status)
+
+        assert _tool(handler).get_funding_rates(["BTCUSDT"]) == {}
+        assert len(calls) == attempts
+
+
+class TestOpenInterest:
+    def test_error_returns_zero(self) -> None:
+        assert _tool(lambda request: httpx.Response(503)).get_open_interest("BTCUSDT") == 0.0
+
+    def test_uses_injected_shared_client(self) -> None:
+        http = build_http_client(httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+        assert FundingTool(http=http)._http is http
+
+
+class TestCache:
+    @pytest.fixture()
+    def calls(self) -> list[str]:
+        return []
+
+    @pytest.fixture()
+    def tool(self, calls: list[str]) -> FundingTool:
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path.rsplit("/", 1)[-1])
+            if request.url.path.endswith("/premiumIndex"):
+                return httpx.Response(200, json=_PREMIUM_INDEX)
+            return httpx.Response(200, json={"openInterest": "12.5"})
+
+        return _tool(handler)
+
+    def test_fresh_rates_skip_the_request(self, tool: FundingTool, calls: list[str]) -> None:
+        first = tool.get_funding_rates(["BTCUSDT", "SOLUSDT"])
+        # DOGEUSDT came back in the same batch, so it is already cached too.
+        assert tool.get_funding_rates(["DOGEUSDT", "BTCUSDT"]) == {
+            "DOGEUSDT": pytest.approx(0.0005),
+            "BTCUSDT": first["BTCUSDT"],
+        }
+        assert calls == ["premiumIndex"]
+
+    def test_uncached_symbol_refetches(self, tool: FundingTool, calls: list[str]) -> None:
+        tool.get_funding_rates(["BTCUSDT"])
+        # ETHUSDT has no rate in the payload, so it is never cached.
+        tool.get_funding_rates(["BTCUSDT", "ETHUSDT"])
+        assert calls == ["premiumIndex", "premiumIndex"]
+
+    def test_expired_entries_are_refetched(
+        self, tool: FundingTool, calls: list[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        clock = iter([1000.0, 1000.0, 1301.0, 1016.0])
+        # Replace the module's clock only; tenacity reads time.monotonic as well.
+        monkeypatch.setattr(
+            "tools.funding_tool.time", SimpleNamespace(monotonic=lambda: next(clock))
+        )
+        tool.get_funding_rates(["BTCUSDT"])
+        tool.get_open_interest("BTCUSDT")
+        tool.get_funding_rates(["BTCUSDT"])
+        tool.get_open_interest("BTCUSDT")
+        assert calls == ["premiumIndex", "openInterest", "premiumIndex", "openInterest"]
+
+    def test_open_interest_is_cached(self, tool: FundingTool, calls: list[str]) -> None:
+        assert tool.get_open_interest("BTCUSDT") == tool.get_open_interest("BTCUSDT")
+        assert calls == ["openInterest"]
+
+    def test_invalidate_forces_refetch(self, tool: FundingTool, calls: list[str]) -> None:
+        tool.get_funding_rates(["BTCUSDT"])
+        tool.invalidate()
+        tool.get_funding_rates(["BTCUSDT"])
+        assert calls == ["premiumIndex", "premiumIndex"]
@@ -0,0 +1,39 @@
+"""Tests for tools/git_tool.py — subprocess calls are recorded, never executed."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.config import AppConfig, GitConfig
+from core.policy_engine import PolicyViolation
+from tools.git_tool import GitTool
+
+
+@pytest.fixture()
+def git_tool(base_app_config: AppConfig) -> GitTool:
+    config = replace(base_app_config, git=GitConfig(token="tok", repo="o/r", branch="main"))
+    return GitTool(config, MagicMock())
+
+
+class TestCommitAndPush:
+    @patch("tools.git_tool.subprocess.run")
+    def test_add_commit_push_only(self, mock_run: MagicMock, git_tool: GitTool) -> None:
+        assert git_tool.commit_and_push(["tools/x.py"], "msg") == "push succeeded"
+        argv = [c.args[0] for c in mock_run.call_args_list]
+        assert argv == [
+            ["git", "add", "--", "tools/x.py"],
+            ["git", "commit", "-m", "msg"],
+            ["git", "push", "https://tok@github.com/o/r.git", "main"],
+        ]
+        # Token-bearing output is captured, never echoed.
+        assert mock_run.call_args_list[2].kwargs["stdout"] is not None
+
+    @patch("tools.git_tool.subprocess.run")
+    def test_policy_violation_runs_nothing(self, mock_run: MagicMock, git_tool: GitTool) -> None:
+        git_tool.policy.check_git_paths.side_effect = PolicyViolation("nope")
+        with pytest.raises(PolicyViolation):
+            git_tool.commit_and_push(["core/agent.py"], "msg")
+        mock_run.assert_not_called()
@@ -7,7 +7,7 @@ from pathlib import Path
 import pytest
 
 from core.memory import MemoryStore
-from tools.history_tool import HistoryTool
+from tools.history_tool import HistoryTool, _format_trade
 
 
 @pytest.fixture
@@ -69,3 +69,30 @@ class TestRecent:
         assert "params" in text
         assert "USDC" in text
         assert "SOL" in text
+
+
+class TestFormatTrade:
+    @pytest.mark.parametrize(
+        ("params", "params_line"),
+        [({}, []), ({"amount_sol": 0.1}, ["  params   : {'amount_sol': 0.1}"])],
+        ids=["no-params", "params"],
+    )
+    def test_line_layout(self, params: dict, params_line: list[str]) -> None:
+        trade = {
+            "date": "2025-01-02",
+            "action_type": "swap",
+            "target": "SOL",
+            "params": params,
+            "confidence": 0.7,
+            "reason": "dip",
+            "result": "sig",
+        }
+        assert _format_trade(3, trade).splitlines() == [
+            "--- past action #3 (2025-01-02) ---",
+            "  action   : swap",
+            "  target   : SOL",
+            *params_line,
+            "  confidence: 0.7",
+            "  why      : dip",
+            "  result   : sig",
+        ]
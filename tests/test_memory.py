@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import json
+import math
 from datetime import date
 from pathlib import Path
 
 import pytest
 
+from core.config import MemoryConfig
 from core.memory import MemoryStore
+from tools.position_tool import PositionTool
 
 
 @pytest.fixture
@@ -36,6 +40,86 @@ class TestLoadSave:
         assert len(loaded["trades"]) == 1
         assert loaded["trades"][0]["action_type"] == "analyze"
 
+    def test_writes_compact_json_unless_pretty(self, tmp_path: Path) -> None:
+        compact = MemoryStore(path=tmp_path / "compact.json")
+        compact.save(compact.load())
+        assert "\n" not in compact.path.read_text()
+
+        pretty = MemoryStore(path=tmp_path / "pretty.json", config=MemoryConfig(pretty=True))
+        pretty.save(pretty.load())
+        assert "\n  " in pretty.path.read_text()
+
+
+    def test_legacy_file_with_nan_loads_and_round_trips(self, store: MemoryStore) -> None:
+        # The stdlib encoder used to write NaN/Infinity literals.
+        today = date.today().isoformat()
+        store.path.parent.mkdir(parents=True, exist_ok=True)
+        store.path.write_text(
+            json.dumps(
+                {
+                    "daily_spend_sol": math.nan,
+                    "daily_spend_date": today,
+                    "daily_swap_date": today,
+                    "positions": {"SOL": {"amount": 2.0, "cost_basis_usd": math.inf}},
+                }
+            )
+        )
+        state = store.load()
+        assert math.isnan(state["daily_spend_sol"])
+        assert store.load_key("positions")["SOL"]["cost_basis_usd"] == math.inf
+
+        # Re-saved non-finite values come back as null and count as missing.
+        store.save(state)
+        assert store.load_key("daily_spend_sol") is None
+        store.add_spend(0.1)
+        assert store.load_key("daily_spend_sol") == 0.1
+        PositionTool(store).update_position("SOL", 1.0, 50.0)
+        assert store.load_key("positions")["SOL"]["cost_basis_usd"] == 50.0
+
+    def test_load_sees_writes_from_other_stores(self, store: MemoryStore) -> None:
+        store.save(store.load())
+        store.load()
+        other = MemoryStore(path=store.path)
+        state = other.load()
+        state["trades"] = [{"action_type": "hold"}] * 3
+        other.save(state)
+        assert len(store.load()["trades"]) == 3
+
+    def test_loaded_state_is_not_shared_between_calls(self, store: MemoryStore) -> None:
+        store.save(store.load())
+        store.load()["trades"].append({"action_type": "unsaved"})
+        assert store.load()["trades"] == []
+
+
+    def test_load_key_reads_single_field_without_writing(self, store: MemoryStore) -> None:
+        assert store.load_key("trades") == []
+        assert store.load_key("missing", "fallback") == "fallback"
+        state = store.load()
+        state["daily_spend_date"] = "2000-01-01"
+        state["last_observations"] = "obs"
+        store.save(state)
+        before = store.path.read_bytes()
+        assert store.load_key("last_observations") == "obs"
+        assert store.path.read_bytes() == before
+
+    def test_unchanged_save_skips_write(self, store: MemoryStore) -> None:
+        store.save(store.load())
+        state = store.load()  # applies and persists the daily reset
+        mtime = store.path.stat().st_mtime_ns
+        store.save(state)
+        store.save(store.load())
+        assert store.path.stat().st_mtime_ns == mtime
+        state["daily_spend_sol"] = 0.25
+        store.save(state)
+        assert store.load()["daily_spend_sol"] == 0.25
+
+    def test_unchanged_save_rewrites_file_removed_externally(self, store: MemoryStore) -> None:
+        state = store.load()
+        store.save(state)
+        store.path.unlink()
+        store.save(state)
+        assert store.path.exists()
+
 
 class TestDailyReset:
     def test_stale_daily_spend_date_resets_counters(self, store: MemoryStore) -> None:
@@ -97,6 +181,13 @@ class TestAppendTradeAndRecentTrades:
         assert recent[0]["action_type"] == "action_2"
         assert recent[1]["action_type"] == "action_1"
 
+    def test_trades_are_capped_by_config(self, tmp_path: Path) -> None:
+        store = MemoryStore(path=tmp_path / "capped.json", config=MemoryConfig(max_trades=3))
+        for i in range(5):
+            store.append_trade(plan={"action_type": f"a{i}"}, result="ok")
+        assert [t["action_type"] for t in store.recent_trades(10)] == ["a4", "a3", "a2"]
+        assert store.load()["trade_summaries"][-1]["total"] == 1
+
     def test_append_trade_truncates_result_at_300_chars(self, store: MemoryStore) -> None:
         long_result = "x" * 500
         store.append_trade(
@@ -106,6 +197,18 @@ class TestAppendTradeAndRecentTrades:
         recent = store.recent_trades(1)
         assert len(recent[0]["result"]) == 300
 
+    @pytest.mark.parametrize(
+        ("code", "expected"),
+        [("", 0), ("x = 1", 1), ("x = 1\n", 1), ("a\nb\nc", 3), ("a\nb\n", 2)],
+    )
+    def test_extend_code_stores_line_count_only(
+        self, store: MemoryStore, code: str, expected: int
+    ) -> None:
+        plan = {"action_type": "extend_code", "params": {"code": code, "commit_message": "m"}}
+        store.append_trade(plan, "ok")
+        params = store.recent_trades(1)[0]["params"]
+        assert params == {"commit_message": "m", "code_lines": expected}
+
 
 class TestAppendReflection:
     def test_append_reflection_adds_entry_with_date_and_text(self, store: MemoryStore) -> None:
@@ -114,3 +217,82 @@ class TestAppendReflection:
         assert len(state["reflections"]) == 1
         assert state["reflections"][0]["text"] == "thought"
         assert state["reflections"][0]["date"]
+
+
+class TestObservationCompression:
+    def test_keeps_only_close_prices(self, store: MemoryStore) -> None:
+        observations = "\n".join(
+            [
+                "=== scrape ===",
+                "[SOLUSDT] close=90.1900",
+                "  SMA20=89.0000  SMA50=88.0000",
+                "[BTCUSDT] close=70283.2300",
+            ]
+        )
+        store.set_observations_compressed(observations)
+        state = store.load()
+        assert state["last_observations_prices"] == [
+            "[SOLUSDT] 90.1900",
+            "[BTCUSDT] 70283.2300",
+        ]
+        assert state["last_observations"] == ""
+
+
+class TestBatch:
+    def test_batch_defers_writes_until_exit(self, store: MemoryStore) -> None:
+        with store.batch():
+            store.append_reflection("r")
+            store.set_observations_compressed("[SOLUSDT] close=90.1")
+            assert not store.path.exists()
+            # Mutators inside the batch see each other's changes.
+            assert [r["text"] for r in store.load()["reflections"]] == ["r"]
+        state = MemoryStore(path=store.path).load()
+        assert [r["text"] for r in state["reflections"]] == ["r"]
+        assert state["last_observations_prices"] == ["[SOLUSDT] 90.1"]
+
+    def test_nested_batch_flushes_once_at_outer_exit(self, store: MemoryStore) -> None:
+        with store.batch():
+            with store.batch():
+                store.append_reflection("r")
+            assert not store.path.exists()
+        assert len(store.load()["reflections"]) == 1
+
+    def test_batch_flushes_on_exception(self, store: MemoryStore) -> None:
+        with pytest.raises(RuntimeError):
+            with store.batch():
+                store.append_reflection("r")
+                raise RuntimeError("boom")
+        assert len(store.load()["reflections"]) == 1
+
+    def test_spend_and_audit_records_are_written_inside_batch(self, store: MemoryStore) -> None:
+        # A killed process never reaches the batch exit; these must already be on disk.
+        with store.batch():
+            store.append_reflection("before")
+            store.add_spend(0.1)
+            on_disk = MemoryStore(path=store.path).load()
+            assert on_disk["daily_spend_sol"] == 0.1
+            assert [r["text"] for r in on_disk["reflections"]] == ["before"]
+
+            store.add_swap_usd(20.0)
+            store.append_mainnet_transaction("swap", {"signature": "sig"})
+            on_disk = MemoryStore(path=store.path).load()
+            assert on_disk["daily_swap_usd"] == 20.0
+            assert on_disk["mainnet_transactions"][0]["details"] == {"signature": "sig"}
+        assert store.load()["daily_spend_sol"] == 0.1
+
+    def test_batch_without_changes_does_not_write(self, store: MemoryStore) -> None:
+        with store.batch():
+            store.load()
+        assert not store.path.exists()
+
+
+class TestMainnetTransactions:
+    def test_log_is_capped_by_config(self, tmp_path: Path) -> None:
+        store = MemoryStore(
+            path=tmp_path / "mainnet.json", config=MemoryConfig(max_mainnet_transactions=2)
+        )
+        for i in range(3):
+            store.append_mainnet_transaction("swap", {"signature": f"sig{i}"})
+        log = store.load()["mainnet_transactions"]
+        assert [e["details"]["signature"] for e in log] == ["sig1", "sig2"]
+        assert log[-1]["chain"] == "solana-mainnet"
@@ -2,21 +2,210 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any
 
+import httpx
+import pytest
+
+from tools.http_client import build_http_client
 from tools.onchain_tool import OnchainConfig, OnchainTool
 
+_RPC_URL = "https://api.devnet.solana.com"
+_ADDR_A = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
+_ADDR_B = "5Q544fKrFoe6tsEbD7S8EmxGTJYAKtTVhAW5Q5pge4j1"
+
+
+def _tool(handler: Any) -> OnchainTool:
+    http = build_http_client(httpx.MockTransport(handler))
+    return OnchainTool(OnchainConfig(rpc_url=_RPC_URL), http=http)
+
+
+def _sig(name: str, slot: int, age: timedelta | None) -> dict[str, Any]:
+    block_time = None
+    if age is not None:
+        block_time = int((datetime.now(timezone.utc) - age).timestamp())
+    return {"signature": name, "slot": slot, "blockTime": block_time, "err": None}
+
 
 class TestOnchainTool:
-    @patch("tools.onchain_tool.SolanaClient")
-    def test_large_transfers_no_addresses_returns_empty(self, mock_client_cls: MagicMock) -> None:
-        tool = OnchainTool(OnchainConfig(rpc_url="https://api.devnet.solana.com"))
+    def test_large_transfers_no_addresses_returns_empty(self) -> None:
+        tool = OnchainTool(OnchainConfig(rpc_url=_RPC_URL))
         events = tool.get_large_transfers(addresses=[])
         assert events == []
 
-    @patch("tools.onchain_tool.SolanaClient")
-    def test_summarize_large_transfers_no_addresses(self, mock_client_cls: MagicMock) -> None:
-        tool = OnchainTool(OnchainConfig(rpc_url="https://api.devnet.solana.com"))
+    def test_summarize_large_transfers_no_addresses(self) -> None:
+        tool = OnchainTool(OnchainConfig(rpc_url=_RPC_URL))
         summary = tool.summarize_large_transfers(addresses=[])
         assert "no tracked addresses" in summary
 
+
+class TestBatchedSignatures:
+    def test_one_batch_request_for_all_addresses(self) -> None:
+        bodies: list[Any] = []
+        signatures = {
+            _ADDR_A: [_sig("a1", 300, timedelta(hours=1)), _sig("a2", 200, timedelta(hours=30))],
+            _ADDR_B: [_sig("b1", 250, None), _sig("b2", 240, timedelta(hours=2))],
+        }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            bodies.append(body)
+            replies = [
+                {"jsonrpc": "2.0", "id": call["id"], "result": signatures[call["params"][0]]}
+                for call in reversed(body)  # replies may come back in any order
+            ]
+            return httpx.Response(200, json=replies)
+
+        events = _tool(handler).get_large_transfers([_ADDR_A, _ADDR_B])
+
+        assert len(bodies) == 1
+        assert [call["method"] for call in bodies[0]] == ["getSignaturesForAddress"] * 2
+        assert [call["params"] for call in bodies[0]] == [
+            [_ADDR_A, {"limit": 50}],
+            [_ADDR_B, {"limit": 50}],
+        ]
+        # Outside the lookback window and missing block_time are both dropped.
+        assert sorted((e["address"], e["signature"]) for e in events) == [
+            (_ADDR_B, "b2"),
+            (_ADDR_A, "a1"),
+        ]
+
+    def test_min_slot_filters(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            result = [_sig("new", 300, timedelta(hours=1)), _sig("old", 100, timedelta(hours=2))]
+            return httpx.Response(200, json=[{"jsonrpc": "2.0", "id": 0, "result": result}])
+
+        events = _tool(handler).get_large_transfers([_ADDR_A], min_slot=200)
+        assert [e["signature"] for e in events] == ["new"]
+
+    def test_scan_stops_at_first_out_of_window_signature(self) -> None:
+        # Newest first; anything after the first stale entry is not even parsed.
+        result = [
+            _sig("fresh", 300, timedelta(hours=1)),
+            _sig("stale", 290, timedelta(hours=48)),
+            {"signature": "unparsed", "slot": 280, "blockTime": "not-a-timestamp"},
+        ]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json=[{"jsonrpc": "2.0", "id": 0, "result": result}])
+
+        events = _tool(handler).get_large_transfers([_ADDR_A])
+        assert [e["signature"] for e in events] == ["fresh"]
+
+    def test_duplicate_addresses_are_queried_once(self) -> None:
+        bodies: list[Any] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            bodies.append(body)
+            result = [_sig("s", 1, timedelta(hours=1))]
+            return httpx.Response(
+                200, json=[{"jsonrpc": "2.0", "id": call["id"], "result": result} for call in body]
+            )
+
+        events = _tool(handler).get_large_transfers([_ADDR_B, _ADDR_A, _ADDR_B, _ADDR_A])
+        assert [call["params"][0] for call in bodies[0]] == [_ADDR_B, _ADDR_A]
+        assert [e["address"] for e in events] == [_ADDR_B, _ADDR_A]
+
+    def test_summary_counts_active_addresses(self) -> None:
+        signatures = {
+            _ADDR_A: [_sig("a1", 3, timedelta(hours=1)), _sig("a2", 2, timedelta(hours=2))],
+            _ADDR_B: [_sig("b1", 1, timedelta(hours=1))],
+        }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            replies = [
+                {"jsonrpc": "2.0", "id": call["id"], "result": signatures[call["params"][0]]}
+                for call in body
+            ]
+            return httpx.Response(200, json=replies)
+
+        summary = _tool(handler).summarize_large_transfers([_ADDR_A, _ADDR_B])
+        assert summary == "onchain: 3 recent transfers across 2 tracked addresses in last 24h"
+
+    def test_errored_entry_and_invalid_address_are_skipped(self) -> None:
+        bodies: list[Any] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            bodies.append(body)
+            return httpx.Response(
+                200,
+                json=[
+                    {"jsonrpc": "2.0", "id": 0, "error": {"code": -32005, "message": "busy"}},
+                    {"jsonrpc": "2.0", "id": 1, "result": [_sig("b1", 5, timedelta(hours=1))]},
+                ],
+            )
+
+        events = _tool(handler).get_large_transfers([_ADDR_A, "not-a-pubkey", _ADDR_B])
+        assert [call["params"][0] for call in bodies[0]] == [_ADDR_A, _ADDR_B]
+        assert [e["address"] for e in events] == [_ADDR_B]
+
+
+class _FakeAsyncClient:
+    """Stand-in for solana's AsyncClient serving canned per-address signatures."""
+
+    calls: list[str] = []
+    signatures: dict[str, list[SimpleNamespace] | Exception] = {}
+
+    def __init__(self, endpoint: str) -> None:
+        assert endpoint == _RPC_URL
+
+    async def __aenter__(self) -> _FakeAsyncClient:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    async def get_signatures_for_address(self, pubkey: Any, limit: int) -> SimpleNamespace:
+        addr = str(pubkey)
+        self.calls.append(addr)
+        result = self.signatures[addr]
+        if isinstance(result, Exception):
+            raise result
+        return SimpleNamespace(value=result)
+
+
+def _sig_info(name: str, slot: int, age: timedelta) -> SimpleNamespace:
+    block_time = int((datetime.now(timezone.utc) - age).timestamp())
+    return SimpleNamespace(signature=name, slot=slot, block_time=block_time)
+
+
+class TestConcurrentFallback:
+    @pytest.fixture(autouse=True)
+    def fake_client(self, monkeypatch: pytest.MonkeyPatch) -> type[_FakeAsyncClient]:
+        monkeypatch.setattr(_FakeAsyncClient, "calls", [])
+        monkeypatch.setattr(
+            _FakeAsyncClient,
+            "signatures",
+            {
+                _ADDR_A: [_sig_info("a1", 10, timedelta(hours=1))],
+                _ADDR_B: RuntimeError("rate limited"),
+            },
+        )
+        monkeypatch.setattr("tools.onchain_tool.AsyncClient", _FakeAsyncClient)
+        return _FakeAsyncClient
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            httpx.Response(403, text="batch requests are not allowed on this plan"),
+            httpx.Response(200, json={"jsonrpc": "2.0", "id": None, "error": {"code": -32600}}),
+        ],
+        ids=["http-403", "batch-rejected"],
+    )
+    def test_rejected_batch_falls_back_per_address(
+        self, response: httpx.Response, fake_client: type[_FakeAsyncClient]
+    ) -> None:
+        events = _tool(lambda request: response).get_large_transfers([_ADDR_A, _ADDR_B])
+        assert sorted(fake_client.calls) == sorted([_ADDR_A, _ADDR_B])
+        # The failing address is skipped; the other still yields events.
+        assert [(e["address"], e["signature"], e["slot"]) for e in events] == [(_ADDR_A, "a1", 10)]
+
+    def test_fallback_failure_returns_empty(self, fake_client: type[_FakeAsyncClient]) -> None:
+        fake_client.signatures[_ADDR_A] = RuntimeError("down")
+        assert _tool(lambda request: httpx.Response(500)).get_large_transfers([_ADDR_A]) == []
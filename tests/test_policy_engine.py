@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
 
 import pytest
@@ -14,6 +16,7 @@ from core.policy_engine import PolicyEngine, PolicyViolation
 # ── fixtures ──────────────────────────────────────────────────────────────────
 
 
+@lru_cache(maxsize=None)
 def _make_config(
     max_sol_per_tx: float = 0.1,
     daily_cap: float = 0.5,
@@ -39,14 +42,20 @@ def _make_config(
     )
 
 
+@pytest.fixture(scope="session")
+def base_config() -> AppConfig:
+    return _make_config()
+
+
 @pytest.fixture
-def memory(tmp_path: Path) -> MemoryStore:
-    return MemoryStore(path=tmp_path / "agent_memory.json")
+def memory(inmemory_store: MemoryStore) -> MemoryStore:
+    """Policy checks only need state arithmetic, so skip the JSON file entirely."""
+    return inmemory_store
 
 
 @pytest.fixture
-def engine(memory: MemoryStore) -> PolicyEngine:
-    return PolicyEngine(_make_config(), memory)
+def engine(base_config: AppConfig, memory: MemoryStore) -> PolicyEngine:
+    return PolicyEngine(base_config, memory)
 
 
 # ── wallet send ───────────────────────────────────────────────────────────────
@@ -57,38 +66,30 @@ class TestWalletSend:
         # Should not raise
         engine.check_wallet_send(0.05, "A" * 44)
 
-    def test_zero_amount_blocked(self, engine: PolicyEngine) -> None:
+    @pytest.mark.parametrize("amount", [0.0, -0.01])
+    def test_non_positive_amount_blocked(self, engine: PolicyEngine, amount: float) -> None:
         with pytest.raises(PolicyViolation, match="positive"):
-            engine.check_wallet_send(0.0, "A" * 44)
-
-    def test_negative_amount_blocked(self, engine: PolicyEngine) -> None:
-        with pytest.raises(PolicyViolation, match="positive"):
-            engine.check_wallet_send(-0.01, "A" * 44)
+            engine.check_wallet_send(amount, "A" * 44)
 
     def test_exceeds_per_tx_cap(self, engine: PolicyEngine) -> None:
         with pytest.raises(PolicyViolation, match="MAX_SOL_PER_TX"):
             engine.check_wallet_send(0.2, "A" * 44)
 
-    def test_exceeds_daily_cap(self, memory: MemoryStore) -> None:
+    def test_exceeds_daily_cap(self, engine: PolicyEngine, memory: MemoryStore) -> None:
         # Simulate 0.45 already spent today
         memory.add_spend(0.45)
-        eng = PolicyEngine(_make_config(), memory)
         with pytest.raises(PolicyViolation, match="daily spend"):
-            eng.check_wallet_send(0.1, "A" * 44)
+            engine.check_wallet_send(0.1, "A" * 44)
 
-    def test_daily_cap_exactly_at_limit(self, memory: MemoryStore) -> None:
+    def test_daily_cap_exactly_at_limit(self, engine: PolicyEngine, memory: MemoryStore) -> None:
         memory.add_spend(0.4)
-        eng = PolicyEngine(_make_config(), memory)
         # 0.4 + 0.1 == 0.5 == cap → should pass (not strictly greater)
-        eng.check_wallet_send(0.1, "A" * 44)
-
-    def test_short_destination_blocked(self, engine: PolicyEngine) -> None:
-        with pytest.raises(PolicyViolation, match="destination"):
-            engine.check_wallet_send(0.05, "short")
+        engine.check_wallet_send(0.1, "A" * 44)
 
-    def test_empty_destination_blocked(self, engine: PolicyEngine) -> None:
+    @pytest.mark.parametrize("dest", ["", "short"])
+    def test_invalid_destination_blocked(self, engine: PolicyEngine, dest: str) -> None:
         with pytest.raises(PolicyViolation, match="destination"):
-            engine.check_wallet_send(0.05, "")
+            engine.check_wallet_send(0.05, dest)
 
 
 # ── browser URL ───────────────────────────────────────────────────────────────
@@ -113,6 +114,13 @@ class TestBrowserUrl:
         # Path traversal in URLs does not affect the now-unrestricted domain policy.
         engine.check_browser_url("https://evil.com/../coingecko.com/trick")
 
+    def test_configured_allowlist_is_not_enforced(
+        self, base_config: AppConfig, memory: MemoryStore
+    ) -> None:
+        # allowed_domains is informational only; scraping stays unrestricted.
+        config = replace(base_config, allowed_domains=frozenset({"coingecko.com"}))
+        PolicyEngine(config, memory).check_browser_url("example.com/no-scheme")
+
 
 # ── git paths ─────────────────────────────────────────────────────────────────
 
@@ -136,28 +144,64 @@ class TestGitPaths:
         with pytest.raises(PolicyViolation):
             engine.check_git_paths(["tools/good.py", "core/bad.py"])
 
+    def test_first_bad_path_short_circuits(self, engine: PolicyEngine) -> None:
+        class _Untouchable:
+            def __fspath__(self) -> str:
+                raise AssertionError("paths after the first violation must not be resolved")
+
+        with pytest.raises(PolicyViolation, match="core/bad.py"):
+            engine.check_git_paths(["core/bad.py", _Untouchable()])  # type: ignore[list-item]
+
+    def test_path_outside_repo_blocked(self, engine: PolicyEngine) -> None:
+        with pytest.raises(PolicyViolation, match="outside allowed"):
+            engine.check_git_paths(["../tools/escape.py"])
+
+    def test_sibling_prefix_blocked(self, engine: PolicyEngine) -> None:
+        with pytest.raises(PolicyViolation, match="outside allowed"):
+            engine.check_git_paths(["tools_extra/x.py"])
+
+    def test_allowed_write_paths_from_config(
+        self, base_config: AppConfig, memory: MemoryStore
+    ) -> None:
+        policy = replace(base_config.policy, allowed_write_paths=("docs",))
+        engine = PolicyEngine(replace(base_config, policy=policy), memory)
+        engine.check_git_paths(["docs/notes.md"])
+        with pytest.raises(PolicyViolation, match="outside allowed"):
+            engine.check_git_paths(["tools/my_new_tool.py"])
+
 
 # ── LOC delta ─────────────────────────────────────────────────────────────────
 
 
+# check_loc_delta never reads or writes memory; this store must stay untouched.
+_NULL_MEMORY = MemoryStore(path=Path("policy-engine-null-memory.json"))
+
+
+@pytest.fixture(scope="class")
+def loc_engine() -> PolicyEngine:
+    # One engine serves the whole class.
+    return PolicyEngine(_make_config(max_loc_delta=200), _NULL_MEMORY)
+
+
 class TestLocDelta:
-    def test_within_limit_passes(self) -> None:
-        eng = PolicyEngine(_make_config(max_loc_delta=200), MemoryStore())
-        eng.check_loc_delta(150)
+    def test_within_limit_passes(self, loc_engine: PolicyEngine) -> None:
+        loc_engine.check_loc_delta(150)
 
-    def test_at_limit_passes(self) -> None:
-        eng = PolicyEngine(_make_config(max_loc_delta=200), MemoryStore())
-        eng.check_loc_delta(200)
+    def test_at_limit_passes(self, loc_engine: PolicyEngine) -> None:
+        loc_engine.check_loc_delta(200)
 
-    def test_over_limit_blocked(self) -> None:
-        eng = PolicyEngine(_make_config(max_loc_delta=200), MemoryStore())
+    def test_over_limit_blocked(self, loc_engine: PolicyEngine) -> None:
         with pytest.raises(PolicyViolation, match="LOC delta"):
-            eng.check_loc_delta(201)
+            loc_engine.check_loc_delta(201)
 
-    def test_large_negative_delta_blocked(self) -> None:
-        eng = PolicyEngine(_make_config(max_loc_delta=200), MemoryStore())
+    def test_large_negative_delta_blocked(self, loc_engine: PolicyEngine) -> None:
         with pytest.raises(PolicyViolation, match="LOC delta"):
-            eng.check_loc_delta(-250)
+            loc_engine.check_loc_delta(-250)
+
+    def test_memory_is_never_written(self, loc_engine: PolicyEngine) -> None:
+        for delta in (0, 200, -200):
+            loc_engine.check_loc_delta(delta)
+        assert not _NULL_MEMORY.path.exists()
 
 
 # ── swap ─────────────────────────────────────────────────────────────────────
@@ -183,31 +227,29 @@ class TestSwap:
         with pytest.raises(PolicyViolation, match="MAX_SWAP_USD_PER_TX"):
             engine.check_swap("SOL", "USDC", 51.0, NetworkType.DEVNET)
 
-    def test_exceeds_daily_cap_raises(self, memory: MemoryStore) -> None:
+    def test_exceeds_daily_cap_raises(self, engine: PolicyEngine, memory: MemoryStore) -> None:
         memory.add_swap_usd(180.0)  # default daily_swap_cap_usd is 200
-        eng = PolicyEngine(_make_config(), memory)
         with pytest.raises(PolicyViolation, match="daily swap volume"):
-            eng.check_swap("SOL", "USDC", 25.0, NetworkType.DEVNET)
+            engine.check_swap("SOL", "USDC", 25.0, NetworkType.DEVNET)
 
     def test_within_limits_passes(self, engine: PolicyEngine) -> None:
         engine.check_swap("SOL", "USDC", 10.0, NetworkType.DEVNET)
 
 
 class TestSwapMainnetSafety:
-    def test_mainnet_sol_swap_respects_min_balance(self, tmp_path: Path) -> None:
+    def test_mainnet_sol_swap_respects_min_balance(self, memory: MemoryStore) -> None:
         """Mainnet SOL swap should not drain below configured minimum balance."""
-        mem = MemoryStore(path=tmp_path / "mem_mainnet.json")
-        state = mem.load()
+        state = memory.load()
         # Seed a SOL position of 0.5
         state["positions"] = {"SOL": {"amount": 0.5}}
-        mem.save(state)
+        memory.save(state)
 
         # Ensure a specific minimum balance and mainnet RPC URL for the test.
         cfg = _make_config(
             solana_rpc_url="https://api.mainnet-beta.solana.com",
             mainnet_min_balance_sol=0.1,
         )
-        eng = PolicyEngine(cfg, mem)
+        eng = PolicyEngine(cfg, memory)
 
         # Swapping 0.35 SOL-equivalent should leave 0.15 SOL (> 0.1) → allowed.
         eng.check_swap(
@@ -228,19 +270,18 @@ class TestSwapMainnetSafety:
                 amount_native=0.45,
             )
 
-    def test_mainnet_sol_swap_uses_native_not_usd(self, tmp_path: Path) -> None:
+    def test_mainnet_sol_swap_uses_native_not_usd(self, memory: MemoryStore) -> None:
         """Guard should respect SOL amount even when USD notional is large."""
-        mem = MemoryStore(path=tmp_path / "mem_mainnet_native.json")
-        state = mem.load()
+        state = memory.load()
         # Seed a SOL position of 0.5
         state["positions"] = {"SOL": {"amount": 0.5}}
-        mem.save(state)
+        memory.save(state)
 
         cfg = _make_config(
             solana_rpc_url="https://api.mainnet-beta.solana.com",
             mainnet_min_balance_sol=0.1,
         )
-        eng = PolicyEngine(cfg, mem)
+        eng = PolicyEngine(cfg, memory)
 
         # Example: SOL at $100 → amount_usd=10.0, amount_native=0.1. Using native
         # amount, 0.5 - 0.1 = 0.4 (> 0.1) so this should pass.
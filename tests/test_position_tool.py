@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any
+
+import pytest
 
 from core.memory import MemoryStore
 from tools.position_tool import PositionTool
@@ -15,37 +16,9 @@ class DummyWalletTool:
         return dict(self._balances)
 
 
-def _default_state() -> dict[str, Any]:
-    return {
-        "positions": {},
-        "trades": [],
-        "reflections": [],
-        "daily_spend_sol": 0.0,
-        "daily_spend_date": "",
-        "daily_swap_usd": 0.0,
-        "daily_swap_date": "",
-        "benchmark": {"start_date": "", "start_portfolio_usd": 0.0, "start_prices": {}},
-        "swap_history": [],
-    }
-
-
-class _InMemoryStore:
-    """Minimal store that never touches disk; used for isolated position tests."""
-
-    def __init__(self) -> None:
-        self._state = _default_state()
-
-    def load(self) -> dict[str, Any]:
-        return dict(self._state)
-
-    def save(self, state: dict[str, Any]) -> None:
-        self._state = dict(state)
-
-
 class TestPositionSyncFromOnchain:
-    def test_sync_initializes_missing_positions(self, tmp_path: Path) -> None:
-        memory = MemoryStore(path=tmp_path / "memory.json")
-        tool = PositionTool(memory)
+    def test_sync_initializes_missing_positions(self, inmemory_store: MemoryStore) -> None:
+        tool = PositionTool(inmemory_store)
         wallet = DummyWalletTool({"SOL": 0.5, "USDC": 100.0})
 
         tool.sync_from_onchain(wallet, {"SOL": 20.0, "USDC": 1.0})
@@ -57,9 +30,10 @@ class TestPositionSyncFromOnchain:
         assert usdc_pos["amount"] == 100.0
         assert usdc_pos.get("source") == "onchain_sync"
 
-    def test_sync_does_not_overwrite_existing_nonzero_positions(self, tmp_path: Path) -> None:
-        memory = MemoryStore(path=tmp_path / "memory.json")
-        tool = PositionTool(memory)
+    def test_sync_does_not_overwrite_existing_nonzero_positions(
+        self, inmemory_store: MemoryStore
+    ) -> None:
+        tool = PositionTool(inmemory_store)
         # Seed an existing SOL position
         tool.update_position("SOL", 0.2, 5.0)
 
@@ -71,9 +45,8 @@ class TestPositionSyncFromOnchain:
         assert sol_pos["amount"] == 0.2
 
 
-def test_update_and_value(tmp_path: Path) -> None:
-    memory = MemoryStore(path=tmp_path / "agent_memory.json")
-    tool = PositionTool(memory)
+def test_update_and_value(inmemory_store: MemoryStore) -> None:
+    tool = PositionTool(inmemory_store)
 
     # Buy 1 SOL at $100
     tool.update_position("SOL", amount_delta=1.0, usd_value=100.0)
@@ -87,9 +60,8 @@ def test_update_and_value(tmp_path: Path) -> None:
     assert "SOL" in summary
 
 
-def test_multiple_tokens_portfolio_value_and_summary() -> None:
-    memory = _InMemoryStore()
-    tool = PositionTool(memory)  # type: ignore[arg-type]
+def test_multiple_tokens_portfolio_value_and_summary(inmemory_store: MemoryStore) -> None:
+    tool = PositionTool(inmemory_store)
     tool.update_position("SOL", amount_delta=1.0, usd_value=100.0)
     tool.update_position("USDC", amount_delta=50.0, usd_value=50.0)
     prices = {"SOL": 120.0, "USDC": 1.0}
@@ -101,11 +73,78 @@ def test_multiple_tokens_portfolio_value_and_summary() -> None:
     assert "170" in summary
 
 
-def test_empty_portfolio_no_crash() -> None:
-    memory = _InMemoryStore()
-    tool = PositionTool(memory)  # type: ignore[arg-type]
+def test_empty_portfolio_no_crash(inmemory_store: MemoryStore) -> None:
+    tool = PositionTool(inmemory_store)
     value = tool.get_portfolio_value_usd({"SOL": 100.0})
     assert value == 0.0
     summary = tool.portfolio_summary({"SOL": 100.0})
     assert summary == "no tracked positions yet"
 
+
+
+def test_price_symbols_are_case_insensitive(inmemory_store: MemoryStore) -> None:
+    tool = PositionTool(inmemory_store)
+    tool.update_position("sol", 2.0, 200.0)
+    assert tool.get_portfolio_value_usd({"sol": 50}) == 100.0
+    assert tool.portfolio_summary({"Sol": "50"}) == "total ≈ $100.00; SOL: 2.000000 (~$100.00)"
+
+
+def test_partial_sell_reduces_cost_basis_proportionally(inmemory_store: MemoryStore) -> None:
+    tool = PositionTool(inmemory_store)
+    tool.update_position("SOL", 4.0, 400.0)
+    tool.update_position("SOL", -1.0, 0.0)
+    pos = tool.get_position("SOL")
+    assert pos["amount"] == 3.0
+    assert pos["cost_basis_usd"] == 300.0
+    assert isinstance(pos["amount"], float)
+
+    tool.update_position("SOL", -5.0, 0.0)
+    assert tool.get_position("SOL")["amount"] == 0.0
+    assert tool.get_position("SOL")["cost_basis_usd"] == 0.0
+
+
+class TestMemoryRoundTrips:
+    def test_swap_inside_batch_writes_once(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        store = MemoryStore(path=tmp_path / "state.json")
+        tool = PositionTool(store)
+        writes: list[int] = []
+        real_save = MemoryStore.save
+
+        def counting_save(self: MemoryStore, state: dict) -> None:
+            if not self._batch_depth:
+                writes.append(1)
+            real_save(self, state)
+
+        monkeypatch.setattr(MemoryStore, "save", counting_save)
+        with store.batch():
+            tool.update_position("SOL", -0.5, 50.0)
+            tool.update_position("USDC", 0.5, 50.0)
+            tool.append_swap({"from_token": "SOL", "to_token": "USDC"})
+            assert tool.get_position("USDC")["amount"] == 0.5
+        assert len(writes) == 1
+        assert len(store.load()["swap_history"]) == 1
+
+    def test_reads_do_not_save(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        store = MemoryStore(path=tmp_path / "state.json")
+        tool = PositionTool(store)
+        tool.update_position("SOL", 1.0, 100.0)
+        # A stale daily-reset date would make load() write; reads must not.
+        state = store.load()
+        state["daily_spend_date"] = "2000-01-01"
+        store.save(state)
+        monkeypatch.setattr(MemoryStore, "save", lambda *_: pytest.fail("unexpected save"))
+        assert tool.get_portfolio_value_usd({"SOL": 120.0}) == 120.0
+        assert "SOL" in tool.portfolio_summary({"SOL": 120.0})
+        assert tool.get_position("SOL")["amount"] == 1.0
+
+    def test_failed_balance_fetch_skips_state_load(self, inmemory_store: MemoryStore) -> None:
+        class FailingWallet:
+            def get_all_balances(self) -> dict[str, float]:
+                raise RuntimeError("rpc down")
+
+        loads: list[int] = []
+        inmemory_store.load = lambda: loads.append(1) or {}  # type: ignore[method-assign]
+        PositionTool(inmemory_store).sync_from_onchain(FailingWallet(), {})
+        assert loads == []
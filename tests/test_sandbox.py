@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import shutil
+from functools import lru_cache
 from pathlib import Path
+from subprocess import CompletedProcess
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -13,6 +16,7 @@ from core.policy_engine import PolicyEngine, PolicyViolation
 from core.sandbox import Sandbox, SandboxError
 
 
+@lru_cache(maxsize=None)
 def _make_config(max_loc_delta: int = 200) -> AppConfig:
     return AppConfig(
         llm=LLMConfig(api_key="k"),
@@ -23,21 +27,42 @@ def _make_config(max_loc_delta: int = 200) -> AppConfig:
     )
 
 
+def _completed(returncode: int, stdout: str = "", stderr: str = "") -> CompletedProcess[str]:
+    """What subprocess.run returns; the sandbox only reads these three fields."""
+    return CompletedProcess(args=[], returncode=returncode, stdout=stdout, stderr=stderr)
+
+
+# 202 lines > default 200 limit
+_BIG_CODE = "\n".join(f"x = {i}" for i in range(202))
+
+
+@pytest.fixture(scope="session")
+def sandbox_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """One workspace for the module; the sandbox fixture resets it per test."""
+    root = tmp_path_factory.mktemp("sbx")
+    (root / "tests").mkdir()
+    return root
+
+
 @pytest.fixture
-def sandbox(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Sandbox:
-    monkeypatch.chdir(tmp_path)
+def sandbox(
+    sandbox_root: Path, monkeypatch: pytest.MonkeyPatch, inmemory_store: MemoryStore
+) -> Sandbox:
+    # Drop whatever the previous test wrote, keeping the workspace itself.
+    for child in sandbox_root.iterdir():
+        if child.name != "tests":
+            shutil.rmtree(child)
     # Create the tools/ dir so path validation works
-    (tmp_path / "tools").mkdir()
-    (tmp_path / "tests").mkdir()
+    (sandbox_root / "tools").mkdir()
+    monkeypatch.chdir(sandbox_root)
     config = _make_config()
-    memory = MemoryStore(path=tmp_path / "agent_memory.json")
-    policy = PolicyEngine(config, memory)
+    policy = PolicyEngine(config, inmemory_store)
     return Sandbox(config, policy)
 
 
 class TestPathValidation:
-    def test_core_path_blocked(self, sandbox: Sandbox, tmp_path: Path) -> None:
-        (tmp_path / "core").mkdir(exist_ok=True)
+    def test_core_path_blocked(self, sandbox: Sandbox, sandbox_root: Path) -> None:
+        (sandbox_root / "core").mkdir(exist_ok=True)
         with pytest.raises(PolicyViolation, match="outside allowed"):
             sandbox.apply("core/evil.py", "print('pwned')", "bad commit")
 
@@ -48,23 +73,21 @@ class TestPathValidation:
 
 class TestLocDelta:
     def test_large_delta_blocked(self, sandbox: Sandbox) -> None:
-        # 201 lines > default 200 limit
-        big_code = "\n".join(f"x = {i}" for i in range(202))
         with pytest.raises(PolicyViolation, match="LOC delta"):
-            sandbox.apply("tools/big.py", big_code, "too big")
+            sandbox.apply("tools/big.py", _BIG_CODE, "too big")
 
 
 class TestRollback:
     @patch("core.sandbox.subprocess.run")
     def test_rollback_on_pytest_failure(
-        self, mock_run: MagicMock, sandbox: Sandbox, tmp_path: Path
+        self, mock_run: MagicMock, sandbox: Sandbox, sandbox_root: Path
     ) -> None:
         original_content = "# original"
-        target = tmp_path / "tools" / "rollback_test.py"
+        target = sandbox_root / "tools" / "rollback_test.py"
         target.write_text(original_content)
 
         # pytest fails (returncode=1), ruff never called
-        mock_run.return_value = MagicMock(returncode=1, stdout="FAILED", stderr="err")
+        mock_run.return_value = _completed(1, "FAILED", "err")
 
         with pytest.raises(SandboxError, match="pytest failed"):
             sandbox.apply("tools/rollback_test.py", "# new code\n", "commit msg")
@@ -74,12 +97,12 @@ class TestRollback:
 
     @patch("core.sandbox.subprocess.run")
     def test_rollback_deletes_new_file_on_failure(
-        self, mock_run: MagicMock, sandbox: Sandbox, tmp_path: Path
+        self, mock_run: MagicMock, sandbox: Sandbox, sandbox_root: Path
     ) -> None:
-        target = tmp_path / "tools" / "brand_new.py"
+        target = sandbox_root / "tools" / "brand_new.py"
         assert not target.exists()
 
-        mock_run.return_value = MagicMock(returncode=1, stdout="FAILED", stderr="")
+        mock_run.return_value = _completed(1, "FAILED")
 
         with pytest.raises(SandboxError):
             sandbox.apply("tools/brand_new.py", "x = 1\n", "new file")
@@ -89,10 +112,10 @@ class TestRollback:
 
     @patch("core.sandbox.subprocess.run")
     def test_successful_pipeline_calls_git(
-        self, mock_run: MagicMock, sandbox: Sandbox, tmp_path: Path
+        self, mock_run: MagicMock, sandbox: Sandbox, sandbox_root: Path
     ) -> None:
         # All subprocess calls succeed
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        mock_run.return_value = _completed(0)
 
         with patch.object(sandbox.git, "commit_and_push", return_value="push succeeded"):
             result = sandbox.apply("tools/good.py", "x = 1\n", "good commit")
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import pytest
+
 from tools.sentiment_tool import SentimentTool
 
 
@@ -17,3 +19,23 @@ class TestSentimentTool:
         summary = tool.summarize_sentiment(["BTCUSDT"])
         assert "BTCUSDT" in summary
 
+    @pytest.mark.parametrize(
+        ("score", "mood"),
+        [
+            (0.5, "bullish"),
+            (0.2, "neutral"),
+            (0.0, "neutral"),
+            (-0.2, "neutral"),
+            (-0.9, "bearish"),
+        ],
+    )
+    def test_mood_thresholds(
+        self, score: float, mood: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        tool = SentimentTool()
+        monkeypatch.setattr(
+            tool,
+            "get_sentiment",
+            lambda symbols: {"SOL": {"social_volume_score": 0.5, "sentiment_score": score}},
+        )
+        assert tool.summarize_sentiment(["SOL"]) == f"sentiment: SOL: volume=0.50, mood={mood}"
@@ -5,13 +5,98 @@ These tests mock HTTP calls so no real Jupiter API traffic is generated.
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
-
+import asyncio
+import base64
+import json
+import threading
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import httpx
 import pytest
+from solders.hash import Hash
+from solders.instruction import Instruction
 from solders.keypair import Keypair
+from solders.message import MessageV0
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.transaction import VersionedTransaction
 
 from core.network_config import DEVNET_TOKENS, MAINNET_TOKENS, NetworkDetector, NetworkType
-from tools.swap_tool import JupiterUltraSwap, JupiterV6Swap, MockSwap, SwapTool
+from tools import swap_tool
+from tools.http_client import build_http_client
+from tools.swap_tool import (
+    JupiterUltraSwap,
+    JupiterV6Swap,
+    MockSwap,
+    NoLiquidityError,
+    SwapSpec,
+    SwapTool,
+)
+
+# Key material is irrelevant to every assertion, so generate it once.
+_KEYPAIR = Keypair()
+
+
+@lru_cache(maxsize=None)
+def _unsigned_tx_b64(payer: Pubkey) -> str:
+    """Minimal unsigned transaction whose first account key is *payer*.
+
+    The signing path needs the taker in the signer slot; building and
+    serialising it is cached so each payer costs one solders round trip.
+    """
+    msg = MessageV0.try_compile(payer, [Instruction(payer, b"", [])], [], Hash.default())
+    tx = VersionedTransaction.populate(msg, [Signature.default()])
+    return base64.b64encode(bytes(tx)).decode("utf-8")
+
+
+class _HttpxMock:
+    """Canned Jupiter responses served through a real httpx transport.
+
+    Requests are matched on (method, URL path), so the tool's URL, params and
+    header building run for real; every request is recorded for assertions.
+    Strategies receive ``client`` through their ``http`` argument.
+    """
+
+    def __init__(self) -> None:
+        self._routes: dict[tuple[str, str], list[tuple[int, dict[str, Any]]]] = {}
+        self.requests: list[httpx.Request] = []
+        # Client to inject into the strategies; set by the fixture.
+        self.client: httpx.Client
+
+    def add_response(
+        self, method: str, path: str, status_code: int = 200, **kwargs: Any
+    ) -> None:
+        """Queue a response; the last one queued for a route keeps repeating."""
+        self._routes.setdefault((method, path), []).append((status_code, kwargs))
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        queued = self._routes[(request.method, request.url.path)]
+        status_code, kwargs = queued.pop(0) if len(queued) > 1 else queued[0]
+        return httpx.Response(status_code, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def _no_retry_sleep(monkeypatch: pytest.MonkeyPatch) -> None:
+    for method in (
+        JupiterUltraSwap._get_order,
+        JupiterUltraSwap._execute_ultra,
+        JupiterV6Swap._get_quote,
+        JupiterV6Swap._post_swap,
+    ):
+        monkeypatch.setattr(method.retry, "sleep", lambda seconds: None)
+
+
+@pytest.fixture
+def httpx_mock() -> Iterator[_HttpxMock]:
+    mock = _HttpxMock()
+    with build_http_client(httpx.MockTransport(mock.handler)) as client:
+        mock.client = client
+        yield mock
 
 
 class TestNetworkDetection:
@@ -34,83 +119,41 @@ class TestNetworkDetection:
 
 
 class TestSwapStrategies:
-    @patch("tools.swap_tool.httpx.post")
-    @patch("tools.swap_tool.httpx.get")
-    def test_ultra_mainnet_happy_path(self, mock_get, mock_post) -> None:
+    def test_ultra_mainnet_happy_path(self, httpx_mock: _HttpxMock) -> None:
         # Use a real keypair object; no RPC calls from the strategy itself.
-        keypair = Keypair()
+        keypair = _KEYPAIR
         rpc = MagicMock()
 
-        # Build a minimal unsigned transaction whose first account key is the
-        # taker's pubkey so the signing loop can find and replace its slot.
-        import base64
-        from solders.hash import Hash
-        from solders.instruction import Instruction
-        from solders.message import MessageV0
-        from solders.signature import Signature
-        from solders.transaction import VersionedTransaction
-
-        msg = MessageV0.try_compile(
-            keypair.pubkey(), [Instruction(keypair.pubkey(), b"", [])], [], Hash.default()
+        httpx_mock.add_response(
+            "GET",
+            "/ultra/v1/order",
+            json={"swapTransaction": _unsigned_tx_b64(keypair.pubkey()), "requestId": "req-123"},
         )
-        dummy_tx = VersionedTransaction.populate(msg, [Signature.default()])
-        unsigned_b64 = base64.b64encode(bytes(dummy_tx)).decode("utf-8")
-
-        mock_get.return_value.status_code = 200
-        mock_get.return_value.json.return_value = {
-            "swapTransaction": unsigned_b64,
-            "requestId": "req-123",
-        }
-
-        mock_post.return_value.status_code = 200
-        mock_post.return_value.json.return_value = {"signature": "sig-abc"}
+        httpx_mock.add_response("POST", "/ultra/v1/execute", json={"signature": "sig-abc"})
 
-        strat = JupiterUltraSwap(keypair, rpc, api_key="test-key")
+        strat = JupiterUltraSwap(keypair, rpc, api_key="test-key", http=httpx_mock.client)
         sig = strat.execute_swap(
             MAINNET_TOKENS.sol, MAINNET_TOKENS.usdc, amount_lamports=1_000_000_000, slippage_bps=50
         )
         assert sig == "sig-abc"
+        order = httpx_mock.requests[0]
+        assert order.url.params["taker"] == str(keypair.pubkey())
+        assert order.headers["x-api-key"] == "test-key"
 
-    @patch("tools.swap_tool.httpx.get")
-    def test_ultra_mainnet_order_error_raises(self, mock_get) -> None:
-        keypair = Keypair()
-        rpc = MagicMock()
-
-        mock_get.return_value.status_code = 500
-        mock_get.return_value.text = "Internal Server Error"
-
-        strat = JupiterUltraSwap(keypair, rpc, api_key="test-key")
-        with pytest.raises(RuntimeError, match="Ultra order error 500"):
-            strat.execute_swap(
-                MAINNET_TOKENS.sol,
-                MAINNET_TOKENS.usdc,
-                amount_lamports=1_000_000_000,
-                slippage_bps=50,
-            )
-
-    @patch("tools.swap_tool.httpx.post")
-    @patch("tools.swap_tool.httpx.get")
-    def test_devnet_v6_happy_path(self, mock_get, mock_post) -> None:
-        keypair = Keypair()
+    def test_devnet_v6_happy_path(self, httpx_mock: _HttpxMock) -> None:
+        keypair = _KEYPAIR
         rpc = MagicMock()
 
-        # Quote response
-        mock_get.return_value.status_code = 200
-        mock_get.return_value.json.return_value = {"routePlan": [], "other": "fields"}
-
+        httpx_mock.add_response("GET", "/swap/v1/quote", json={"routePlan": [], "other": "fields"})
         # Swap response with a base64 tx
-        import base64
-        from solders.transaction import VersionedTransaction
-
-        dummy_tx = VersionedTransaction.default()
-        unsigned_b64 = base64.b64encode(bytes(dummy_tx)).decode("utf-8")
-        mock_post.return_value.status_code = 200
-        mock_post.return_value.json.return_value = {"swapTransaction": unsigned_b64}
+        httpx_mock.add_response(
+            "POST", "/swap/v1/swap", json={"swapTransaction": _unsigned_tx_b64(keypair.pubkey())}
+        )
 
         # RPC send_raw_transaction returns an object with a .value attribute
         rpc.send_raw_transaction.return_value = MagicMock(value="devnet-sig")
 
-        strat = JupiterV6Swap(keypair, rpc)
+        strat = JupiterV6Swap(keypair, rpc, api_key=None, http=httpx_mock.client)
         sig = strat.execute_swap(
             DEVNET_TOKENS.sol,
             DEVNET_TOKENS.usdc,
@@ -118,17 +161,61 @@ class TestSwapStrategies:
             slippage_bps=50,
         )
         assert sig == "devnet-sig"
-
-    @patch("tools.swap_tool.httpx.get")
-    def test_devnet_v6_no_pool_raises_clear_error(self, mock_get) -> None:
-        keypair = Keypair()
-        rpc = MagicMock()
-
-        mock_get.return_value.status_code = 404
-        mock_get.return_value.text = "Not Found"
-
-        strat = JupiterV6Swap(keypair, rpc)
-        with pytest.raises(RuntimeError, match="No liquidity pool"):
+        assert "x-api-key" not in httpx_mock.requests[0].headers
+        opts = rpc.send_raw_transaction.call_args.kwargs["opts"]
+        assert not opts.skip_preflight and opts.max_retries == 3
+        swap_body = json.loads(httpx_mock.requests[1].content)
+        assert swap_body["userPublicKey"] == str(keypair.pubkey())
+
+    @pytest.mark.parametrize(
+        ("strategy", "route", "status_code", "body", "match"),
+        [
+            pytest.param(
+                JupiterUltraSwap,
+                ("GET", "/ultra/v1/order"),
+                500,
+                {"text": "Internal Server Error"},
+                "Ultra order error 500",
+                id="ultra-order-500",
+            ),
+            pytest.param(
+                JupiterUltraSwap,
+                ("GET", "/ultra/v1/order"),
+                200,
+                {"json": {"requestId": "req-123", "errorMessage": "Insufficient funds"}},
+                "Ultra order failed: Insufficient funds",
+                id="ultra-order-no-transaction",
+            ),
+            pytest.param(
+                JupiterV6Swap,
+                ("GET", "/swap/v1/quote"),
+                404,
+                {"text": "Not Found"},
+                "No liquidity pool",
+                id="v6-no-pool",
+            ),
+            pytest.param(
+                JupiterV6Swap,
+                ("GET", "/swap/v1/quote"),
+                500,
+                {"text": "boom"},
+                "Jupiter v6 quote error 500",
+                id="v6-quote-500",
+            ),
+        ],
+    )
+    def test_http_error_raises(
+        self,
+        httpx_mock: _HttpxMock,
+        strategy: type[JupiterUltraSwap] | type[JupiterV6Swap],
+        route: tuple[str, str],
+        status_code: int,
+        body: dict[str, Any],
+        match: str,
+    ) -> None:
+        httpx_mock.add_response(*route, status_code, **body)
+        strat = strategy(_KEYPAIR, MagicMock(), api_key="test-key", http=httpx_mock.client)
+        with pytest.raises(RuntimeError, match=match):
             strat.execute_swap(
                 DEVNET_TOKENS.sol,
                 DEVNET_TOKENS.usdc,
@@ -137,20 +224,180 @@ class TestSwapStrategies:
             )
 
 
-class TestSwapToolWrapper:
-    def test_swap_zero_lamports_raises(self) -> None:
-        keypair = Keypair()
-        tool = SwapTool(keypair, "https://api.devnet.solana.com")
-        with pytest.raises(ValueError, match="amount_lamports must be positive"):
-            tool.swap("SOL", "USDC", amount_lamports=0)
+class TestRetries:
+    @pytest.mark.parametrize(("status", "attempts"), [(400, 1), (502, 5)])
+    def test_ultra_execute_retries_only_transient(
+        self, httpx_mock: _HttpxMock, status: int, attempts: int
+    ) -> None:
+        httpx_mock.add_response(
+            "GET",
+            "/ultra/v1/order",
+            json={"swapTransaction": _unsigned_tx_b64(_KEYPAIR.pubkey()), "requestId": "r"},
+        )
+        httpx_mock.add_response("POST", "/ultra/v1/execute", status, text="err")
+        strat = JupiterUltraSwap(_KEYPAIR, MagicMock(), api_key="k", http=httpx_mock.client)
+        with pytest.raises(RuntimeError, match=f"Ultra execute error {status}"):
+            strat.execute_swap(MAINNET_TOKENS.sol, MAINNET_TOKENS.usdc, 1_000, 50)
+        executes = [r for r in httpx_mock.requests if r.url.path == "/ultra/v1/execute"]
+        assert len(executes) == attempts
+
+    def test_ultra_order_retries_transient_status(self, httpx_mock: _HttpxMock) -> None:
+        httpx_mock.add_response("GET", "/ultra/v1/order", 503, text="busy")
+        httpx_mock.add_response("GET", "/ultra/v1/order", 429, text="slow down")
+        httpx_mock.add_response(
+            "GET",
+            "/ultra/v1/order",
+            json={"swapTransaction": _unsigned_tx_b64(_KEYPAIR.pubkey()), "requestId": "r"},
+        )
+        httpx_mock.add_response("POST", "/ultra/v1/execute", json={"signature": "sig"})
+        strat = JupiterUltraSwap(_KEYPAIR, MagicMock(), api_key="k", http=httpx_mock.client)
+        assert strat.execute_swap(MAINNET_TOKENS.sol, MAINNET_TOKENS.usdc, 1_000, 50) == "sig"
+        paths = [r.url.path for r in httpx_mock.requests]
+        assert paths == ["/ultra/v1/order"] * 3 + ["/ultra/v1/execute"]
+
+    def test_v6_swap_build_retries_transport_error(self) -> None:
+        calls: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            if request.url.path == "/swap/v1/quote":
+                return httpx.Response(200, json={"routePlan": []})
+            if calls.count("/swap/v1/swap") == 1:
+                raise httpx.ConnectError("reset", request=request)
+            return httpx.Response(
+                200, json={"swapTransaction": _unsigned_tx_b64(_KEYPAIR.pubkey())}
+            )
+
+        rpc = MagicMock()
+        rpc.send_raw_transaction.return_value = MagicMock(value="devnet-sig")
+        http = build_http_client(httpx.MockTransport(handler))
+        strat = JupiterV6Swap(_KEYPAIR, rpc, api_key=None, http=http)
+        sig = strat.execute_swap(DEVNET_TOKENS.sol, DEVNET_TOKENS.usdc, 1_000, 50)
+        assert sig == "devnet-sig"
+        assert calls == ["/swap/v1/quote", "/swap/v1/swap", "/swap/v1/swap"]
+
+    @pytest.mark.parametrize(
+        ("status", "attempts"), [(400, 1), (404, 1), (500, 5)], ids=["400", "no-pool", "500"]
+    )
+    def test_quote_attempts(self, httpx_mock: _HttpxMock, status: int, attempts: int) -> None:
+        httpx_mock.add_response("GET", "/swap/v1/quote", status, text="nope")
+        strat = JupiterV6Swap(_KEYPAIR, MagicMock(), api_key=None, http=httpx_mock.client)
+        with pytest.raises(RuntimeError):
+            strat.execute_swap(DEVNET_TOKENS.sol, DEVNET_TOKENS.usdc, 1_000, 50)
+        assert len(httpx_mock.requests) == attempts
+
 
-    @patch("tools.swap_tool.JupiterV6Swap.execute_swap")
-    def test_devnet_falls_back_to_mock_on_no_pool(self, mock_exec) -> None:
-        keypair = Keypair()
-        tool = SwapTool(keypair, "https://api.devnet.solana.com")
+@pytest.fixture(scope="module")
+def devnet_swap_tool() -> SwapTool:
+    return SwapTool(_KEYPAIR, "https://api.devnet.solana.com")
 
-        mock_exec.side_effect = RuntimeError("No liquidity pool on devnet")
 
-        sig = tool.swap("SOL", "USDC", amount_lamports=1_000_000_000)
+class TestSwapToolWrapper:
+    def test_strategy_shares_injected_client(self, httpx_mock: _HttpxMock) -> None:
+        tool = SwapTool(_KEYPAIR, "https://api.devnet.solana.com", http=httpx_mock.client)
+        assert tool._strategy._http is httpx_mock.client
+
+    @pytest.mark.parametrize(
+        ("from_token", "amount_lamports", "match"),
+        [
+            pytest.param("SOL", 0, "amount_lamports must be positive", id="zero-amount"),
+            pytest.param("SOL", -5, "amount_lamports must be positive", id="negative-amount"),
+            pytest.param("DOGE", 1_000, "Unsupported token symbol", id="unknown-symbol"),
+            pytest.param("WBTC", 1_000, "not configured for this network", id="no-devnet-wbtc"),
+        ],
+    )
+    def test_invalid_request_raises(
+        self, devnet_swap_tool: SwapTool, from_token: str, amount_lamports: int, match: str
+    ) -> None:
+        with pytest.raises(ValueError, match=match):
+            devnet_swap_tool.swap(from_token, "USDC", amount_lamports=amount_lamports)
+
+    def test_devnet_falls_back_to_mock_on_no_pool(
+        self, monkeypatch: pytest.MonkeyPatch, devnet_swap_tool: SwapTool
+    ) -> None:
+        monkeypatch.setattr(
+            JupiterV6Swap,
+            "execute_swap",
+            MagicMock(side_effect=NoLiquidityError("No liquidity pool on devnet")),
+        )
+
+        sig = devnet_swap_tool.swap("SOL", "USDC", amount_lamports=1_000_000_000)
         assert sig.startswith("DEVNET-MOCK-SWAP-")
 
+    def test_devnet_other_errors_are_not_masked(
+        self, monkeypatch: pytest.MonkeyPatch, devnet_swap_tool: SwapTool
+    ) -> None:
+        # Only the typed no-route error triggers the mock, not a matching message.
+        monkeypatch.setattr(
+            JupiterV6Swap,
+            "execute_swap",
+            MagicMock(side_effect=RuntimeError("No liquidity pool, but a different failure")),
+        )
+
+        with pytest.raises(RuntimeError, match="different failure"):
+            devnet_swap_tool.swap("SOL", "USDC", amount_lamports=1_000_000_000)
+
+    def test_swap_async_runs_off_the_event_loop(
+        self, monkeypatch: pytest.MonkeyPatch, devnet_swap_tool: SwapTool
+    ) -> None:
+        loop_threads: list[bool] = []
+
+        def fake_execute(*args: Any) -> str:
+            try:
+                asyncio.get_running_loop()
+                loop_threads.append(True)
+            except RuntimeError:
+                loop_threads.append(False)
+            return "sig"
+
+        monkeypatch.setattr(devnet_swap_tool._strategy, "execute_swap", fake_execute)
+
+        async def run() -> list[str]:
+            return await asyncio.gather(
+                devnet_swap_tool.swap_async("SOL", "USDC", 1_000),
+                devnet_swap_tool.swap_async("USDC", "SOL", 2_000),
+            )
+
+        assert asyncio.run(run()) == ["sig", "sig"]
+        assert loop_threads == [False, False]
+
+    def test_swap_many_overlaps_and_keeps_order(
+        self, monkeypatch: pytest.MonkeyPatch, devnet_swap_tool: SwapTool
+    ) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_execute(from_mint: str, to_mint: str, amount: int, slippage: int) -> str:
+            barrier.wait()  # only passes if both swaps are in flight at once
+            return f"sig-{amount}-{slippage}"
+
+        monkeypatch.setattr(devnet_swap_tool._strategy, "execute_swap", fake_execute)
+
+        specs = [SwapSpec("SOL", "USDC", 1_000), SwapSpec("USDC", "SOL", 2_000, slippage_bps=75)]
+        assert asyncio.run(devnet_swap_tool.swap_many(specs)) == ["sig-1000-50", "sig-2000-75"]
+
+
+class TestDebugLog:
+    def test_file_opened_once_across_records(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        path = tmp_path / "nested" / "debug.log"
+        monkeypatch.setattr(swap_tool, "_DEBUG_LOG_PATH", path)
+        monkeypatch.setattr(swap_tool, "_DEBUG_ENABLED", True)
+        swap_tool._debug_log_file.cache_clear()
+        try:
+            for i in range(3):
+                swap_tool._debug_log("H1", "test", f"record {i}", {"i": i})
+            assert swap_tool._debug_log_file.cache_info().misses == 1
+        finally:
+            swap_tool._debug_log_file().close()
+            swap_tool._debug_log_file.cache_clear()
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [r["data"]["i"] for r in records] == [0, 1, 2]
+
+    def test_disabled_writes_nothing(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        path = tmp_path / "debug.log"
+        monkeypatch.setattr(swap_tool, "_DEBUG_LOG_PATH", path)
+        monkeypatch.setattr(swap_tool, "_DEBUG_ENABLED", False)
+        swap_tool._debug_log("H1", "test", "ignored", {})
+        assert not path.exists()
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
 import pytest
 
+from tools import ta_tool
 from tools.ta_tool import TATool
 
 
@@ -22,8 +26,9 @@ def _make_ohlcv(n: int = 200) -> pd.DataFrame:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def enriched() -> pd.DataFrame:
+    # Seeded input, so one enrichment serves every test; tests only read it.
     df = _make_ohlcv(200)
     return TATool.enrich(df)
 
@@ -52,6 +57,115 @@ class TestEnrich:
         # fillna=True in enrich; last row should have no NaNs
         assert enriched.iloc[-1].isna().sum() == 0
 
+    def test_lean_matches_full_for_summary_columns(self, enriched: pd.DataFrame) -> None:
+        lean = TATool.enrich(_make_ohlcv(200), lean=True)
+        assert len(lean.columns) < len(enriched.columns)
+        for col in lean.columns:
+            pd.testing.assert_series_equal(lean[col], enriched[col])
+        assert TATool.summarize(lean, "BTCUSDT") == TATool.summarize(enriched, "BTCUSDT")
+
+    def test_lean_matches_full_on_flat_and_zero_volume_bars(self) -> None:
+        # Flat prices give zero ranges (Stoch 0/0) and zero volume gives VWAP 0/0;
+        # both must be filled exactly like ``ta`` does.
+        df = _make_ohlcv(60)
+        df.loc[:30, ["open", "high", "low", "close"]] = 100.0
+        df.loc[35:45, "volume"] = 0.0
+        full = TATool.enrich(df.copy())
+        lean = TATool.enrich(df.copy(), lean=True)
+        for col in lean.columns.difference(df.columns):
+            pd.testing.assert_series_equal(lean[col], full[col])
+
+    def test_lean_handles_fewer_bars_than_windows(self) -> None:
+        lean = TATool.enrich(_make_ohlcv(ta_tool._MIN_BARS), lean=True)
+        assert lean.iloc[-1].isna().sum() == 0
+        assert (lean["volatility_atr"].iloc[:9] == 0).all()  # ATR warm-up
+
+    @pytest.mark.parametrize("lean", [True, False])
+    def test_too_few_bars_are_not_enriched(self, lean: bool) -> None:
+        df = _make_ohlcv(ta_tool._MIN_BARS - 1)
+        out = TATool.enrich(df, lean=lean, symbol="SOLUSDT")
+        assert out[list(ta_tool._SUMMARY_COLS[1:])].isna().all().all()
+        assert "trend_adx" not in out
+        summary = TATool.summarize(out, "SOLUSDT")
+        assert "RSI=N/A" in summary
+        assert summary.endswith("trend_tag=unknown  momentum_tag=unknown")
+
+
+
+class TestEnrichCache:
+    @pytest.fixture(autouse=True)
+    def computations(self, monkeypatch: pytest.MonkeyPatch) -> list[int]:
+        monkeypatch.setattr(ta_tool, "_ENRICH_CACHE", OrderedDict())
+        calls: list[int] = []
+        compute = TATool._compute
+
+        def counting(df: pd.DataFrame, lean: bool) -> pd.DataFrame:
+            calls.append(len(df))
+            return compute(df, lean)
+
+        monkeypatch.setattr(TATool, "_compute", staticmethod(counting))
+        return calls
+
+    def test_same_candles_are_enriched_once(self, computations: list[int]) -> None:
+        first = TATool.enrich(_make_ohlcv(100), lean=True, symbol="BTCUSDT")
+        raw = _make_ohlcv(100)
+        second = TATool.enrich(raw, lean=True, symbol="BTCUSDT")
+
+        assert computations == [100]
+        pd.testing.assert_frame_equal(first, second)
+        # A hit enriches the caller's frame in place, exactly like a miss.
+        assert second is raw
+        assert second is not first
+
+    @pytest.mark.parametrize("full", [False, True])
+    def test_hit_matches_miss_for_the_caller(self, full: bool) -> None:
+        lean = not full
+        miss_df = _make_ohlcv(60)
+        miss = TATool.enrich(miss_df, lean=lean, symbol="BTCUSDT")
+        hit_df = _make_ohlcv(60)
+        hit = TATool.enrich(hit_df, lean=lean, symbol="BTCUSDT")
+        assert miss is miss_df and hit is hit_df
+        pd.testing.assert_frame_equal(hit, miss)
+
+    def test_same_prices_at_other_times_miss(self, computations: list[int]) -> None:
+        earlier = _make_ohlcv(60)
+        earlier["open_time"] = pd.date_range("2024-01-01", periods=60, freq="h", tz="UTC")
+        later = _make_ohlcv(60)
+        later["open_time"] = earlier["open_time"] + pd.Timedelta(hours=1)
+        TATool.enrich(earlier, lean=True, symbol="BTCUSDT")
+        out = TATool.enrich(later, lean=True, symbol="BTCUSDT")
+        assert len(computations) == 2
+        assert out["open_time"].iloc[0] == later["open_time"].iloc[0]
+
+        shifted = _make_ohlcv(60).set_axis(range(1, 61))
+        TATool.enrich(_make_ohlcv(60), lean=True, symbol="ETHUSDT")
+        TATool.enrich(shifted, lean=True, symbol="ETHUSDT")
+        assert len(computations) == 4
+
+    def test_changed_candles_symbol_or_mode_miss(self, computations: list[int]) -> None:
+        TATool.enrich(_make_ohlcv(100), lean=True, symbol="BTCUSDT")
+        moved = _make_ohlcv(100)
+        moved.loc[moved.index[-1], "close"] += 1.0
+        TATool.enrich(moved, lean=True, symbol="BTCUSDT")
+        TATool.enrich(_make_ohlcv(100), lean=True, symbol="ETHUSDT")
+        TATool.enrich(_make_ohlcv(100), symbol="BTCUSDT")
+        assert len(computations) == 4
+
+    def test_without_symbol_nothing_is_cached(self, computations: list[int]) -> None:
+        TATool.enrich(_make_ohlcv(60), lean=True)
+        TATool.enrich(_make_ohlcv(60), lean=True)
+        assert computations == [60, 60]
+        assert not ta_tool._ENRICH_CACHE
+
+    def test_least_recently_used_entry_is_evicted(
+        self, monkeypatch: pytest.MonkeyPatch, computations: list[int]
+    ) -> None:
+        monkeypatch.setattr(ta_tool, "_ENRICH_CACHE_SIZE", 2)
+        for symbol in ("A", "B", "A", "C", "A", "B"):
+            TATool.enrich(_make_ohlcv(60), lean=True, symbol=symbol)
+        # A stays warm; B is evicted when C arrives and has to be recomputed.
+        assert len(computations) == 4
+
 
 class TestSummarize:
     def test_contains_symbol(self, enriched: pd.DataFrame) -> None:
@@ -68,12 +182,125 @@ class TestSummarize:
         summary = TATool.summarize(empty, symbol="SOLUSDT")
         assert "no data" in summary
 
+    def test_missing_indicators_render_as_na(self) -> None:
+        raw = _make_ohlcv(5)
+        raw.loc[raw.index[-1], "close"] = 101.5
+        lines = TATool.summarize(raw, symbol="SOLUSDT").splitlines()
+        assert lines[0] == "[SOLUSDT] close=101.5000"
+        assert lines[1] == "  SMA20=N/A  SMA50=N/A"
+        assert lines[-1] == "  trend_tag=unknown  momentum_tag=unknown"
+
+
+class TestTrendAlignment:
+    @staticmethod
+    def _frame(fast: float, slow: float) -> pd.DataFrame:
+        return pd.DataFrame({"trend_sma_fast": [fast], "trend_sma_slow": [slow]})
+
+    def test_aligned_uptrend(self) -> None:
+        up = self._frame(105.0, 100.0)
+        msg = TATool.detect_trend_alignment(up, up, "SOLUSDT")
+        assert msg == "[SOLUSDT] trend alignment: 1h uptrend aligned with 4h uptrend"
+
+    def test_divergent_timeframes(self) -> None:
+        msg = TATool.detect_trend_alignment(
+            self._frame(95.0, 100.0), self._frame(100.5, 100.0), "SOLUSDT"
+        )
+        assert msg == (
+            "[SOLUSDT] trend alignment: short-term downtrend vs higher timeframe "
+            "sideways (divergent)"
+        )
+
+    def test_missing_smas_are_unclear(self) -> None:
+        msg = TATool.detect_trend_alignment(_make_ohlcv(5), self._frame(1.0, 1.0), "SOLUSDT")
+        assert msg == "[SOLUSDT] trend alignment: trend unclear across timeframes"
+
 
 class TestCorrelationHelpers:
     def test_btc_dominance_insufficient_data(self) -> None:
         msg = TATool.compute_btc_dominance(pd.DataFrame(), {})
         assert "BTC dominance: insufficient data" in msg
 
+    @pytest.mark.parametrize(
+        ("btc_step", "alt_step", "expected"),
+        [
+            pytest.param(0.02, 0.01, "BTC gaining dominance", id="btc-leads"),
+            pytest.param(0.01, 0.02, "alts gaining vs BTC", id="alts-lead"),
+            pytest.param(0.01, 0.01, "roughly stable", id="in-step"),
+        ],
+    )
+    def test_btc_dominance_compares_mean_returns(
+        self, btc_step: float, alt_step: float, expected: str
+    ) -> None:
+        def closes(step: float, n: int) -> pd.DataFrame:
+            # Constant per-bar return, so the mean is independent of length.
+            return pd.DataFrame({"close": 100.0 * (1 + step) ** np.arange(n)})
+
+        # Alts of different lengths; an empty frame is skipped, not averaged in.
+        others = {"ETHUSDT": closes(alt_step, 80), "SOLUSDT": closes(alt_step, 60)}
+        others["XRPUSDT"] = pd.DataFrame()
+        msg = TATool.compute_btc_dominance(closes(btc_step, 100), others)
+        assert expected in msg
+
+    def test_btc_dominance_ignores_flat_alts(self) -> None:
+        btc = pd.DataFrame({"close": 100.0 * 1.01 ** np.arange(60)})
+        eth = pd.DataFrame({"close": 100.0 * 1.01 ** np.arange(60)})
+        flat = pd.DataFrame({"close": [1.0] * 60})
+        msg = TATool.compute_btc_dominance(btc, {"ETHUSDT": eth, "USDCUSDT": flat})
+        assert msg == "[correlation] BTC dominance roughly stable"
+        only_flat = TATool.compute_btc_dominance(btc, {"USDCUSDT": flat})
+        assert only_flat == "[correlation] BTC dominance: insufficient data"
+
     def test_summarize_correlations_insufficient_data(self) -> None:
         msg = TATool.summarize_correlations({})
         assert "SOL/BTC: insufficient data" in msg
+
+    def test_summarize_correlations_uses_most_recent_returns(self) -> None:
+        rng = np.random.default_rng(7)
+        btc = pd.Series(100.0 * np.cumprod(1 + rng.normal(0, 0.01, 400)))
+        # SOL tracks BTC's last 200 bars; its older history is unrelated noise.
+        sol = pd.Series(np.concatenate([rng.uniform(10, 20, 50), 0.3 * btc.to_numpy()[-200:]]))
+        msg = TATool.summarize_correlations({"SOLUSDT": sol, "BTCUSDT": btc})
+        assert msg == "[correlation] SOL/BTC correlation=1.00 (highly coupled)"
+
+    @pytest.mark.parametrize(
+        ("corr", "regime"),
+        [
+            (-0.5, "largely decoupled"),
+            (0.1, "largely decoupled"),
+            (0.25, "weakly correlated / some decoupling"),
+            (0.4, "weakly correlated / some decoupling"),
+            (0.8, "moderately correlated"),
+            (0.95, "highly coupled"),
+        ],
+    )
+    def test_correlation_regime_thresholds_are_exclusive(
+        self, corr: float, regime: str
+    ) -> None:
+        idx = bisect_left(ta_tool._CORR_THRESHOLDS, corr)
+        assert ta_tool._CORR_REGIMES[idx] == regime
+        vectorized = np.searchsorted(ta_tool._CORR_THRESHOLDS, [corr], side="left")
+        assert int(vectorized[0]) == idx
+
+    def test_summarize_correlations_flat_series_is_insufficient(self) -> None:
+        flat = pd.Series([20.0] * 50)
+        btc = pd.Series(np.linspace(100.0, 120.0, 50))
+        msg = TATool.summarize_correlations({"SOLUSDT": flat, "BTCUSDT": btc})
+        assert msg == "[correlation] SOL/BTC: insufficient data"
+
+
+class TestParseFearGreed:
+    def test_extracts_value_classification_and_delta(self) -> None:
+        html = (
+            '<div class="fng-circle" data-value="25" data-value-previous="35">25</div>'
+            "<p>Now: Fear &amp; Greed Index is Extreme Fear</p>"
+        )
+        assert TATool.parse_fear_greed(html) == {
+            "value": 25,
+            "classification": "Extreme Fear",
+            "delta_7d": -10,
+        }
+
+    def test_missing_markup_yields_partial_or_empty_result(self) -> None:
+        assert TATool.parse_fear_greed('<div data-value="60"></div>') == {"value": 60}
+        assert TATool.parse_fear_greed("<html></html>") == {}
+        assert TATool.parse_fear_greed("") == {}
@@ -1,46 +1,53 @@
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
-import base58
 import pytest
 from solders.hash import Hash
-from solders.keypair import Keypair
+from solders.transaction_status import TransactionConfirmationStatus as TCS
 
+from core.network_config import DEVNET_TOKENS
 from tools.wallet_tool import WalletTool
 
 # ── fixtures ──────────────────────────────────────────────────────────────────
 
 
 @pytest.fixture
-def mock_wallet():
+def mock_wallet(valid_key_b58: str, monkeypatch: pytest.MonkeyPatch):
     """Return a WalletTool with a fully mocked Client and a valid keypair."""
-    kp = Keypair()
-    valid_key_b58 = base58.b58encode(bytes(kp)).decode()
     mock_client = MagicMock()
     # Real blockhash so txn.sign() in send() succeeds
     mock_bh = MagicMock()
     mock_bh.blockhash = Hash.from_bytes(bytes(32))
     mock_client.get_latest_blockhash.return_value = MagicMock(value=mock_bh)
 
-    with patch("tools.wallet_tool.Client", return_value=mock_client):
-        tool = WalletTool(valid_key_b58, "https://api.devnet.solana.com")
+    monkeypatch.setattr("tools.wallet_tool.Client", MagicMock(return_value=mock_client))
+    tool = WalletTool(valid_key_b58, "https://api.devnet.solana.com")
     return tool, mock_client
 
 
+def _parsed_token_account(mint: str, amount: str, decimals: int) -> MagicMock:
+    """Shape of one jsonParsed getTokenAccountsByOwner entry."""
+    acc = MagicMock()
+    acc.account.data.parsed = {
+        "type": "account",
+        "info": {"mint": mint, "tokenAmount": {"amount": amount, "decimals": decimals}},
+    }
+    return acc
+
+
 # ── tests ─────────────────────────────────────────────────────────────────────
 
 
 class TestWalletBalance:
-    def test_balance_converts_lamports(self, mock_wallet) -> None:
-        tool, client = mock_wallet
-        client.get_balance.return_value = MagicMock(value=2_000_000_000)
-        assert tool.balance_sol() == 2.0
-
-    def test_zero_balance(self, mock_wallet) -> None:
+    @pytest.mark.parametrize(
+        ("lamports", "sol"), [(2_000_000_000, 2.0), (1_500_000_000, 1.5), (0, 0.0)]
+    )
+    def test_balance_converts_lamports(self, mock_wallet, lamports: int, sol: float) -> None:
         tool, client = mock_wallet
-        client.get_balance.return_value = MagicMock(value=0)
-        assert tool.balance_sol() == 0.0
+        client.get_balance.return_value = MagicMock(value=lamports)
+        assert tool.balance_sol() == sol
 
 
 class TestWalletTokenBalances:
@@ -49,52 +56,67 @@ class TestWalletTokenBalances:
         client.get_balance.return_value = MagicMock(value=1_500_000_000)
         assert abs(tool.balance_token("SOL") - 1.5) < 1e-9
 
-    def test_get_all_balances_calls_balance_token(self, mock_wallet) -> None:
-        # Use a real WalletTool instance but stub out balance_token so we don't
-        # depend on real RPC layout.
-        tool, _ = mock_wallet
+    def test_get_all_balances_uses_one_spl_call(self, mock_wallet) -> None:
+        tool, client = mock_wallet
+        usdc = DEVNET_TOKENS.usdc
+        client.get_balance.return_value = MagicMock(value=1_000_000_000)
+        client.get_token_accounts_by_owner_json_parsed.return_value = MagicMock(
+            value=[
+                _parsed_token_account(usdc, "1500000", 6),
+                _parsed_token_account(usdc, "500000", 6),
+                _parsed_token_account("SomeOtherMint1111111111111111111111111111111", "7", 0),
+            ]
+        )
+
+        balances = tool.get_all_balances()
+
+        assert balances == {"SOL": 1.0, "USDC": 2.0, "WBTC": 0.0}
+        client.get_token_accounts_by_owner_json_parsed.assert_called_once()
+        client.get_token_accounts_by_owner.assert_not_called()
+
+    def test_get_all_balances_falls_back_per_token(self, mock_wallet) -> None:
+        tool, client = mock_wallet
+        client.get_balance.return_value = MagicMock(value=0)
+        client.get_token_accounts_by_owner_json_parsed.side_effect = RuntimeError("rpc down")
         calls: list[str] = []
 
         def _fake_balance(sym: str) -> float:
             calls.append(sym)
-            return {"SOL": 1.0, "USDC": 2.0, "WBTC": 0.0}.get(sym, 0.0)
+            return {"USDC": 2.0}.get(sym, 0.0)
 
         tool.balance_token = _fake_balance  # type: ignore[assignment]
         balances = tool.get_all_balances()
 
-        # Should query every supported symbol exactly once.
-        assert set(calls) == {"SOL", "USDC", "WBTC"}
-        assert balances["SOL"] == 1.0
-        assert balances["USDC"] == 2.0
+        assert calls == ["USDC", "WBTC"]
+        assert balances == {"SOL": 0.0, "USDC": 2.0, "WBTC": 0.0}
 
-    @patch("tools.wallet_tool.Client")
-    def test_balance_token_usdc_uses_pubkey_mint(self, mock_client_cls: MagicMock) -> None:
+    def test_balance_token_usdc_uses_pubkey_mint(self, mock_wallet) -> None:
         """Smoke-test SPL branch to ensure it doesn't raise when mint is a string."""
-        # Reuse the existing valid-key fixture behaviour by constructing a
-        # WalletTool via the patched Client but with a real Keypair, similar to
-        # mock_wallet. We don't care about the actual client methods here.
-        from solders.keypair import Keypair
-
-        kp = Keypair()
-        valid_key_b58 = base58.b58encode(bytes(kp)).decode()
-        mock_client = mock_client_cls.return_value
+        tool, client = mock_wallet
         # Simulate no token accounts so the SPL branch runs but returns 0.0
-        mock_client.get_token_accounts_by_owner.return_value = MagicMock(value=[])
-        tool = WalletTool(valid_key_b58, "https://api.devnet.solana.com")
+        client.get_token_accounts_by_owner_json_parsed.return_value = MagicMock(value=[])
         assert tool.balance_token("USDC") == 0.0
 
-    @patch("tools.wallet_tool.Client")
-    def test_balance_token_rpc_error_returns_zero(self, mock_client_cls: MagicMock) -> None:
-        """If the RPC rejects the mint, treat as zero balance."""
-        from solders.keypair import Keypair
+    def test_balance_token_sums_parsed_accounts_in_one_call(self, mock_wallet) -> None:
+        tool, client = mock_wallet
+        usdc = DEVNET_TOKENS.usdc
+        client.get_token_accounts_by_owner_json_parsed.return_value = MagicMock(
+            value=[
+                _parsed_token_account(usdc, "1250000", 6),
+                _parsed_token_account(usdc, "750000", 6),
+            ]
+        )
 
-        kp = Keypair()
-        valid_key_b58 = base58.b58encode(bytes(kp)).decode()
-        mock_client = mock_client_cls.return_value
-        mock_client.get_token_accounts_by_owner.side_effect = RuntimeError(
+        assert tool.balance_token("USDC") == 2.0
+        client.get_token_accounts_by_owner_json_parsed.assert_called_once()
+        client.get_token_account_balance.assert_not_called()
+
+    def test_balance_token_rpc_error_returns_zero(self, mock_wallet) -> None:
+        """If the RPC rejects the mint, treat as zero balance."""
+        tool, client = mock_wallet
+        client.get_token_accounts_by_owner_json_parsed.side_effect = RuntimeError(
             "Invalid param: Token mint could not be unpacked"
         )
-        tool = WalletTool(valid_key_b58, "https://api.devnet.solana.com")
         assert tool.balance_token("USDC") == 0.0
 
 
@@ -125,3 +147,49 @@ class TestWalletHistory:
         assert len(history) == 1
         assert history[0]["signature"] == "sigXYZ"
         assert history[0]["slot"] == 12345
+
+
+class TestConfirmation:
+    @pytest.fixture
+    def clock(self, monkeypatch: pytest.MonkeyPatch) -> list[float]:
+        """Fake clock: sleeps advance time instantly and are recorded."""
+        now = [0.0]
+        sleeps: list[float] = []
+
+        def sleep(seconds: float) -> None:
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        monkeypatch.setattr(
+            "tools.wallet_tool.time", SimpleNamespace(monotonic=lambda: now[0], sleep=sleep)
+        )
+        return sleeps
+
+    def test_await_many_batches_statuses_and_backs_off(
+        self, mock_wallet, clock: list[float]
+    ) -> None:
+        tool, client = mock_wallet
+        processed = SimpleNamespace(err=None, confirmation_status=TCS.Processed)
+        confirmed = SimpleNamespace(err=None, confirmation_status=TCS.Confirmed)
+        failed = SimpleNamespace(err="InstructionError", confirmation_status=TCS.Processed)
+        client.get_signature_statuses.side_effect = [
+            MagicMock(value=[None, processed, processed]),
+            MagicMock(value=[processed, confirmed, failed]),
+            MagicMock(value=[confirmed]),
+        ]
+
+        result = tool.await_many(["a", "b", "c"])
+
+        assert result == {"a": "confirmed", "b": "confirmed", "c": "failed"}
+        polled = [call.args[0] for call in client.get_signature_statuses.call_args_list]
+        assert polled == [["a", "b", "c"], ["a", "b", "c"], ["a"]]
+        assert clock == pytest.approx([0.2, 0.3])
+
+    def test_await_many_times_out_with_last_status(self, mock_wallet, clock: list[float]) -> None:
+        tool, client = mock_wallet
+        processed = SimpleNamespace(err=None, confirmation_status=TCS.Processed)
+        client.get_signature_statuses.return_value = MagicMock(value=[processed])
+
+        assert tool.await_many(["a"], timeout=10) == {"a": "processed"}
+        assert sum(clock) == pytest.approx(10)
+        assert max(clock) == 2.0
@@ -0,0 +1,150 @@
+"""Tests for tools/whale_tool.py — concurrent signature lookups, no network."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from tools.whale_tool import WhaleConfig, WhaleTool, get_whale_tool
+
+_RPC_URL = "https://api.mainnet-beta.solana.com"
+_WHALE_A = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
+_WHALE_B = "5Q544fKrFoe6tsEbD7S8EmxGTJYAKtTVhAW5Q5pge4j1"
+
+
+class _FakeAsyncClient:
+    """Stand-in for solana's AsyncClient serving canned per-wallet signatures."""
+
+    calls: list[str] = []
+    untils: list[Any] = []
+    signatures: dict[str, list[SimpleNamespace] | Exception] = {}
+
+    def __init__(self, endpoint: str) -> None:
+        assert endpoint == _RPC_URL
+
+    async def __aenter__(self) -> _FakeAsyncClient:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    async def get_signatures_for_address(
+        self, pubkey: Any, until: Any = None, limit: int | None = None
+    ) -> SimpleNamespace:
+        addr = str(pubkey)
+        self.calls.append(addr)
+        self.untils.append(until)
+        result = self.signatures[addr]
+        if isinstance(result, Exception):
+            raise result
+        names = [info.signature for info in result]
+        if until is not None:
+            result = result[: names.index(until)]
+        return SimpleNamespace(value=result[:limit])
+
+
+def _sig_info(name: str, age: timedelta | None) -> SimpleNamespace:
+    block_time = None
+    if age is not None:
+        block_time = int((datetime.now(timezone.utc) - age).timestamp())
+    return SimpleNamespace(signature=name, slot=1, block_time=block_time)
+
+
+def _tool(*wallets: str) -> WhaleTool:
+    return WhaleTool(WhaleConfig(rpc_url=_RPC_URL, whale_wallets=wallets))
+
+
+@pytest.fixture(autouse=True)
+def fake_client(monkeypatch: pytest.MonkeyPatch) -> type[_FakeAsyncClient]:
+    monkeypatch.setattr(_FakeAsyncClient, "calls", [])
+    monkeypatch.setattr(_FakeAsyncClient, "untils", [])
+    monkeypatch.setattr(
+        _FakeAsyncClient,
+        "signatures",
+        {
+            _WHALE_A: [
+                _sig_info("a-recent", timedelta(hours=1)),
+                _sig_info("a-pending", None),
+                _sig_info("a-old", timedelta(hours=30)),
+                _sig_info("a-older", timedelta(hours=2)),  # never reached: scan stops at a-old
+            ],
+            _WHALE_B: RuntimeError("rate limited"),
+        },
+    )
+    monkeypatch.setattr("tools.whale_tool.AsyncClient", _FakeAsyncClient)
+    return _FakeAsyncClient
+
+
+class TestRecentLargeTransfers:
+    def test_collects_recent_signatures_and_skips_failed_wallets(
+        self, fake_client: type[_FakeAsyncClient]
+    ) -> None:
+        events = _tool(_WHALE_A, _WHALE_B).get_recent_large_transfers(hours=24)
+
+        assert [e["signature"] for e in events] == ["a-recent"]
+        assert events[0]["wallet"] == _WHALE_A
+        assert sorted(fake_client.calls) == sorted([_WHALE_A, _WHALE_B])
+
+    def test_duplicate_and_invalid_wallets_are_dropped_up_front(
+        self, fake_client: type[_FakeAsyncClient]
+    ) -> None:
+        tool = _tool(_WHALE_A, "not-a-pubkey", _WHALE_A, "")
+        tool.get_recent_large_transfers()
+        assert fake_client.calls == [_WHALE_A]
+
+    def test_no_wallets_makes_no_requests(self, fake_client: type[_FakeAsyncClient]) -> None:
+        tool = _tool()
+        assert tool.get_recent_large_transfers() == []
+        assert tool.summarize_whale_activity() == "whale activity: no whale wallets configured yet"
+        assert fake_client.calls == []
+
+    def test_summary_counts_events_and_wallets(self) -> None:
+        summary = _tool(_WHALE_A, _WHALE_B).summarize_whale_activity(hours=24)
+        assert summary == "whale activity: 1 large transfers across 1 tracked wallets in last 24h"
+
+    def test_later_polls_only_fetch_new_signatures(
+        self, fake_client: type[_FakeAsyncClient]
+    ) -> None:
+        fake_client.signatures[_WHALE_A] = [
+            _sig_info("a-recent", timedelta(hours=1)),
+            _sig_info("a-old", timedelta(hours=30)),
+        ]
+        tool = _tool(_WHALE_A)
+        tool.get_recent_large_transfers(hours=24)
+        fake_client.signatures[_WHALE_A].insert(0, _sig_info("a-new", timedelta(minutes=5)))
+
+        events = tool.get_recent_large_transfers(hours=24)
+
+        # The second poll only asks for signatures newer than the last one seen.
+        assert fake_client.untils == [None, "a-recent"]
+        assert [e["signature"] for e in events] == ["a-new", "a-recent"]
+
+    def test_pending_signature_is_fetched_again_until_confirmed(
+        self, fake_client: type[_FakeAsyncClient]
+    ) -> None:
+        tool = _tool(_WHALE_A)
+        tool.get_recent_large_transfers(hours=24)
+        # a-pending (no block time yet) sits above a-old, so the head stays there.
+        signatures = fake_client.signatures[_WHALE_A]
+        assert isinstance(signatures, list)
+        signatures[1] = _sig_info("a-pending", timedelta(minutes=30))
+
+        events = tool.get_recent_large_transfers(hours=24)
+
+        assert fake_client.untils == [None, "a-old"]
+        assert [e["signature"] for e in events] == ["a-recent", "a-pending"]
+        tool.get_recent_large_transfers(hours=24)
+        assert fake_client.untils[-1] == "a-recent"
+
+
+class TestGetWhaleTool:
+    def test_equal_configs_share_one_tool(self) -> None:
+        get_whale_tool.cache_clear()
+        first = get_whale_tool(WhaleConfig(rpc_url=_RPC_URL, whale_wallets=(_WHALE_A,)))
+        again = get_whale_tool(WhaleConfig(rpc_url=_RPC_URL, whale_wallets=(_WHALE_A,)))
+        other = get_whale_tool(WhaleConfig(rpc_url=_RPC_URL, whale_wallets=(_WHALE_B,)))
+        assert first is again
+        assert other is not first
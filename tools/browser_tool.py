@@ -7,15 +7,37 @@ Browser mode (resolved at construction time):
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
-from playwright.async_api import async_playwright
+from playwright.async_api import Browser, Route, async_playwright
 
 logger = logging.getLogger(__name__)
 
 _MAX_CHARS = 8000
 
+# Truncate inside the page so only the first N chars cross the CDP bridge;
+# the full length is returned alongside for logging.
+_BODY_TEXT_JS = """(limit) => {
+    const text = document.body ? document.body.innerText : "";
+    return [text.length, text.slice(0, limit)];
+}"""
+
+
+# Only text is extracted, so these never need to be downloaded.  Stylesheets
+# still load: innerText depends on layout (display:none etc.).
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+
+async def _block_heavy_resources(route: Route) -> None:
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 
 class BrowserTool:
     def __init__(self) -> None:
@@ -27,27 +49,56 @@ class BrowserTool:
 
     async def scrape(self, url: str) -> str:
         """Scrape visible text from *url*.  Truncates at 8 k chars."""
+        async with self._browser() as browser:
+            return await self._scrape_page(browser, url)
+
+    async def scrape_many(self, urls: list[str]) -> list[str | BaseException]:
+        """Scrape *urls* concurrently over one browser session.
+
+        Results are in input order; a failed page yields its exception in
+        place of the text, so one bad site does not lose the others.
+        """
+        async with self._browser() as browser:
+            return await asyncio.gather(
+                *(self._scrape_page(browser, url) for url in urls), return_exceptions=True
+            )
+
+    @asynccontextmanager
+    async def _browser(self) -> AsyncIterator[Browser]:
+        """Launch or connect once; local browsers are closed on exit, remote ones stay alive."""
         async with async_playwright() as p:
             if self._cdp_url:
-                logger.info("connecting to remote browser for %s", url)
+                logger.info("connecting to remote browser at %s", self._cdp_url)
                 browser = await p.chromium.connect_over_cdp(self._cdp_url)
             else:
-                logger.info("launching local chromium for %s", url)
+                logger.info("launching local chromium")
                 browser = await p.chromium.launch(headless=True)
+            try:
+                yield browser
+            finally:
+                if not self._cdp_url:
+                    await browser.close()
 
-            page = await browser.new_page()
+    async def _scrape_page(self, browser: Browser, url: str) -> str:
+        page = await browser.new_page()
+        try:
+            await page.route("**/*", _block_heavy_resources)
             try:
                 await page.goto(url, wait_until="networkidle", timeout=30_000)
                 logger.info("page load succeeded for %s (status %s)", url, page.url)
             except Exception as exc:
                 logger.warning("page load failed for %s: %s", url, exc)
                 raise
-            text = await page.inner_text("body")
+            total_chars, text = await page.evaluate(_BODY_TEXT_JS, _MAX_CHARS)
+        finally:
+            # Remote browsers outlive us, so their pages must not pile up.
+            await page.close()
 
-            # only close if we launched it; remote browsers stay alive
-            if not self._cdp_url:
-                await browser.close()
+        truncated = total_chars > _MAX_CHARS
+        logger.info("got %d chars from %s%s", total_chars, url, " (truncated)" if truncated else "")
+        return self._truncate(text)
 
-        truncated = len(text) > _MAX_CHARS
-        logger.info("got %d chars%s", len(text), " (truncated)" if truncated else "")
-        return text[:_MAX_CHARS]
+    @staticmethod
+    def _truncate(text: str, limit: int = _MAX_CHARS) -> str:
+        """Cap *text* at *limit* chars (the page-side slice should already have)."""
+        return text[:limit]
@@ -52,24 +52,21 @@ class CoingeckoTool:
 
         lines: list[str] = []
         for idx, entry in enumerate(coins, start=1):
-            item = entry.get("item") or {}
+            item = entry.get("item")
+            if not item:
+                continue  # malformed entry; keep rank = position in the API list
             coin_id = item.get("id") or "unknown"
             symbol = (item.get("symbol") or "").lower()
-            name = item.get("name") or ""
-            score = item.get("score")
-            mcap_rank = item.get("market_cap_rank")
-            line_parts = [
-                f"rank={idx}",
-                f"id={coin_id}",
-                f"symbol={symbol}",
-            ]
+            line = f"[coingecko_trending] rank={idx} id={coin_id} symbol={symbol}"
+            name = item.get("name")
             if name:
-                line_parts.append(f"name={name}")
+                line += f" name={name}"
+            mcap_rank = item.get("market_cap_rank")
             if isinstance(mcap_rank, int):
-                line_parts.append(f"market_cap_rank={mcap_rank}")
+                line += f" market_cap_rank={mcap_rank}"
+            score = item.get("score")
             if isinstance(score, int):
-                line_parts.append(f"score={score}")
-            lines.append("[coingecko_trending] " + " ".join(line_parts))
-
-        return "\n".join(lines)
+                line += f" score={score}"
+            lines.append(line)
 
+        return "\n".join(lines) or "[coingecko_trending] no trending coins returned"
@@ -2,24 +2,34 @@
 
 from __future__ import annotations
 
+import os
+from functools import lru_cache
 from pathlib import Path
 
 _ALLOWED_DIRS = ("tools", "experiments")
 
 
+@lru_cache(maxsize=8)
+def _allowed_roots(cwd: str) -> tuple[str, tuple[str, ...]]:
+    """Return (project root prefix, allowed dir paths) for *cwd*, resolved once."""
+    root = os.path.realpath(cwd)
+    return root + os.sep, tuple(os.path.join(root, d) for d in _ALLOWED_DIRS)
+
+
 def _resolve_and_validate(path: str) -> Path:
     """Resolve the path (collapses ../) then check it stays inside allowed dirs."""
     resolved = Path(path).resolve()
-    cwd = Path.cwd().resolve()
-    try:
-        relative = resolved.relative_to(cwd)
-    except ValueError:
+    root_prefix, allowed = _allowed_roots(os.getcwd())
+    resolved_str = str(resolved)
+    if not resolved_str.startswith(root_prefix):
         raise PermissionError(f"Path '{path}' escapes the project root")
-    if relative.parts[0] not in _ALLOWED_DIRS:
-        raise PermissionError(
-            f"Path '{path}' (resolved: '{relative}') is outside allowed directories"
-        )
-    return resolved
+    for allowed_dir in allowed:
+        if resolved_str == allowed_dir or resolved_str.startswith(allowed_dir + os.sep):
+            return resolved
+    raise PermissionError(
+        f"Path '{path}' (resolved: '{resolved_str[len(root_prefix):]}') "
+        "is outside allowed directories"
+    )
 
 
 def read_file(path: str) -> str:
@@ -35,4 +45,17 @@ def list_files(directory: str = "tools") -> list[str]:
     resolved = _resolve_and_validate(directory)
     if not resolved.is_dir():
         raise FileNotFoundError(f"{directory} is not a directory")
-    return sorted(str(p.relative_to(Path.cwd())) for p in resolved.rglob("*") if p.is_file())
+    # scandir DirEntry caches file type, so this avoids a stat() per entry
+    # that rglob + Path.is_file() would pay.
+    root_len = len(_allowed_roots(os.getcwd())[0])
+    out: list[str] = []
+    stack = [str(resolved)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    out.append(entry.path[root_len:])
+    out.sort()
+    return out
@@ -3,56 +3,109 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List
+import time
+from typing import Any, Dict, List
 
 import httpx
+import orjson
+
+from tools.http_client import build_http_client, retry_transient
 
 logger = logging.getLogger(__name__)
 
 _FAPI_BASE_URL = "https://fapi.binance.com/fapi/v1"
+# Funding rates settle every 8h, open interest moves continuously.
+_FUNDING_TTL_S = 300.0
+_OPEN_INTEREST_TTL_S = 15.0
 
 
 class FundingTool:
     """Fetch perpetual funding rates and open interest from Binance Futures.
 
-    This uses public endpoints only and does not require API keys.
+    This uses public endpoints only and does not require API keys.  Requests go
+    through a pooled ``httpx.Client`` (normally the one shared by all tools) so
+    consecutive calls reuse the TLS connection.
     """
 
+    def __init__(self, http: httpx.Client | None = None) -> None:
+        self._http = http or build_http_client()
+        # symbol → (fetched_at, value), timestamps from time.monotonic().
+        self._rates_cache: dict[str, tuple[float, float]] = {}
+        self._open_interest_cache: dict[str, tuple[float, float]] = {}
+        self._http_version_logged = False
+
+    def invalidate(self) -> None:
+        """Drop cached values so the next calls hit Binance."""
+        self._rates_cache.clear()
+        self._open_interest_cache.clear()
+
+    @retry_transient
+    def _get_json(self, path: str, params: dict[str, str] | None = None) -> Any:
+        resp = self._http.get(f"{_FAPI_BASE_URL}{path}", params=params)
+        if not self._http_version_logged:
+            # Concurrent requests only multiplex over one connection on HTTP/2.
+            logger.debug("binance futures connection negotiated %s", resp.http_version)
+            self._http_version_logged = True
+        resp.raise_for_status()
+        return orjson.loads(resp.content)
+
     def get_funding_rates(self, symbols: List[str]) -> Dict[str, float]:
-        """Return a mapping symbol → current funding rate (as a fraction per 8h)."""
+        """Return a mapping symbol → current funding rate (as a fraction per 8h).
+
+        ``/premiumIndex`` without a symbol returns every perpetual in one array,
+        so this is a single request however many symbols are asked for.  Rates
+        are cached for a few minutes; the request is skipped when every symbol
+        is still fresh.
+        """
+        wanted = frozenset(symbols)
+        now = time.monotonic()
+        cached = {
+            symbol: hit[1]
+            for symbol in wanted
+            if (hit := self._rates_cache.get(symbol)) is not None and now - hit[0] < _FUNDING_TTL_S
+        }
+        if len(cached) == len(wanted):
+            return cached
+        try:
+            data = self._get_json("/premiumIndex")
+        except Exception as exc:
+            logger.warning("failed to fetch funding rates for %s: %s", sorted(wanted), exc)
+            return cached
         rates: Dict[str, float] = {}
-        for symbol in symbols:
+        for entry in data:
+            symbol = entry.get("symbol")
+            raw = entry.get("lastFundingRate")
             try:
-                resp = httpx.get(
-                    f"{_FAPI_BASE_URL}/premiumIndex",
-                    params={"symbol": symbol},
-                    timeout=10.0,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                raw = data.get("lastFundingRate")
-                if raw is None:
-                    logger.warning("no lastFundingRate in premiumIndex response for %s: %s", symbol, data)
-                    continue
+                # Delivery contracts in the same array report "" here.
                 rate = float(raw)
+            except (TypeError, ValueError):
+                if symbol in wanted:
+                    logger.warning(
+                        "no usable lastFundingRate in premiumIndex entry for %s: %s",
+                        symbol,
+                        entry,
+                    )
+                continue
+            # The batch response covers every perpetual, so cache them all.
+            self._rates_cache[symbol] = (now, rate)
+            if symbol in wanted:
                 rates[symbol] = rate
-            except Exception as exc:
-                logger.warning("failed to fetch funding rate for %s: %s", symbol, exc)
         return rates
 
     def get_open_interest(self, symbol: str) -> float:
         """Return current open interest (base asset amount) for *symbol*."""
+        now = time.monotonic()
+        hit = self._open_interest_cache.get(symbol)
+        if hit is not None and now - hit[0] < _OPEN_INTEREST_TTL_S:
+            return hit[1]
         try:
-            resp = httpx.get(
-                f"{_FAPI_BASE_URL}/openInterest",
-                params={"symbol": symbol},
-                timeout=10.0,
-            )
-            resp.raise_for_status()
-            data = resp.json()
+            data = self._get_json("/openInterest", params={"symbol": symbol})
             raw = data.get("openInterest")
-            return float(raw) if raw is not None else 0.0
+            if raw is None:
+                return 0.0
+            value = float(raw)
+            self._open_interest_cache[symbol] = (now, value)
+            return value
         except Exception as exc:
             logger.warning("failed to fetch open interest for %s: %s", symbol, exc)
             return 0.0
-
@@ -25,7 +25,8 @@ class GitTool:
             check=True,
         )
 
-        # Inject token into remote URL only at push time
+        # Push straight to a token URL; git does not store URLs given on the
+        # command line, so no remote config ever holds the token.
         owner_repo = self.config.git.repo
         token = self.config.git.token
         remote_url = f"https://{token}@github.com/{owner_repo}.git"
@@ -38,10 +39,4 @@ class GitTool:
             stderr=subprocess.PIPE,
         )
 
-        # Reset remote to the non-token URL so it is never persisted
-        subprocess.run(
-            ["git", "remote", "set-url", "origin", f"https://github.com/{owner_repo}.git"],
-            check=True,
-        )
-
         return "push succeeded"
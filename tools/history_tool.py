@@ -30,15 +30,14 @@ class HistoryTool:
 
 
 def _format_trade(idx: int, t: dict[str, Any]) -> str:
-    lines = [
-        f"--- past action #{idx} ({t.get('date', '?')}) ---",
-        f"  action   : {t.get('action_type', '?')}",
-        f"  target   : {t.get('target', '')}",
-        f"  confidence: {t.get('confidence', '?')}",
-        f"  why      : {t.get('reason', '(none)')}",
-        f"  result   : {t.get('result', '(none)')}",
-    ]
-    params = t.get("params", {})
-    if params:
-        lines.insert(3, f"  params   : {params}")
-    return "\n".join(lines)
+    params = t.get("params")
+    params_line = f"  params   : {params}\n" if params else ""
+    return (
+        f"--- past action #{idx} ({t.get('date', '?')}) ---\n"
+        f"  action   : {t.get('action_type', '?')}\n"
+        f"  target   : {t.get('target', '')}\n"
+        f"{params_line}"
+        f"  confidence: {t.get('confidence', '?')}\n"
+        f"  why      : {t.get('reason', '(none)')}\n"
+        f"  result   : {t.get('result', '(none)')}"
+    )
@@ -0,0 +1,53 @@
+"""Shared HTTP client for tools that talk to public REST/JSON-RPC endpoints.
+
+build_graph() creates one client and hands it to every HTTP-based tool so
+keep-alive connections, limits and timeouts are configured in one place.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+
+import httpx
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random,
+)
+
+HTTP_TIMEOUT_S = 10.0
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Rate limiting and gateway hiccups; any other 4xx is permanent.
+_TRANSIENT_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def build_http_client(transport: httpx.BaseTransport | None = None) -> httpx.Client:
+    """Return a pooled client; *transport* lets tests substitute an httpx.MockTransport."""
+    return httpx.Client(
+        timeout=HTTP_TIMEOUT_S,
+        limits=HTTP_LIMITS,
+        http2=HTTP2_AVAILABLE,
+        transport=transport,
+    )
+
+
+def is_transient_http_error(exc: BaseException) -> bool:
+    """True for connection/timeout errors and retryable HTTP statuses."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _TRANSIENT_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
+# Decorator for idempotent GETs: three attempts with jittered backoff, then the
+# last error is re-raised to the caller.
+retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=0.2, max=2.0) + wait_random(0, 0.2),
+    retry=retry_if_exception(is_transient_http_error),
+    reraise=True,
+)
@@ -10,16 +10,24 @@ holder counts) it can be extended to call third-party indexers.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List
+from typing import Any, Dict, List
 
-from solana.rpc.api import Client as SolanaClient
+import httpx
+import orjson
+from solana.rpc.async_api import AsyncClient
 from solders.pubkey import Pubkey
 
+from tools.http_client import build_http_client
+
 logger = logging.getLogger(__name__)
 
+# Signatures requested per address (newest first).
+_SIGNATURE_LIMIT = 50
+
 
 @dataclass(frozen=True)
 class OnchainConfig:
@@ -30,15 +38,18 @@ class OnchainTool:
     """Lightweight Solana on-chain data accessor.
 
     Current capabilities:
-    - Large transfer activity for selected addresses via getSignaturesForAddress.
+    - Large transfer activity for selected addresses via getSignaturesForAddress,
+      sent as a single JSON-RPC batch request, or as concurrent requests when
+      the RPC provider does not accept batches.
 
     The methods for whale holders, DEX volume and holder counts are left as
     extension points so they can be wired to specific indexer APIs without
     hardcoding a provider here.
     """
 
-    def __init__(self, config: OnchainConfig) -> None:
-        self._client = SolanaClient(config.rpc_url)
+    def __init__(self, config: OnchainConfig, http: httpx.Client | None = None) -> None:
+        self._rpc_url = config.rpc_url
+        self._http = http or build_http_client()
 
     # ── extension points (stubs) ───────────────────────────────────
 
@@ -89,37 +100,135 @@ class OnchainTool:
         This does not decode exact amounts; instead it surfaces *activity* that
         the LLM can treat as a qualitative \"whales are moving\" signal.
         """
+        return self._collect_transfers(addresses, min_slot, lookback_hours)[0]
+
+    def _collect_transfers(
+        self,
+        addresses: List[str],
+        min_slot: int | None,
+        lookback_hours: int,
+    ) -> tuple[List[Dict], set[str]]:
+        """Return the events plus the set of addresses that produced at least one."""
+        events: List[Dict] = []
+        active: set[str] = set()
         if not addresses:
-            return []
+            return events, active
 
         cutoff = datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
-        events: List[Dict] = []
 
-        for addr in addresses:
+        valid: List[str] = []
+        # The same wallet may be tracked from several sources; query it once.
+        for addr in dict.fromkeys(addresses):
             try:
-                pubkey = Pubkey.from_string(addr)
-                resp = self._client.get_signatures_for_address(pubkey, limit=50)
-                for sig_info in resp.value:
-                    if min_slot is not None and sig_info.slot < min_slot:
-                        continue
-                    block_time = sig_info.block_time
-                    if block_time is None:
-                        continue
-                    ts = datetime.fromtimestamp(block_time, tz=timezone.utc)
-                    if ts < cutoff:
-                        continue
-                    events.append(
-                        {
-                            "address": addr,
-                            "signature": str(sig_info.signature),
-                            "slot": sig_info.slot,
-                            "timestamp": ts.isoformat(),
-                        }
-                    )
+                Pubkey.from_string(addr)
             except Exception as exc:
                 logger.warning("OnchainTool: failed to inspect address %s: %s", addr, exc)
-
-        return events
+                continue
+            valid.append(addr)
+        if not valid:
+            return events, active
+
+        try:
+            signatures = self._fetch_signatures(valid)
+        except Exception as exc:
+            logger.warning(
+                "OnchainTool: batch getSignaturesForAddress failed (%s); "
+                "falling back to concurrent requests",
+                exc,
+            )
+            signatures = asyncio.run(self._fetch_signatures_concurrently(valid))
+
+        cutoff_ts = cutoff.timestamp()
+        for addr, sig_infos in signatures.items():
+            # Signatures come back newest first, so the first one past either
+            # bound ends the scan for this address.
+            for sig_info in sig_infos:
+                slot = sig_info.get("slot")
+                if min_slot is not None and slot is not None and slot < min_slot:
+                    break
+                block_time = sig_info.get("blockTime")
+                if block_time is None:
+                    continue
+                if block_time < cutoff_ts:
+                    break
+                ts = datetime.fromtimestamp(block_time, tz=timezone.utc)
+                events.append(
+                    {
+                        "address": addr,
+                        "signature": sig_info.get("signature"),
+                        "slot": slot,
+                        "timestamp": ts.isoformat(),
+                    }
+                )
+                active.add(addr)
+
+        return events, active
+
+    def _fetch_signatures(self, addresses: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch recent signatures for every address in one JSON-RPC batch.
+
+        Returns address → list of signature infos as returned by the RPC.
+        Addresses whose entry in the batch errored are logged and left out.
+        """
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "getSignaturesForAddress",
+                "params": [addr, {"limit": _SIGNATURE_LIMIT}],
+            }
+            for i, addr in enumerate(addresses)
+        ]
+        resp = self._http.post(self._rpc_url, json=payload)
+        resp.raise_for_status()
+        replies = orjson.loads(resp.content)
+        if not isinstance(replies, list):
+            # Providers that do not support batching answer with a single error object.
+            raise RuntimeError(f"RPC rejected batch request: {replies}")
+
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        for reply in replies:
+            addr = addresses[reply["id"]]
+            if "error" in reply:
+                logger.warning(
+                    "OnchainTool: failed to inspect address %s: %s", addr, reply["error"]
+                )
+                continue
+            results[addr] = reply.get("result") or []
+        return results
+
+    async def _fetch_signatures_concurrently(
+        self, addresses: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Fallback for :meth:`_fetch_signatures`: one request per address, all in flight at once.
+
+        Results use the same raw RPC shape as the batch path.
+        """
+        async with AsyncClient(self._rpc_url) as client:
+            responses = await asyncio.gather(
+                *(
+                    client.get_signatures_for_address(
+                        Pubkey.from_string(addr), limit=_SIGNATURE_LIMIT
+                    )
+                    for addr in addresses
+                ),
+                return_exceptions=True,
+            )
+
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        for addr, resp in zip(addresses, responses):
+            if isinstance(resp, BaseException):
+                logger.warning("OnchainTool: failed to inspect address %s: %s", addr, resp)
+                continue
+            results[addr] = [
+                {
+                    "signature": str(sig_info.signature),
+                    "slot": sig_info.slot,
+                    "blockTime": sig_info.block_time,
+                }
+                for sig_info in resp.value
+            ]
+        return results
 
     def summarize_large_transfers(
         self,
@@ -127,15 +236,13 @@ class OnchainTool:
         lookback_hours: int = 24,
     ) -> str:
         """Summarize large transfer activity for a set of addresses."""
-        events = self.get_large_transfers(addresses, lookback_hours=lookback_hours)
         if not addresses:
             return "onchain: no tracked addresses configured for large transfer monitoring"
+        events, active = self._collect_transfers(addresses, None, lookback_hours)
         if not events:
             return f"onchain: no recent large transfers in last {lookback_hours}h"
 
-        unique_addrs = {e["address"] for e in events}
         return (
             f"onchain: {len(events)} recent transfers across "
-            f"{len(unique_addrs)} tracked addresses in last {lookback_hours}h"
+            f"{len(active)} tracked addresses in last {lookback_hours}h"
         )
-
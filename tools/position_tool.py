@@ -22,9 +22,19 @@ class PositionSnapshot:
     last_updated: str
 
 
+def _normalize_prices(prices: Dict[str, float]) -> Dict[str, float]:
+    """Upper-case symbols and coerce prices once; position keys are stored upper-cased."""
+    return {symbol.upper(): float(price) for symbol, price in prices.items()}
+
+
 class PositionTool:
     """Lightweight wrapper around MemoryStore for portfolio operations.
 
+    Read-only helpers use MemoryStore.load_key(); mutators load and save the
+    whole state, so callers making several changes (e.g. both legs of a swap
+    plus its history record) should wrap them in ``MemoryStore.batch()`` to
+    write once.
+
     Notes on semantics:
     - `amount` is tracked per token symbol.
     - `cost_basis_usd` is an approximate USD cost basis, often derived from SOL
@@ -58,15 +68,17 @@ class PositionTool:
             "cost_basis_usd": 0.0,
             "last_updated": "",
         }
-        amount = float(pos.get("amount", 0.0)) + float(amount_delta)
-        cost_basis = float(pos.get("cost_basis_usd", 0.0))
+        # Non-finite floats are stored as null, so treat None like a missing value.
+        amount = float(pos.get("amount") or 0.0) + amount_delta
+        cost_basis = float(pos.get("cost_basis_usd") or 0.0)
 
         if amount_delta > 0 and usd_value > 0:
-            cost_basis += float(usd_value)
+            cost_basis += usd_value
         elif amount_delta < 0 and amount > 0 and cost_basis > 0:
-            # Reduce cost basis proportionally to the fraction of position sold
-            sold_fraction = min(1.0, abs(amount_delta) / (amount + abs(amount_delta)))
-            cost_basis *= 1.0 - sold_fraction
+            # Reduce cost basis proportionally to the fraction of position sold,
+            # i.e. keep remaining / (remaining + sold).  amount > 0 here, so the
+            # fraction is always below 1 and needs no clamping.
+            cost_basis *= amount / (amount - amount_delta)
         if amount <= 0:
             amount = 0.0
             cost_basis = 0.0
@@ -84,8 +96,7 @@ class PositionTool:
 
         If no position exists yet, a zeroed snapshot is returned.
         """
-        state = self._memory.load()
-        positions = state.get("positions", {})
+        positions = self._memory.load_key("positions", {})
         return positions.get(
             token.upper(),
             {
@@ -97,13 +108,11 @@ class PositionTool:
 
     def get_portfolio_value_usd(self, prices: Dict[str, float]) -> float:
         """Return the total portfolio value in USD given a symbol->price mapping."""
-        state = self._memory.load()
-        positions = state.get("positions", {})
+        positions = self._memory.load_key("positions", {})
+        prices_u = _normalize_prices(prices)
         total = 0.0
         for symbol, pos in positions.items():
-            amount = float(pos.get("amount", 0.0))
-            price = float(prices.get(symbol.upper(), 0.0))
-            total += amount * price
+            total += (pos.get("amount") or 0.0) * prices_u.get(symbol, 0.0)
         return total
 
     def append_swap(self, record: Dict) -> None:
@@ -120,17 +129,16 @@ class PositionTool:
 
     def portfolio_summary(self, prices: Dict[str, float]) -> str:
         """Return a compact human-readable portfolio summary for the LLM."""
-        state = self._memory.load()
-        positions = state.get("positions", {})
+        positions = self._memory.load_key("positions", {})
         if not positions:
             return "no tracked positions yet"
 
+        prices_u = _normalize_prices(prices)
         lines = []
         total_usd = 0.0
         for symbol, pos in positions.items():
-            amount = float(pos.get("amount", 0.0))
-            price = float(prices.get(symbol.upper(), 0.0))
-            value = amount * price
+            amount = pos.get("amount") or 0.0
+            value = amount * prices_u.get(symbol, 0.0)
             total_usd += value
             lines.append(f"{symbol}: {amount:.6f} (~${value:.2f})")
         return f"total ≈ ${total_usd:.2f}; " + ", ".join(lines)
@@ -144,22 +152,23 @@ class PositionTool:
           - cost_basis_usd approximated as amount * price (if price available)
           - source flag set to "onchain_sync"
         """
-        state = self._memory.load()
-        positions = state.setdefault("positions", {})
-
         try:
             balances: Dict[str, float] = wallet_tool.get_all_balances()
         except Exception:
             # If on-chain balance fetch fails, do not modify existing positions.
             return
 
+        state = self._memory.load()
+        positions = state.setdefault("positions", {})
+
+        today_iso = date.today().isoformat()
         changed = False
         for symbol, balance in balances.items():
             if balance <= 0:
                 continue
             key = symbol.upper()
             existing = positions.get(key)
-            existing_amount = float(existing.get("amount", 0.0)) if existing else 0.0
+            existing_amount = float(existing.get("amount") or 0.0) if existing else 0.0
             if existing and existing_amount > 0:
                 continue
 
@@ -168,7 +177,7 @@ class PositionTool:
             positions[key] = {
                 "amount": float(balance),
                 "cost_basis_usd": float(usd_value),
-                "last_updated": date.today().isoformat(),
+                "last_updated": today_iso,
                 "source": "onchain_sync",
             }
             changed = True
@@ -11,8 +11,16 @@ import logging
 from dataclasses import dataclass
 from typing import Dict, List
 
+import httpx
+
+from tools.http_client import build_http_client
+
 logger = logging.getLogger(__name__)
 
+# Indexed by (score > threshold) - (score < -threshold) + 1.
+_MOODS = ("bearish", "neutral", "bullish")
+_MOOD_THRESHOLD = 0.2
+
 
 @dataclass(frozen=True)
 class SentimentConfig:
@@ -34,11 +42,14 @@ class SentimentTool:
 
     At the moment this implementation only provides stubbed values; it can be
     extended to call real APIs (LunarCrush, Twitter, Reddit) obeying policy
-    constraints.
+    constraints.  Providers should use ``self._http``, the shared client.
     """
 
-    def __init__(self, config: SentimentConfig | None = None) -> None:
+    def __init__(
+        self, config: SentimentConfig | None = None, http: httpx.Client | None = None
+    ) -> None:
         self._config = config or SentimentConfig()
+        self._http = http or build_http_client()
 
     def get_sentiment(self, symbols: List[str]) -> Dict[str, Dict]:
         """Return a normalized sentiment snapshot per symbol.
@@ -68,12 +79,7 @@ class SentimentTool:
             info = data.get(sym.upper()) or {}
             vol = float(info.get("social_volume_score", 0.0))
             score = float(info.get("sentiment_score", 0.0))
-            if score > 0.2:
-                mood = "bullish"
-            elif score < -0.2:
-                mood = "bearish"
-            else:
-                mood = "neutral"
+            mood = _MOODS[(score > _MOOD_THRESHOLD) - (score < -_MOOD_THRESHOLD) + 1]
             parts.append(f"{sym}: volume={vol:.2f}, mood={mood}")
 
         return "sentiment: " + "; ".join(parts)
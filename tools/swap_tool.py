@@ -1,7 +1,8 @@
 """Token swap tool using Jupiter Ultra API on Solana.
 
-This tool is deliberately minimal and synchronous from the caller's point of view.
-It:
+This tool is deliberately minimal and synchronous from the caller's point of view
+(``SwapTool.swap_async`` runs the same pipeline on a worker thread for callers
+already inside an event loop).  It:
   - Builds a swap transaction via Jupiter Ultra `/order`
   - Signs it with the existing wallet keypair
   - Executes it via `/execute`
@@ -12,19 +13,33 @@ Network errors and Jupiter errors are surfaced as exceptions; the agent's
 
 from __future__ import annotations
 
+import asyncio
 import base64
-import json
 import logging
+import os
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, BinaryIO, Dict
 
 import httpx
+import orjson
 from solana.rpc.api import Client as SolanaClient
+from solana.rpc.commitment import Processed
+from solana.rpc.types import TxOpts
 from solders.keypair import Keypair
 from solders.transaction import VersionedTransaction
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    stop_after_delay,
+    wait_exponential,
+    wait_random,
+)
 
 from core.network_config import (
     DEVNET_TOKENS,
@@ -33,17 +48,33 @@ from core.network_config import (
     NetworkTokens,
     NetworkType,
 )
+from tools.http_client import build_http_client
 
 logger = logging.getLogger(__name__)
 
 JUP_ULTRA_BASE_URL = "https://api.jup.ag"
 # Jupiter's documented swap API host; we use /swap/v1/quote and /swap/v1/swap.
 JUP_SWAP_BASE_URL = "https://api.jup.ag"
+# Keep the RPC's preflight simulation: the signature is returned without waiting
+# for confirmation, so preflight is what turns a swap that would fail on-chain
+# (slippage, balance) into an exception instead of a recorded trade.
+_V6_SEND_OPTS = TxOpts(preflight_commitment=Processed, max_retries=3)
 _DEBUG_LOG_PATH = Path(".cursor/debug.log")
+# Swap instrumentation is opt-in; read once at import so the hot path is a single check.
+_DEBUG_ENABLED = os.environ.get("SWAP_DEBUG_LOG") == "1"
+
+
+@lru_cache(maxsize=1)
+def _debug_log_file() -> BinaryIO:
+    """Open the debug log once; unbuffered so each record is a single write()."""
+    _DEBUG_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    return _DEBUG_LOG_PATH.open("ab", buffering=0)
 
 
 def _debug_log(hypothesis_id: str, location: str, message: str, data: Dict[str, Any]) -> None:
     """Append a single NDJSON debug line for swap-related instrumentation."""
+    if not _DEBUG_ENABLED:
+        return
     # region agent log
     payload = {
         "sessionId": "debug-session",
@@ -52,18 +83,47 @@ def _debug_log(hypothesis_id: str, location: str, message: str, data: Dict[str,
         "location": location,
         "message": message,
         "data": data,
-        "timestamp": int(datetime.now().timestamp() * 1000),
+        "timestamp": time.time_ns() // 1_000_000,
     }
     try:
-        _DEBUG_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with _DEBUG_LOG_PATH.open("a", encoding="utf-8") as fh:
-            fh.write(json.dumps(payload) + "\n")
+        _debug_log_file().write(orjson.dumps(payload) + b"\n")
     except Exception:
         # Never let debug logging break swaps.
         pass
     # endregion
 
 
+class RetriableHTTPError(RuntimeError):
+    """Jupiter answered 429 or 5xx; the same request may succeed if repeated."""
+
+
+class NoLiquidityError(RuntimeError):
+    """Jupiter has no route for the pair; on devnet SwapTool falls back to MockSwap."""
+
+
+_RETRIABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Transient Jupiter failures are retried in place instead of failing the whole
+# agent action.  Random jitter keeps several agents from retrying in lockstep;
+# the delay budget bounds how long one swap can stall.
+_retry_transient = retry(
+    stop=stop_after_attempt(5) | stop_after_delay(60),
+    wait=wait_exponential(multiplier=1, max=30) + wait_random(0, 2),
+    retry=retry_if_exception_type((httpx.TransportError, RetriableHTTPError)),
+    reraise=True,
+)
+
+
+def _check_status(resp: httpx.Response, label: str) -> None:
+    """Raise for any non-200 response; retriable statuses get RetriableHTTPError."""
+    if resp.status_code == 200:
+        return
+    message = f"{label} error {resp.status_code}: {resp.text}"
+    if resp.status_code in _RETRIABLE_STATUS:
+        raise RetriableHTTPError(message)
+    raise RuntimeError(message)
+
+
 class SwapStrategy(ABC):
     """Abstract swap execution strategy."""
 
@@ -87,35 +147,43 @@ class JupiterUltraSwap(SwapStrategy):
         keypair: Keypair,
         rpc: SolanaClient,
         api_key: str | None,
+        http: httpx.Client | None = None,
     ) -> None:
         self._keypair = keypair
         self._rpc = rpc
         self._api_key = api_key
-
-    def _owner_pubkey_str(self) -> str:
-        return str(self._keypair.pubkey())
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
+        # Pooled client: /order and /execute reuse one TLS connection.
+        self._http = http or build_http_client()
+        # base58 of the wallet pubkey and the auth header; both fixed for the
+        # life of the strategy.
+        self._owner_pubkey = str(keypair.pubkey())
+        self._headers = {"x-api-key": api_key} if api_key else None
+
+    @_retry_transient
     def _execute_ultra(
         self,
         request_id: str,
         signed_tx_b64: str,
-        headers: Dict[str, str] | None,
     ) -> Dict[str, Any]:
-        exec_resp = httpx.post(
+        exec_resp = self._http.post(
             f"{JUP_ULTRA_BASE_URL}/ultra/v1/execute",
             json={"requestId": request_id, "signedTransaction": signed_tx_b64},
-            headers=headers or None,
+            headers=self._headers,
             timeout=20.0,
         )
-        if exec_resp.status_code != 200:
-            raise RuntimeError(
-                f"Ultra execute error {exec_resp.status_code}: {exec_resp.text}"
-            )
-        return exec_resp.json()
+        _check_status(exec_resp, "Ultra execute")
+        return orjson.loads(exec_resp.content)
+
+    @_retry_transient
+    def _get_order(self, params: Dict[str, str]) -> httpx.Response:
+        order_resp = self._http.get(
+            f"{JUP_ULTRA_BASE_URL}/ultra/v1/order",
+            params=params,
+            headers=self._headers,
+            timeout=20.0,
+        )
+        _check_status(order_resp, "Ultra order")
+        return order_resp
 
     def execute_swap(
         self,
@@ -124,7 +192,7 @@ class JupiterUltraSwap(SwapStrategy):
         amount_lamports: int,
         slippage_bps: int,
     ) -> str:
-        taker = self._owner_pubkey_str()
+        taker = self._owner_pubkey
 
         logger.info(
             "JupiterUltraSwap: requesting Ultra order %s -> %s amount=%d (slippage_bps=%d)",
@@ -134,28 +202,17 @@ class JupiterUltraSwap(SwapStrategy):
             slippage_bps,
         )
 
-        headers: Dict[str, str] = {}
-        if self._api_key:
-            headers["x-api-key"] = self._api_key
-
-        order_resp = httpx.get(
-            f"{JUP_ULTRA_BASE_URL}/ultra/v1/order",
-            params={
+        order_resp = self._get_order(
+            {
                 "inputMint": from_mint,
                 "outputMint": to_mint,
                 "amount": str(amount_lamports),
                 "slippageBps": str(slippage_bps),
                 "taker": taker,
-            },
-            headers=headers or None,
-            timeout=20.0,
+            }
         )
-        if order_resp.status_code != 200:
-            raise RuntimeError(
-                f"Ultra order error {order_resp.status_code}: {order_resp.text}"
-            )
 
-        order_json: Dict[str, Any] = order_resp.json()
+        order_json: Dict[str, Any] = orjson.loads(order_resp.content)
         unsigned_tx_b64 = order_json.get("transaction") or order_json.get(
             "swapTransaction"
         )
@@ -184,7 +241,9 @@ class JupiterUltraSwap(SwapStrategy):
         unsigned_bytes = base64.b64decode(unsigned_tx_b64)
         tx = VersionedTransaction.from_bytes(unsigned_bytes)
         signed_tx = VersionedTransaction(tx.message, [self._keypair])
-        signed_b64 = base64.b64encode(bytes(signed_tx)).decode("utf-8")
+        # Serialise once; the length below and the payload share these bytes.
+        signed_bytes = bytes(signed_tx)
+        signed_b64 = base64.b64encode(signed_bytes).decode("ascii")
 
         # Swap-specific debug log so we can inspect Ultra failures post-run.
         _debug_log(
@@ -192,16 +251,16 @@ class JupiterUltraSwap(SwapStrategy):
             "tools/swap_tool.py:JupiterUltraSwap.execute_swap:before_execute",
             "prepared signed transaction for Ultra execute",
             {
-                "owner_pubkey": self._owner_pubkey_str(),
+                "owner_pubkey": taker,
                 "request_id": request_id,
                 "unsigned_tx_len": len(unsigned_bytes),
-                "signed_tx_len": len(bytes(signed_tx)),
+                "signed_tx_len": len(signed_bytes),
                 "signed_b64_prefix": signed_b64[:64],
                 "api_key_present": bool(self._api_key),
             },
         )
 
-        exec_json = self._execute_ultra(request_id, signed_b64, headers)
+        exec_json = self._execute_ultra(request_id, signed_b64)
         signature = exec_json.get("signature") or exec_json.get("txid")
         if not signature:
             raise RuntimeError(
@@ -215,10 +274,46 @@ class JupiterUltraSwap(SwapStrategy):
 class JupiterV6Swap(SwapStrategy):
     """Devnet Jupiter Swap API implementation (real swaps)."""
 
-    def __init__(self, keypair: Keypair, rpc: SolanaClient, api_key: str | None) -> None:
+    def __init__(
+        self,
+        keypair: Keypair,
+        rpc: SolanaClient,
+        api_key: str | None,
+        http: httpx.Client | None = None,
+    ) -> None:
         self._keypair = keypair
         self._rpc = rpc
         self._api_key = api_key
+        self._http = http or build_http_client()
+        self._owner_pubkey = str(keypair.pubkey())
+        self._headers = {"x-api-key": api_key} if api_key else None
+
+    @_retry_transient
+    def _get_quote(self, params: Dict[str, str]) -> httpx.Response:
+        quote_resp = self._http.get(
+            f"{JUP_SWAP_BASE_URL}/swap/v1/quote",
+            params=params,
+            headers=self._headers,
+            timeout=10.0,
+        )
+        if quote_resp.status_code == 404:
+            raise NoLiquidityError(
+                "No liquidity pool found on devnet for this token pair. "
+                "Available devnet pairs are limited."
+            )
+        _check_status(quote_resp, "Jupiter v6 quote")
+        return quote_resp
+
+    @_retry_transient
+    def _post_swap(self, body: Dict[str, Any]) -> httpx.Response:
+        swap_resp = self._http.post(
+            f"{JUP_SWAP_BASE_URL}/swap/v1/swap",
+            json=body,
+            headers=self._headers,
+            timeout=10.0,
+        )
+        _check_status(swap_resp, "Jupiter v6 swap")
+        return swap_resp
 
     def execute_swap(
         self,
@@ -246,22 +341,16 @@ class JupiterV6Swap(SwapStrategy):
             amount_lamports,
             slippage_bps,
         )
-        headers: Dict[str, str] = {}
-        if self._api_key:
-            headers["x-api-key"] = self._api_key
         try:
-            quote_resp = httpx.get(
-                f"{JUP_SWAP_BASE_URL}/swap/v1/quote",
-                params={
+            quote_resp = self._get_quote(
+                {
                     "inputMint": from_mint,
                     "outputMint": to_mint,
                     "amount": str(amount_lamports),
                     "slippageBps": str(slippage_bps),
-                },
-                headers=headers or None,
-                timeout=10.0,
+                }
             )
-        except Exception as exc:
+        except httpx.TransportError as exc:
             _debug_log(
                 "H1",
                 "tools/swap_tool.py:JupiterV6Swap.execute_swap:quote_error",
@@ -270,30 +359,17 @@ class JupiterV6Swap(SwapStrategy):
             )
             raise
 
-        if quote_resp.status_code == 404:
-            raise RuntimeError(
-                "No liquidity pool found on devnet for this token pair. "
-                "Available devnet pairs are limited."
-            )
-        if quote_resp.status_code != 200:
-            raise RuntimeError(
-                f"Jupiter v6 quote error {quote_resp.status_code}: {quote_resp.text}"
-            )
-
-        quote = quote_resp.json()
+        quote = orjson.loads(quote_resp.content)
 
         try:
-            swap_resp = httpx.post(
-                f"{JUP_SWAP_BASE_URL}/swap/v1/swap",
-                json={
+            swap_resp = self._post_swap(
+                {
                     "quoteResponse": quote,
-                    "userPublicKey": str(self._keypair.pubkey()),
+                    "userPublicKey": self._owner_pubkey,
                     "wrapAndUnwrapSol": True,
-                },
-                headers=headers or None,
-                timeout=10.0,
+                }
             )
-        except Exception as exc:
+        except httpx.TransportError as exc:
             _debug_log(
                 "H1",
                 "tools/swap_tool.py:JupiterV6Swap.execute_swap:swap_error",
@@ -301,12 +377,8 @@ class JupiterV6Swap(SwapStrategy):
                 {"error_type": type(exc).__name__, "error_str": str(exc)},
             )
             raise
-        if swap_resp.status_code != 200:
-            raise RuntimeError(
-                f"Jupiter v6 swap error {swap_resp.status_code}: {swap_resp.text}"
-            )
 
-        unsigned_tx_b64 = swap_resp.json().get("swapTransaction")
+        unsigned_tx_b64 = orjson.loads(swap_resp.content).get("swapTransaction")
         if not unsigned_tx_b64:
             raise RuntimeError("Jupiter v6 swap response missing swapTransaction")
 
@@ -315,7 +387,7 @@ class JupiterV6Swap(SwapStrategy):
         signed_tx = VersionedTransaction(tx.message, [self._keypair])
 
         # Submit directly to the configured RPC rather than via Jupiter execute.
-        resp = self._rpc.send_raw_transaction(bytes(signed_tx))
+        resp = self._rpc.send_raw_transaction(bytes(signed_tx), opts=_V6_SEND_OPTS)
         return str(resp.value)
 
 
@@ -348,6 +420,16 @@ class MockSwap(SwapStrategy):
         return fake_sig
 
 
+@dataclass(frozen=True)
+class SwapSpec:
+    """One leg of a :meth:`SwapTool.swap_many` batch."""
+
+    from_token: str
+    to_token: str
+    amount_lamports: int
+    slippage_bps: int = 50
+
+
 class SwapTool:
     """Network-aware swap executor using strategy pattern.
 
@@ -362,25 +444,29 @@ class SwapTool:
         rpc_url: str,
         *,
         api_key: str | None = None,
+        http: httpx.Client | None = None,
     ) -> None:
         self._keypair = keypair
         self._rpc = SolanaClient(rpc_url)
+        self._http = http or build_http_client()
         self._rpc_url = rpc_url
         self._network = NetworkDetector.detect(rpc_url)
         self._tokens: NetworkTokens = (
             DEVNET_TOKENS if self._network == NetworkType.DEVNET else MAINNET_TOKENS
         )
         self._strategy: SwapStrategy = self._select_strategy(api_key)
+        # Stateless devnet fallback for pairs without a Jupiter route.
+        self._mock = MockSwap(self._network)
 
     def _select_strategy(self, api_key: str | None) -> SwapStrategy:
         if self._network == NetworkType.MAINNET:
             if not api_key:
                 raise ValueError("JUPITER_API_KEY required for mainnet swaps")
-            return JupiterUltraSwap(self._keypair, self._rpc, api_key)
+            return JupiterUltraSwap(self._keypair, self._rpc, api_key, self._http)
 
         # Devnet: prefer real swaps via Jupiter swap API; caller may catch
         # RuntimeError and fall back to mock if desired.
-        return JupiterV6Swap(self._keypair, self._rpc, api_key)
+        return JupiterV6Swap(self._keypair, self._rpc, api_key, self._http)
 
     def swap(
         self,
@@ -404,17 +490,44 @@ class SwapTool:
             return self._strategy.execute_swap(
                 from_mint, to_mint, amount_lamports, slippage_bps
             )
-        except RuntimeError as exc:
+        except NoLiquidityError as exc:
             # On devnet, gracefully fall back to mock for missing pools, but
             # preserve the error message for logging.
-            if self._network == NetworkType.DEVNET and "No liquidity pool" in str(exc):
-                logger.warning(
-                    "Devnet pool not found, falling back to mock swap: %s", exc
-                )
-                mock = MockSwap(self._network)
-                return mock.execute_swap(
-                    from_mint, to_mint, amount_lamports, slippage_bps
-                )
-            raise
+            if self._network != NetworkType.DEVNET:
+                raise
+            logger.warning("Devnet pool not found, falling back to mock swap: %s", exc)
+            return self._mock.execute_swap(from_mint, to_mint, amount_lamports, slippage_bps)
 
+    async def swap_async(
+        self,
+        from_token: str,
+        to_token: str,
+        amount_lamports: int,
+        slippage_bps: int = 50,
+    ) -> str:
+        """Awaitable :meth:`swap`; the blocking pipeline runs in a worker thread.
 
+        The pooled httpx and Solana clients are thread-safe, so several swaps
+        can be awaited together and their HTTP round trips overlap.
+        """
+        return await asyncio.to_thread(
+            self.swap, from_token, to_token, amount_lamports, slippage_bps
+        )
+
+    async def swap_many(self, specs: Sequence[SwapSpec]) -> list[str]:
+        """Run several swaps concurrently; signatures come back in *specs* order.
+
+        Wall-clock time is roughly that of the slowest swap rather than the
+        sum.  The first failure propagates; swaps already submitted are not
+        rolled back, so callers should treat a raised batch as partially done.
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    self.swap_async(
+                        spec.from_token, spec.to_token, spec.amount_lamports, spec.slippage_bps
+                    )
+                    for spec in specs
+                )
+            )
+        )
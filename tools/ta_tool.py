@@ -2,21 +2,188 @@
 
 from __future__ import annotations
 
+import hashlib
+import math
 import re
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import TYPE_CHECKING
 
+import numpy as np
 import pandas as pd
 import ta
 
+if TYPE_CHECKING:
+    from pandas.api.typing import Rolling
+
+
+# ── lean indicator primitives ────────────────────────────────────────
+# ``ta`` semantics with fillna=True: windows start filling from the first bar
+# (min_periods=0), EMAs are unadjusted, and gaps are forward-filled.
+
+
+def _rolling(values: np.ndarray, window: int) -> Rolling:
+    return pd.Series(values, copy=False).rolling(window, min_periods=0)
+
+
+def _ewm(values: np.ndarray, *, span: int | None = None, alpha: float | None = None) -> np.ndarray:
+    ewm = pd.Series(values, copy=False).ewm(span=span, alpha=alpha, adjust=False)
+    return ewm.mean().to_numpy()
+
+
+def _fill(values: np.ndarray, value: float | None) -> np.ndarray:
+    """Replace inf/NaN like ``ta``'s fillna: forward-fill, then *value* (None = back-fill)."""
+    filled = pd.Series(np.where(np.isinf(values), np.nan, values), copy=False).ffill()
+    filled = filled.bfill() if value is None else filled.fillna(value)
+    return filled.to_numpy()
+
+
+def _tail_returns(close: np.ndarray, window: int) -> np.ndarray:
+    """Simple returns of the last *window* bars; only the tail is ever touched."""
+    tail = close[-(window + 1) :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.diff(tail) / tail[:-1]
+
+
+def _mean_return(close: np.ndarray, window: int = 50) -> float:
+    """Mean simple return over the last *window* bars, ignoring non-finite returns."""
+    returns = _tail_returns(close, window)
+    returns = returns[np.isfinite(returns)]
+    return float(returns.mean()) if returns.size else float("nan")
+
+
+# Columns summarize() reads from the last row: close first, then in print order.
+_SUMMARY_COLS = (
+    "close",
+    "trend_sma_fast",
+    "trend_sma_slow",
+    "trend_ema_fast",
+    "trend_macd",
+    "trend_macd_signal",
+    "trend_macd_diff",
+    "momentum_rsi",
+    "momentum_stoch",
+    "momentum_stoch_signal",
+    "volatility_bbh",
+    "volatility_bbl",
+    "volatility_atr",
+    "volume_obv",
+    "volume_vwap",
+)
+
+# Fewer bars than the slowest summary indicator needs (26-bar MACD EMA plus its
+# 9-bar signal) only yields warm-up values, so enrich() skips the work.
+_MIN_BARS = 35
+
+# SOL/BTC correlation regimes: a correlation strictly above _CORR_THRESHOLDS[i]
+# (and at most the next threshold) maps to _CORR_REGIMES[i + 1].  bisect_left
+# on the tuple for one value, np.searchsorted(..., side="left") for an array.
+_CORR_THRESHOLDS = (0.1, 0.4, 0.8)
+_CORR_REGIMES = (
+    "largely decoupled",
+    "weakly correlated / some decoupling",
+    "moderately correlated",
+    "highly coupled",
+)
+
+# Qualitative tag thresholds: fast/slow SMA spread band and RSI extremes.
+_TREND_BAND = 0.01
+_RSI_OVERBOUGHT = 70.0
+_RSI_OVERSOLD = 30.0
+
+
+def _last_values(df: pd.DataFrame) -> dict[str, float]:
+    """Last-row values of _SUMMARY_COLS as plain floats (NaN when a column is missing).
+
+    The row is unboxed once with ``tolist()``; per-column ``.get``/``.iat`` or
+    ``reindex`` lookups all measured slower on enriched frames.
+    """
+    row = dict(zip(df.columns, df.iloc[-1].tolist()))
+    return {col: float(row.get(col, math.nan)) for col in _SUMMARY_COLS}
+
+
+def _trend_tag(last: dict[str, float]) -> str:
+    """Rough trend regime from the fast/slow SMA spread (inside the band is sideways)."""
+    sma_fast, sma_slow = last["trend_sma_fast"], last["trend_sma_slow"]
+    if not (math.isfinite(sma_fast) and math.isfinite(sma_slow)):
+        return "unknown"
+    if sma_fast > sma_slow * (1 + _TREND_BAND):
+        return "uptrend"
+    if sma_fast < sma_slow * (1 - _TREND_BAND):
+        return "downtrend"
+    return "sideways"
+
+
+# alternative.me fear & greed markup, compiled once for parse_fear_greed().
+_FG_VALUE = re.compile(r'data-value="(\d+)"')
+_FG_PREVIOUS = re.compile(r'data-value-previous="(\d+)"')
+_FG_CLASSIFICATION = re.compile(r"Fear &amp; Greed Index is (\w+(?: \w+)*)")
+
+
+# Indicator columns by (symbol, lean, candle digest); least recently used evicted.
+_ENRICH_CACHE: OrderedDict[tuple[str, bool, bytes], pd.DataFrame] = OrderedDict()
+_ENRICH_CACHE_SIZE = 32
+_OHLCV_COLS = ("open", "high", "low", "close", "volume")
+
+
+def _ohlcv_digest(df: pd.DataFrame) -> bytes:
+    """Content hash of the candles: OHLCV values plus the index and ``open_time``.
+
+    Identical prices at different timestamps must not share a cache entry.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for col in _OHLCV_COLS:
+        digest.update(df[col].to_numpy(dtype=np.float64).tobytes())
+    times = df["open_time"] if "open_time" in df else df.index
+    digest.update(pd.util.hash_pandas_object(times, index=True).to_numpy().tobytes())
+    return digest.digest()
+
 
 class TATool:
     """Enrich an OHLCV DataFrame with all TA indicators and produce an LLM-friendly summary."""
 
     @staticmethod
-    def enrich(df: pd.DataFrame) -> pd.DataFrame:
+    def enrich(df: pd.DataFrame, lean: bool = False, symbol: str = "") -> pd.DataFrame:
         """Add all TA features in-place and return the enriched DataFrame.
 
         Expects columns: open, high, low, close, volume  (float).
+        With ``lean=True`` only the indicators summarize() reads are computed
+        (same parameters and column names as the full set).
+
+        Passing *symbol* enables a small cache keyed on a hash of the candles
+        (OHLCV values, index and ``open_time``): re-enriching candles that have
+        not changed (e.g. klines served from BinanceTool's cache) copies the
+        earlier indicator columns into *df* instead of recomputing them.
+
+        Frames shorter than ``_MIN_BARS`` are not enriched at all: the summary
+        indicator columns are added as NaN, which summarize() renders as N/A.
         """
+        if len(df) < _MIN_BARS:
+            df[list(_SUMMARY_COLS[1:])] = np.nan
+            return df
+        if not symbol:
+            return TATool._compute(df, lean)
+
+        key = (symbol, lean, _ohlcv_digest(df))
+        hit = _ENRICH_CACHE.get(key)
+        if hit is not None:
+            _ENRICH_CACHE.move_to_end(key)
+            # Same in-place result as a miss; the digest pins the index, so
+            # positional assignment lines up.
+            df[list(hit.columns)] = hit.to_numpy()
+            return df
+        original = set(df.columns)
+        enriched = TATool._compute(df, lean)
+        added = [col for col in enriched.columns if col not in original]
+        _ENRICH_CACHE[key] = enriched[added].copy()
+        if len(_ENRICH_CACHE) > _ENRICH_CACHE_SIZE:
+            _ENRICH_CACHE.popitem(last=False)
+        return enriched
+
+    @staticmethod
+    def _compute(df: pd.DataFrame, lean: bool) -> pd.DataFrame:
+        if lean:
+            return TATool._enrich_summary_columns(df)
         return ta.add_all_ta_features(
             df,
             open="open",
@@ -27,6 +194,68 @@ class TATool:
             fillna=True,
         )
 
+    @staticmethod
+    def _enrich_summary_columns(df: pd.DataFrame) -> pd.DataFrame:
+        """The ~15 columns summarize() uses, out of the ~90 add_all_ta_features adds.
+
+        Mirrors the ``ta`` indicators (same windows and fillna rules) but works on
+        plain float64 arrays and inserts every column in one assignment; the ``ta``
+        wrappers spend most of their time on per-Series copies and alignment.
+        """
+        high, low, close, volume = (
+            df[col].to_numpy(dtype=np.float64) for col in ("high", "low", "close", "volume")
+        )
+        prev_close = np.concatenate(([np.nan], close[:-1]))
+
+        # Volume
+        obv = np.cumsum(np.where(close < prev_close, -volume, volume))
+        typical_pv = (high + low + close) / 3.0 * volume
+        vwap = _rolling(typical_pv, 14).sum() / _rolling(volume, 14).sum()
+
+        # Volatility
+        bb_mid = _rolling(close, 20).mean()
+        bb_std = _rolling(close, 20).std(ddof=0)
+        true_range = np.fmax(
+            high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close))
+        )
+        atr = np.zeros(len(close))
+        if len(close) >= 10:
+            # Wilder smoothing seeded with the plain mean of the first window.
+            seeded = np.concatenate(([true_range[:10].mean()], true_range[10:]))
+            atr[9:] = _ewm(seeded, alpha=1 / 10)
+
+        # Trend
+        macd = _ewm(close, span=12) - _ewm(close, span=26)
+        macd_signal = _ewm(macd, span=9)
+
+        # Momentum
+        diff = np.diff(close, prepend=np.nan)
+        ema_up = _ewm(np.where(diff > 0, diff, 0.0), alpha=1 / 14)
+        ema_down = _ewm(np.where(diff < 0, -diff, 0.0), alpha=1 / 14)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = np.where(ema_down == 0, 100.0, 100 - 100 / (1 + ema_up / ema_down))
+            low_min = _rolling(low, 14).min().to_numpy()
+            stoch_k = 100 * (close - low_min) / (_rolling(high, 14).max().to_numpy() - low_min)
+
+        columns = {
+            "volume_obv": obv,
+            "volume_vwap": _fill(vwap.to_numpy(), 0.0),
+            "volatility_bbh": _fill((bb_mid + 2 * bb_std).to_numpy(), None),
+            "volatility_bbl": _fill((bb_mid - 2 * bb_std).to_numpy(), None),
+            "volatility_atr": atr,
+            "trend_macd": macd,
+            "trend_macd_signal": macd_signal,
+            "trend_macd_diff": macd - macd_signal,
+            "trend_sma_fast": _rolling(close, 12).mean().to_numpy(),
+            "trend_sma_slow": _rolling(close, 26).mean().to_numpy(),
+            "trend_ema_fast": _ewm(close, span=12),
+            "momentum_rsi": _fill(rsi, 50.0),
+            "momentum_stoch": _fill(stoch_k, 50.0),
+            "momentum_stoch_signal": _fill(_rolling(stoch_k, 3).mean().to_numpy(), 50.0),
+        }
+        df[list(columns)] = np.column_stack(list(columns.values()))
+        return df
+
     @staticmethod
     def summarize(df: pd.DataFrame, symbol: str = "") -> str:
         """Return a concise text summary of the latest candle's key indicators.
@@ -36,34 +265,19 @@ class TATool:
         if df.empty:
             return f"[{symbol}] no data"
 
-        last = df.iloc[-1]
-        close = last.get("close", 0.0)
-
-        # ── helpers ───────────────────────────────────────────────────
-        def _val(col: str) -> str:
-            v = last.get(col)
-            return f"{v:.4f}" if pd.notna(v) else "N/A"
+        last = _last_values(df)
+        close = last["close"] if "close" in df else 0.0
+        text = {col: f"{v:.4f}" if math.isfinite(v) else "N/A" for col, v in last.items()}
 
         # Simple qualitative tags derived from core indicators to help the LLM
         # map numbers into rough regimes (trend + momentum).
-        sma_fast = last.get("trend_sma_fast")
-        sma_slow = last.get("trend_sma_slow")
-        rsi = last.get("momentum_rsi")
-
-        if pd.notna(sma_fast) and pd.notna(sma_slow):
-            if sma_fast > sma_slow * 1.01:
-                trend_tag = "uptrend"
-            elif sma_fast < sma_slow * 0.99:
-                trend_tag = "downtrend"
-            else:
-                trend_tag = "sideways"
-        else:
-            trend_tag = "unknown"
+        trend_tag = _trend_tag(last)
+        rsi = last["momentum_rsi"]
 
-        if pd.notna(rsi):
-            if rsi >= 70:
+        if math.isfinite(rsi):
+            if rsi >= _RSI_OVERBOUGHT:
                 momentum_tag = "overbought"
-            elif rsi <= 30:
+            elif rsi <= _RSI_OVERSOLD:
                 momentum_tag = "oversold"
             else:
                 momentum_tag = "neutral"
@@ -74,17 +288,17 @@ class TATool:
         lines = [
             f"[{symbol}] close={close:.4f}",
             # Trend
-            f"  SMA20={_val('trend_sma_fast')}  SMA50={_val('trend_sma_slow')}",
-            f"  EMA20={_val('trend_ema_fast')}  MACD={_val('trend_macd')}",
-            f"  MACD_signal={_val('trend_macd_signal')}  MACD_hist={_val('trend_macd_diff')}",
+            f"  SMA20={text['trend_sma_fast']}  SMA50={text['trend_sma_slow']}",
+            f"  EMA20={text['trend_ema_fast']}  MACD={text['trend_macd']}",
+            f"  MACD_signal={text['trend_macd_signal']}  MACD_hist={text['trend_macd_diff']}",
             # Momentum
-            f"  RSI={_val('momentum_rsi')}  Stoch_K={_val('momentum_stoch')}",
-            f"  Stoch_D={_val('momentum_stoch_signal')}",
+            f"  RSI={text['momentum_rsi']}  Stoch_K={text['momentum_stoch']}",
+            f"  Stoch_D={text['momentum_stoch_signal']}",
             # Volatility
-            f"  BB_upper={_val('volatility_bbh')}  BB_lower={_val('volatility_bbl')}",
-            f"  ATR={_val('volatility_atr')}",
+            f"  BB_upper={text['volatility_bbh']}  BB_lower={text['volatility_bbl']}",
+            f"  ATR={text['volatility_atr']}",
             # Volume
-            f"  OBV={_val('volume_obv')}  VWAP={_val('volume_vwap')}",
+            f"  OBV={text['volume_obv']}  VWAP={text['volume_vwap']}",
             # Qualitative regimes
             f"  trend_tag={trend_tag}  momentum_tag={momentum_tag}",
         ]
@@ -103,13 +317,13 @@ class TATool:
             return {}
 
         try:
-            value_match = re.search(r'data-value="(\d+)"', html)
+            value_match = _FG_VALUE.search(html)
             value = int(value_match.group(1)) if value_match else None
 
-            prev_match = re.search(r'data-value-previous="(\d+)"', html)
+            prev_match = _FG_PREVIOUS.search(html)
             prev = int(prev_match.group(1)) if prev_match else None
 
-            class_match = re.search(r"Fear &amp; Greed Index is (\w+(?: \w+)*)", html)
+            class_match = _FG_CLASSIFICATION.search(html)
             classification = class_match.group(1) if class_match else ""
 
             delta = None
@@ -135,11 +349,9 @@ class TATool:
         if df_fast.empty or df_slow.empty:
             return f"[{symbol}] trend alignment: insufficient data"
 
-        last_fast = df_fast.iloc[-1]
-        last_slow = df_slow.iloc[-1]
-
-        fast_tag = last_fast.get("trend_tag", "unknown")
-        slow_tag = last_slow.get("trend_tag", "unknown")
+        # Same SMA-based regime tag that summarize() prints for each frame.
+        fast_tag = _trend_tag(_last_values(df_fast))
+        slow_tag = _trend_tag(_last_values(df_slow))
 
         if fast_tag == "uptrend" and slow_tag == "uptrend":
             status = "1h uptrend aligned with 4h uptrend"
@@ -167,22 +379,25 @@ class TATool:
         if btc_df.empty or not others:
             return "[correlation] BTC dominance: insufficient data"
 
-        btc_ret = btc_df["close"].pct_change().tail(50)
-        if btc_ret.empty:
-            return "[correlation] BTC dominance: insufficient data"
-
-        basket_moves = []
-        for symbol, df in others.items():
+        btc_avg = _mean_return(btc_df["close"].to_numpy(dtype=np.float64))
+        # Pool every alt's recent returns into one running (sum, count) rather
+        # than averaging per-asset means; flat-priced assets carry no move and
+        # are left out of the basket.
+        total, count = 0.0, 0
+        for df in others.values():
             if df is None or df.empty or "close" not in df:
                 continue
-            basket_moves.append(df["close"].pct_change().tail(50))
-
-        if not basket_moves:
+            returns = _tail_returns(df["close"].to_numpy(dtype=np.float64), 50)
+            returns = returns[np.isfinite(returns)]
+            if not returns.any():
+                continue
+            total += float(returns.sum())
+            count += returns.size
+        if not count:
             return "[correlation] BTC dominance: insufficient data"
 
         # Simple heuristic: compare average returns.
-        btc_avg = btc_ret.mean()
-        others_avg = sum(s.mean() for s in basket_moves) / len(basket_moves)
+        others_avg = total / count
 
         if btc_avg > others_avg * 1.02:
             msg = "BTC gaining dominance vs majors"
@@ -203,18 +418,18 @@ class TATool:
         if sol is None or btc is None:
             return "[correlation] SOL/BTC: insufficient data"
 
-        # Align on index and compute rolling correlation over the last ~7 days
-        joined = sol.pct_change().tail(168).corr(btc.pct_change().tail(168))
-        if pd.isna(joined):
+        # Correlate the most recent ~7 days of hourly returns, bar for bar.
+        sol_ret = _tail_returns(sol.to_numpy(dtype=np.float64), 168)
+        btc_ret = _tail_returns(btc.to_numpy(dtype=np.float64), 168)
+        n = min(len(sol_ret), len(btc_ret))
+        sol_ret, btc_ret = sol_ret[len(sol_ret) - n :], btc_ret[len(btc_ret) - n :]
+        finite = np.isfinite(sol_ret) & np.isfinite(btc_ret)
+        joined = math.nan
+        if finite.sum() >= 2:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                joined = float(np.corrcoef(sol_ret[finite], btc_ret[finite])[0, 1])
+        if math.isnan(joined):
             return "[correlation] SOL/BTC: insufficient data"
 
-        if joined > 0.8:
-            regime = "highly coupled"
-        elif joined > 0.4:
-            regime = "moderately correlated"
-        elif joined > 0.1:
-            regime = "weakly correlated / some decoupling"
-        else:
-            regime = "largely decoupled"
-
+        regime = _CORR_REGIMES[bisect_left(_CORR_THRESHOLDS, joined)]
         return f"[correlation] SOL/BTC correlation={joined:.2f} ({regime})"
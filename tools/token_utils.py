@@ -2,8 +2,17 @@
 token_utils.py - Utilities for handling token mints on Solana devnet.
 """
 
+from functools import lru_cache
+
 from solders.pubkey import Pubkey
 
+
+@lru_cache(maxsize=1024)
+def _pubkey(address: str) -> Pubkey:
+    """Decode a base58 address once per distinct string."""
+    return Pubkey.from_string(address)
+
+
 # Common token mint addresses on Solana devnet
 # Updated with more accurate devnet addresses
 DEVNET_MINTS = {
@@ -24,16 +33,16 @@ def get_mint_address(symbol: str) -> Pubkey:
 def validate_mint(address: str) -> bool:
     """Validate if a string is a valid Pubkey."""
     try:
-        Pubkey.from_string(address)
+        _pubkey(address)
         return True
-    except Exception:
+    except ValueError:
         return False
 
 # New function to add or update mint addresses dynamically
 def add_mint_address(symbol: str, address: str):
     """Add or update a mint address in DEVNET_MINTS."""
     symbol_upper = symbol.upper()
-    DEVNET_MINTS[symbol_upper] = Pubkey.from_string(address)
+    DEVNET_MINTS[symbol_upper] = _pubkey(address)
 
 if __name__ == "__main__":
     # Test the functions
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import logging
 import time
+from functools import lru_cache
+from typing import Any
 
 import base58
 from solana.rpc.api import Client
@@ -12,6 +14,7 @@ from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from solders.system_program import TransferParams, transfer
 from solders.transaction import Transaction
+from spl.token.constants import TOKEN_PROGRAM_ID
 
 from core.network_config import NetworkDetector, NetworkTokens, NetworkType
 
@@ -21,6 +24,31 @@ _LAMPORTS_PER_SOL = 1_000_000_000
 
 TOKEN_DECIMALS = {"SOL": 9, "USDC": 6, "WBTC": 8}
 
+# Confirmation polling backs off from a quick first check to this ceiling.
+_CONFIRM_POLL_START_S = 0.2
+_CONFIRM_POLL_MAX_S = 2.0
+
+
+@lru_cache(maxsize=1024)
+def _pubkey(address: str) -> Pubkey:
+    """Decode a base58 address; mints and payout destinations repeat across trades."""
+    return Pubkey.from_string(address)
+
+
+def _parsed_ui_amount(account: Any, symbol: str) -> float:
+    """UI amount of one jsonParsed token account (raw amount scaled by decimals)."""
+    amount = account.account.data.parsed.get("info", {}).get("tokenAmount", {})
+    decimals = amount.get("decimals", TOKEN_DECIMALS.get(symbol, 0))
+    raw = float(amount.get("amount", 0))
+    return raw / (10**decimals) if decimals else raw
+
+
+def _status_name(status: Any) -> str | None:
+    """Lower-case status name; accepts plain strings and solders' confirmation enum."""
+    if status is None:
+        return None
+    return str(status).rsplit(".", 1)[-1].lower()
+
 
 class WalletTool:
     def __init__(self, private_key_b58: str, rpc_url: str):
@@ -80,11 +108,12 @@ class WalletTool:
         # We keep KNOWN_MINTS as base58 strings for readability and convert
         # them at call time. On devnet, some mainnet mints may not exist; in
         # that case treat RPC errors as "no balance" rather than surfacing
-        # low-level InvalidParamsMessage exceptions to callers.
+        # low-level InvalidParamsMessage exceptions to callers. jsonParsed
+        # accounts carry their token amount, so one round trip is enough.
         try:
-            resp = self.client.get_token_accounts_by_owner(
+            resp = self.client.get_token_accounts_by_owner_json_parsed(
                 self.pubkey,
-                TokenAccountOpts(mint=Pubkey.from_string(mint)),
+                TokenAccountOpts(mint=_pubkey(mint)),
             )
         except Exception as exc:
             logger.warning(
@@ -92,48 +121,61 @@ class WalletTool:
             )
             return 0.0
 
-        accounts = getattr(resp, "value", []) or []
+        accounts = resp.value or []
         if not accounts:
             logger.info("  → no token accounts found for %s", sym)
             return 0.0
 
-        total = 0.0
-        for acc in accounts:
-            try:
-                acct_pubkey = getattr(acc, "pubkey", None) or getattr(acc, "pubkey", None)
-                if acct_pubkey is None:
-                    continue
-                balance_resp = self.client.get_token_account_balance(acct_pubkey)
-                val = getattr(balance_resp, "value", None)
-                if val is None:
-                    continue
-                amount_str = getattr(val, "amount", None) or getattr(
-                    val, "ui_amount_string", None
-                )
-                decimals = getattr(val, "decimals", TOKEN_DECIMALS.get(sym, 0))
-                if amount_str is None:
-                    continue
-                raw = float(amount_str)
-                total += raw / (10**decimals) if decimals else raw
-            except Exception as exc:
-                logger.warning(
-                    "  error while fetching SPL balance for %s account: %s", sym, exc
-                )
-                continue
-
+        total = sum(_parsed_ui_amount(acc, sym) for acc in accounts)
         logger.info("  → %.6f %s", total, sym)
         return total
 
     def get_all_balances(self) -> dict[str, float]:
-        """Return a mapping of known token symbols to their balances."""
+        """Return a mapping of known token symbols to their balances.
+
+        SPL balances come from one jsonParsed getTokenAccountsByOwner call for
+        the whole token program; if that fails we fall back to per-symbol
+        lookups.
+        """
         balances: dict[str, float] = {}
-        for symbol in self._supported_symbols:
-            try:
-                balances[symbol] = self.balance_token(symbol)
-            except Exception as exc:
-                logger.warning("failed to fetch balance for %s: %s", symbol, exc)
+        try:
+            balances["SOL"] = self.balance_sol()
+        except Exception as exc:
+            logger.warning("failed to fetch balance for SOL: %s", exc)
+        spl_symbols = [sym for sym in self._supported_symbols if sym != "SOL"]
+        try:
+            balances.update(self._all_spl_balances(spl_symbols))
+        except Exception as exc:
+            logger.warning("bulk SPL balance lookup failed, querying per token: %s", exc)
+            for symbol in spl_symbols:
+                try:
+                    balances[symbol] = self.balance_token(symbol)
+                except Exception as exc:
+                    logger.warning("failed to fetch balance for %s: %s", symbol, exc)
         return balances
 
+    def _all_spl_balances(self, symbols: list[str]) -> dict[str, float]:
+        """Sum every SPL token account we own into *symbols* (0.0 when absent)."""
+        by_mint: dict[str, str] = {}
+        for sym in symbols:
+            try:
+                by_mint[self._tokens.mint_for_symbol(sym)] = sym
+            except ValueError:
+                pass  # not on this network (e.g. WBTC on devnet) → reported as 0.0
+        totals = dict.fromkeys(symbols, 0.0)
+        resp = self.client.get_token_accounts_by_owner_json_parsed(
+            self.pubkey, TokenAccountOpts(program_id=TOKEN_PROGRAM_ID)
+        )
+        for acc in resp.value or []:
+            sym = by_mint.get(acc.account.data.parsed.get("info", {}).get("mint"))
+            if sym is None:
+                continue
+            totals[sym] += _parsed_ui_amount(acc, sym)
+        logger.info(
+            "  → SPL balances: %s", ", ".join(f"{s}={v:.6f}" for s, v in totals.items())
+        )
+        return totals
+
     def recent_history(self, limit: int = 5) -> list[dict]:
         """Return the most recent transaction signatures + basic info."""
         resp = self.client.get_signatures_for_address(self.pubkey, limit=limit)
@@ -157,7 +199,7 @@ class WalletTool:
         """
         lamports = int(amount_sol * _LAMPORTS_PER_SOL)
         logger.info("sending %d lamports (%.6f SOL) → %s", lamports, amount_sol, destination_b58)
-        dest_pubkey = Pubkey.from_string(destination_b58)
+        dest_pubkey = _pubkey(destination_b58)
         transfer_ix = transfer(
             TransferParams(
                 from_pubkey=self.pubkey,
@@ -180,6 +222,48 @@ class WalletTool:
 
     # ── helpers ────────────────────────────────────────────────────
 
+    def await_many(self, signatures: list[str], timeout: float = 30) -> dict[str, str | None]:
+        """Poll until every signature is confirmed or failed, or *timeout* seconds elapse.
+
+        All pending signatures share one getSignatureStatuses call per poll, and
+        the poll interval backs off from 0.2 s to 2 s.  Returns signature →
+        "confirmed"/"finalized", "failed" when the transaction errored, or the
+        last seen status (None if never seen) when the timeout hit.
+        """
+        result: dict[str, str | None] = dict.fromkeys(signatures)
+        pending = list(dict.fromkeys(signatures))
+        deadline = time.monotonic() + timeout
+        delay = _CONFIRM_POLL_START_S
+        while pending:
+            try:
+                resp = self.client.get_signature_statuses(pending)
+                still_pending: list[str] = []
+                for sig, info in zip(pending, resp.value):
+                    if info is not None and info.err is not None:
+                        logger.warning("  transaction %s failed: %s", sig, info.err)
+                        result[sig] = "failed"
+                        continue
+                    status = _status_name(getattr(info, "confirmation_status", None))
+                    if status is not None:
+                        result[sig] = status
+                    if result[sig] in ("confirmed", "finalized"):
+                        logger.info("  transaction %s confirmed", sig)
+                    else:
+                        still_pending.append(sig)
+                pending = still_pending
+            except Exception as exc:
+                logger.warning("  error while polling confirmation for %s: %s", pending, exc)
+
+            remaining = deadline - time.monotonic()
+            if not pending:
+                break
+            if remaining <= 0:
+                logger.warning("  timeout waiting for confirmation of %s", pending)
+                break
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 1.5, _CONFIRM_POLL_MAX_S)
+        return result
+
     def _wait_for_confirmation(self, signature: str, timeout: int = 30) -> None:
         """Block until the given signature is confirmed or *timeout* seconds elapse.
 
@@ -187,25 +271,5 @@ class WalletTool:
         callers in environments with slow RPC propagation.
         """
         logger.info("  waiting for confirmation of %s (timeout=%ss) …", signature, timeout)
-        start = time.time()
-        while True:
-            try:
-                resp = self.client.get_signature_statuses([signature])
-                info = resp.value[0]
-                if info is not None:
-                    if info.err is not None:
-                        logger.warning("  transaction %s failed: %s", signature, info.err)
-                        return
-                    status = getattr(info, "confirmation_status", None)
-                    logger.info("  confirmation_status=%s", status)
-                    if status in ("confirmed", "finalized"):
-                        logger.info("  transaction %s confirmed", signature)
-                        return
-            except Exception as exc:
-                logger.warning("  error while polling confirmation for %s: %s", signature, exc)
-
-            if time.time() - start > timeout:
-                logger.warning("  timeout waiting for confirmation of %s", signature)
-                return
-
-            time.sleep(1)
+        status = self.await_many([signature], timeout=timeout)[signature]
+        logger.info("  confirmation_status=%s", status)
@@ -7,22 +7,32 @@ or exchange hot wallets to begin collecting signals.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta, timezone
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Dict, List
 
-from solana.rpc.api import Client as SolanaClient
+from solana.rpc.async_api import AsyncClient
 from solders.pubkey import Pubkey
+from solders.signature import Signature
 
 logger = logging.getLogger(__name__)
 
+# Signatures requested per wallet (newest first); also the per-wallet history kept.
+_SIGNATURE_LIMIT = 50
+
+# (signature, slot, block_time); block_time is None while not yet confirmed.
+_SigEntry = tuple[Signature, int, int | None]
+
 
 @dataclass(frozen=True)
 class WhaleConfig:
     rpc_url: str
     # Operator can provide a non-empty list of whale wallets at runtime.
-    whale_wallets: List[str] = field(default_factory=list)
+    whale_wallets: tuple[str, ...] = ()
     # Minimum size (in SOL) to treat as a "large" transfer in summaries.
     min_sol_threshold: float = 1_000.0
 
@@ -31,9 +41,21 @@ class WhaleTool:
     """Track large Solana wallet movements via recent signatures."""
 
     def __init__(self, config: WhaleConfig) -> None:
-        self._client = SolanaClient(config.rpc_url)
-        self._wallets = [w for w in config.whale_wallets if w]
+        self._rpc_url = config.rpc_url
+        self._wallets = tuple(w for w in config.whale_wallets if w)
         self._min_sol = float(config.min_sol_threshold)
+        # Decode each configured address once; invalid ones are reported here
+        # rather than on every polling cycle.
+        self._wallet_pubkeys: List[tuple[str, Pubkey]] = []
+        for addr in dict.fromkeys(self._wallets):
+            try:
+                self._wallet_pubkeys.append((addr, Pubkey.from_string(addr)))
+            except ValueError as exc:
+                logger.warning("ignoring invalid whale wallet %s: %s", addr, exc)
+        # Newest-first confirmed signatures per wallet that are older than any
+        # still-pending one.  Later polls only ask the RPC for signatures newer
+        # than the head of this list (``until=``), so pending ones are re-fetched.
+        self._history: Dict[str, List[_SigEntry]] = {}
 
     def get_recent_large_transfers(self, hours: int = 24) -> List[Dict]:
         """Return a coarse view of large transfers involving known whale wallets.
@@ -42,40 +64,67 @@ class WhaleTool:
         transfer occurred; it does not decode exact SOL amounts from the full
         transaction. This is sufficient to act as a qualitative signal for the
         LLM ("many whales active on exchanges recently").
+
+        All wallets are queried concurrently, so the call takes roughly one
+        RPC round trip regardless of how many wallets are tracked.  After the
+        first poll only signatures newer than the last one seen are fetched and
+        merged into the per-wallet history.
         """
-        if not self._wallets:
+        if not self._wallet_pubkeys:
             return []
+        return asyncio.run(self._get_recent_large_transfers_async(hours))
+
+    async def _get_recent_large_transfers_async(self, hours: int) -> List[Dict]:
+        async with AsyncClient(self._rpc_url) as client:
+            responses = await asyncio.gather(
+                *(
+                    client.get_signatures_for_address(
+                        pubkey, until=self._newest_signature(addr), limit=_SIGNATURE_LIMIT
+                    )
+                    for addr, pubkey in self._wallet_pubkeys
+                ),
+                return_exceptions=True,
+            )
 
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+        cutoff_ts = int(time.time()) - hours * 3600
         events: List[Dict] = []
-
-        for addr in self._wallets:
-            try:
-                pubkey = Pubkey.from_string(addr)
-                # Limit the number of signatures per wallet for performance.
-                resp = self._client.get_signatures_for_address(pubkey, limit=50)
-                for sig_info in resp.value:
-                    # sig_info.block_time is Optional[int]
-                    block_time = sig_info.block_time
-                    if block_time is None:
-                        continue
-                    ts = datetime.fromtimestamp(block_time, tz=timezone.utc)
-                    if ts < cutoff:
-                        continue
-
-                    events.append(
-                        {
-                            "wallet": addr,
-                            "signature": str(sig_info.signature),
-                            "slot": sig_info.slot,
-                            "timestamp": ts.isoformat(),
-                        }
-                    )
-            except Exception as exc:
-                logger.warning("failed to inspect whale wallet %s: %s", addr, exc)
+        for (addr, _), resp in zip(self._wallet_pubkeys, responses):
+            history = self._history.get(addr, [])
+            if isinstance(resp, BaseException):
+                logger.warning("failed to inspect whale wallet %s: %s", addr, resp)
+                window = history
+            else:
+                fresh = [(info.signature, info.slot, info.block_time) for info in resp.value]
+                window = (fresh + history)[:_SIGNATURE_LIMIT]
+                # Never move the head past a pending signature: keep only what is
+                # older than the oldest one so it is fetched again next poll.
+                pending = [i for i, entry in enumerate(window) if entry[2] is None]
+                self._history[addr] = window[pending[-1] + 1 :] if pending else window
+
+            # The window is newest first; the first entry past the cutoff ends
+            # the scan for this wallet.
+            for signature, slot, block_time in window:
+                if block_time is None:
+                    continue
+                if block_time < cutoff_ts:
+                    break
+                events.append(
+                    {
+                        "wallet": addr,
+                        "signature": str(signature),
+                        "slot": slot,
+                        "timestamp": datetime.fromtimestamp(
+                            block_time, tz=timezone.utc
+                        ).isoformat(),
+                    }
+                )
 
         return events
 
+    def _newest_signature(self, addr: str) -> Signature | None:
+        history = self._history.get(addr)
+        return history[0][0] if history else None
+
     def summarize_whale_activity(self, hours: int = 24) -> str:
         """Return a short human-readable summary for the LLM."""
         events = self.get_recent_large_transfers(hours=hours)
@@ -91,3 +140,8 @@ class WhaleTool:
             f"{len(unique_wallets)} tracked wallets in last {hours}h"
         )
 
+
+@lru_cache(maxsize=None)
+def get_whale_tool(config: WhaleConfig) -> WhaleTool:
+    """Shared WhaleTool per config, so decoded wallets and signature history persist."""
+    return WhaleTool(config)